@@ -1,10 +1,25 @@
 import streamlit as st
-st.set_page_config(page_title="Home")
-st.sidebar.header("Home")
+from pathlib import Path
 
-st.title("👨‍🔬🔎Welcome!🔭🪐")
+ROOT = Path(__file__).parent
 
 
-st.write("""
+def home():
+    st.sidebar.header("Home")
+
+    st.title("👨‍🔬🔎Welcome!🔭🪐")
+
+
+    st.write("""
 Select a problem type from the sidebar to begin practicing
-""")
\ No newline at end of file
+""")
+
+
+# Same sidebar as the plain pages/ folder gave us (same titles, same order), but listed here so
+# pages that shouldn't be in the sidebar can still have a URL, like /diagnostics
+pages = [st.Page(home, title="Home", default=True)]
+pages += [st.Page(path) for path in sorted((ROOT / "pages").glob("*.py"))]
+pages.append(st.Page(ROOT / "utils" / "diagnostics_page.py", title="Diagnostics", url_path="diagnostics",
+                     visibility="hidden"))
+
+st.navigation(pages).run()
@@ -0,0 +1,206 @@
+"""Question generator throughput benchmark.
+
+Runs every generator over every problem type x difficulty it offers and reports, per
+combination: questions per second, p50/p99 latency for a single question, and how much
+memory generating one question allocates (tracemalloc peak, in KiB).
+
+Results can be saved as a JSON baseline and compared against on a later commit:
+
+    python benchmarks/bench_generators.py                        # just print the table
+    python benchmarks/bench_generators.py --save                 # write benchmarks/baseline.json
+    python benchmarks/bench_generators.py --compare              # fail on >20% slowdowns
+    python benchmarks/bench_generators.py --only Energy -n 5000  # one group, more samples
+
+Timings depend on the machine, so only compare baselines taken on the same one.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.generators.linear_motion_generator import LinearMotionGenerator
+from utils.generators.projectile_generator import ProjectileGenerator
+from utils.generators.collision_generator import CollisionGenerator
+from utils.generators.energy_generator import EnergyGenerator
+from utils.generators.algebra_generator import AlgebraGenerator, DIFFICULTIES as ALGEBRA_DIFFICULTIES
+from utils.generators.compound_generator import CompoundGenerator, CATEGORIES as COMPOUND_CATEGORIES
+
+ROOT = Path(__file__).parent.parent
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_SAMPLES = 2000
+DEFAULT_THRESHOLD = 0.2  # flag a case once its throughput drops by more than this fraction
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+GENERATOR_CASES = [
+    (LinearMotionGenerator, ["Mixed", "No Time", "No Distance", "No Acceleration", "No Final Velocity"], DIFFICULTIES),
+    (ProjectileGenerator, ["Type 1", "Type 2", "Type 3"], DIFFICULTIES),
+    # the collisions page only offers Easy and Medium, there's no Hard question yet
+    (CollisionGenerator, ["Elastic Collision", "Inelastic Collision"], ["Easy", "Medium"]),
+    (EnergyGenerator, ["Elastic Potential Energy", "Kinetic Energy", "Gravitational Potential Energy", "Work",
+                       "Elastic <--> Kinetic", "Gravitational <--> Kinetic", "Gravitational <--> Elastic"],
+     DIFFICULTIES),
+    # compounds have no difficulty levels
+    (CompoundGenerator, list(COMPOUND_CATEGORIES), ["-"]),
+]
+
+
+def benchmark_cases(seed=None):
+    """[(group, problem_type, difficulty, fn)], fn builds one question per call"""
+    cases = []
+    for generator_class, problem_types, difficulties in GENERATOR_CASES:
+        generator = generator_class(rng=seed)
+        for problem_type in problem_types:
+            for difficulty in difficulties:
+                cases.append((generator_class.__name__, problem_type, difficulty,
+                              lambda g=generator, p=problem_type, d=difficulty: g.generate_question(p, d)))
+
+    algebra = AlgebraGenerator(rng=seed)
+    for difficulty in ALGEBRA_DIFFICULTIES:
+        cases.append(("AlgebraGenerator", "generate_equation", difficulty,
+                      lambda d=difficulty: algebra.generate_equation(d)))
+    return cases
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(fn, samples, alloc_samples):
+    """Time `samples` calls one at a time, then measure allocations on a separate, shorter pass"""
+    for _ in range(min(50, samples)):  # warm up caches and lazy tables
+        fn()
+
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    for _ in range(samples):
+        start = clock()
+        fn()
+        append(clock() - start)
+    latencies.sort()
+    total = sum(latencies)
+
+    # tracemalloc slows everything down, so it never runs during the timed pass
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_samples):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'samples': samples,
+        'per_second': round(samples / (total / 1e9), 1),
+        'p50_us': round(percentile(latencies, 0.50) / 1e3, 2),
+        'p99_us': round(percentile(latencies, 0.99) / 1e3, 2),
+        'alloc_kib': round(sum(peaks) / len(peaks) / 1024, 2),
+    }
+
+
+def case_key(group, problem_type, difficulty):
+    return f"{group} | {problem_type} | {difficulty}"
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(only=None, samples=DEFAULT_SAMPLES, seed=0):
+    results = {}
+    for group, problem_type, difficulty, fn in benchmark_cases(seed):
+        key = case_key(group, problem_type, difficulty)
+        if only and not any(term.lower() in key.lower() for term in only):
+            continue
+        results[key] = run_case(fn, samples, max(1, samples // 10))
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': f"{platform.system()} {platform.machine()}",
+            'seed': seed,
+            'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Case keys whose throughput fell more than `threshold` below the baseline"""
+    regressions = []
+    for key, result in current['results'].items():
+        old = baseline['results'].get(key)
+        if old and result['per_second'] < old['per_second'] * (1 - threshold):
+            regressions.append(key)
+    return regressions
+
+
+def print_report(current, baseline=None, regressions=()):
+    width = max(len(key) for key in current['results']) if current['results'] else 10
+    header = f"{'case':{width}}  {'q/s':>10}  {'p50 us':>8}  {'p99 us':>8}  {'KiB/q':>7}"
+    if baseline:
+        header += f"  {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for key, result in current['results'].items():
+        line = (f"{key:{width}}  {result['per_second']:>10.0f}  {result['p50_us']:>8.2f}"
+                f"  {result['p99_us']:>8.2f}  {result['alloc_kib']:>7.2f}")
+        old = baseline['results'].get(key) if baseline else None
+        if old:
+            line += f"  {result['per_second'] / old['per_second'] - 1:>+7.0%}"
+            if key in regressions:
+                line += "  SLOWER"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark question generator throughput")
+    parser.add_argument('--only', nargs='+', metavar='TERM',
+                        help="only cases whose 'group | problem type | difficulty' contains one of these")
+    parser.add_argument('-n', '--samples', type=int, default=DEFAULT_SAMPLES,
+                        help="timed questions per case (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument('--save', nargs='?', type=Path, const=BASELINE_PATH, metavar='PATH',
+                        help=f"write the results as a baseline (default: {BASELINE_PATH.relative_to(ROOT)})")
+    parser.add_argument('--compare', nargs='?', type=Path, const=BASELINE_PATH, metavar='PATH',
+                        help="compare against a saved baseline, exit 1 if any case got slower")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed throughput drop before a case counts as slower (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    current = run(args.only, args.samples, args.seed)
+    baseline = None
+    regressions = []
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(current, baseline, args.threshold)
+
+    print_report(current, baseline, regressions)
+    if baseline:
+        print(f"\ncompared with {args.compare} (commit {baseline['meta'].get('commit')}):"
+              f" {len(regressions)} of {len(current['results'])} cases more than {args.threshold:.0%} slower")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"\nbaseline written to {args.save}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
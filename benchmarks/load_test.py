@@ -0,0 +1,254 @@
+"""Concurrent student load test for the practice pages.
+
+Runs the real page scripts headlessly through Streamlit's AppTest, one AppTest per
+simulated student, all in this one process like sessions on a server. Each student
+loads the page, then keeps answering (filling the answer boxes and pressing Submit) or
+pressing New Question, with a random think time in between. Per page it reports:
+reruns per second over all students, p50/p95/p99 rerun latency (the first load of the
+page is reported separately, as its p50), and how much the process's resident memory
+grew while that page was under load.
+
+    python benchmarks/load_test.py                             # every page, 10 students, 30 s each
+    python benchmarks/load_test.py --sessions 1 10 25 50       # find where a page gets sluggish
+    python benchmarks/load_test.py --only Energy --think 0.5 --duration 60
+    python benchmarks/load_test.py --json load.json            # keep the numbers
+
+Answers are recorded in a throwaway attempts database, never data/attempts.sqlite3.
+Everything shares one interpreter, so the numbers include GIL contention between
+sessions, the same as a real server process.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import attempt_store
+from bench_generators import git_commit, percentile
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_SESSIONS = [10]
+DEFAULT_DURATION = 30.0  # seconds of load per page and session count
+DEFAULT_THINK = 3.0      # mean seconds a student spends between clicks
+ANSWER_PROBABILITY = 0.7  # otherwise the student skips to a new question
+SCRIPT_TIMEOUT = 60      # seconds one rerun may take before AppTest gives up
+
+# script, label of its answer button, label of its new question button, what to type in text boxes
+Page = namedtuple('Page', ['script', 'submit', 'new_question', 'text_answer'])
+
+PAGES = {
+    "Algebra": Page("pages/1_0.1_Algebra.py", "Apply Operation", "New Problem", None),
+    "1D Motion": Page("pages/1_1.10_1D_Motion.py", "Submit", "New Question", None),
+    "Forces": Page("pages/1_2.1_Newtons_2nd_Law.py", "Submit", "New Question", None),
+    "Collisions": Page("pages/1_4.1_Collisions.py", "Submit", "New Question", None),
+    "Energy": Page("pages/1_6.1_Energy.py", "Submit", "New Question", None),
+    "Compounds": Page("pages/1_c3_Exploring_Compounds.py", "Check Answer", "New Question", "sodium chloride"),
+}
+
+
+def rss_mib():
+    """Current resident set size of this process (peak RSS where /proc isn't available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def isolate_attempt_store(directory):
+    """Point the shared attempt store at a scratch database for the whole run"""
+    with attempt_store._store_lock:
+        attempt_store._store = attempt_store.AttemptStore(Path(directory) / "attempts.sqlite3")
+    return attempt_store._store
+
+
+@contextmanager
+def shared_runtime():
+    """One runtime for every AppTest in the process, like the sessions of a real server.
+
+    AppTest installs a mock runtime at the start of each run and clears it at the end,
+    which breaks any other session that is mid-run, so hand them all the same one. It
+    also compiles the page again on every run, where a server compiles it once (and
+    parsing in several threads at once can crash CPython 3.11), so share a script cache too."""
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    script_cache = ScriptCache()
+    with mock.patch.object(Runtime, "instance", return_value=runtime), \
+            mock.patch.object(Runtime, "exists", return_value=True), \
+            mock.patch.object(app_test, "ScriptCache", return_value=script_cache), \
+            mock.patch.object(local_script_runner, "ScriptCache", return_value=script_cache):
+        yield script_cache
+
+
+class Student:
+    """One simulated session on one page"""
+
+    def __init__(self, page, rng):
+        self.page = page
+        self.rng = rng
+        self.app = AppTest.from_file(str(ROOT / page.script), default_timeout=SCRIPT_TIMEOUT)
+        self.load_latencies = []  # first run of the page
+        self.latencies = []       # every rerun after that
+        self.errors = []
+
+    def _timed_run(self, latencies):
+        start = time.perf_counter()
+        self.app.run()
+        latencies.append(time.perf_counter() - start)
+        self.errors.extend(e.value for e in self.app.exception)
+
+    def _buttons(self, label):
+        return [button for button in self.app.button if button.label == label and not button.disabled]
+
+    def act(self):
+        """Answer the current question or ask for a new one, whichever the page offers"""
+        submit = self._buttons(self.page.submit)
+        if submit and self.rng.random() < ANSWER_PROBABILITY:
+            for box in self.app.number_input:
+                if not box.disabled:
+                    box.set_value(round(self.rng.uniform(1, 100), 2))
+            if self.page.text_answer:
+                for box in self.app.text_input:
+                    if not box.disabled:
+                        box.set_value(self.page.text_answer)
+            self.rng.choice(submit).click()
+        else:
+            new_question = self._buttons(self.page.new_question)
+            if not new_question:
+                return
+            self.rng.choice(new_question).click()
+        self._timed_run(self.latencies)
+
+    def run(self, deadline, think):
+        try:
+            self._timed_run(self.load_latencies)
+            while True:
+                pause = self.rng.expovariate(1 / think) if think > 0 else 0
+                if time.perf_counter() + pause >= deadline:
+                    return
+                time.sleep(pause)
+                self.act()
+        except Exception as e:  # keep the other students going, but count it
+            self.errors.append(repr(e))
+
+
+def load_page(page, sessions, duration, think, seed, script_cache):
+    """Run `sessions` students on `page` at once for `duration` seconds"""
+    # compile the page before the students arrive, like the server does for its first session
+    script_cache.get_bytecode(str(ROOT / page.script))
+    students = [Student(page, random.Random(f"{seed}:{page.script}:{sessions}:{i}")) for i in range(sessions)]
+    rss_before = rss_mib()
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = [threading.Thread(target=student.run, args=(deadline, think), daemon=True) for student in students]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    loads = sorted(latency for student in students for latency in student.load_latencies)
+    latencies = sorted(latency for student in students for latency in student.latencies)
+    errors = [error for student in students for error in student.errors]
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'per_second': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+        'load_p50_ms': round(percentile(loads, 0.50) * 1000, 1) if loads else None,
+        'rss_mib': round(rss_before, 1),
+        'rss_growth_mib': round(rss_mib() - rss_before, 1),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+    }
+
+
+def run(only=None, sessions=DEFAULT_SESSIONS, duration=DEFAULT_DURATION, think=DEFAULT_THINK, seed=0):
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch, shared_runtime() as script_cache:
+        store = isolate_attempt_store(scratch)
+        try:
+            for name, page in PAGES.items():
+                if only and not any(term.lower() in name.lower() for term in only):
+                    continue
+                for count in sessions:
+                    results[f"{name} | {count}"] = load_page(page, count, duration, think, seed, script_cache)
+        finally:
+            store.close()
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': f"{platform.system()} {platform.machine()}",
+            'seed': seed,
+            'duration': duration,
+            'think': think,
+            'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+
+
+def print_report(current):
+    width = max(len(key) for key in current['results']) if current['results'] else 10
+    header = (f"{'page | students':{width}}  {'reruns':>7}  {'rerun/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}"
+              f"  {'p99 ms':>8}  {'load ms':>8}  {'RSS MiB':>8}  {'+MiB':>6}  {'errors':>6}")
+    print(header)
+    print("-" * len(header))
+    for key, result in current['results'].items():
+        p50, p95, p99, load = (f"{result[q]:>8.1f}" if result[q] is not None else f"{'-':>8}"
+                               for q in ('p50_ms', 'p95_ms', 'p99_ms', 'load_p50_ms'))
+        print(f"{key:{width}}  {result['reruns']:>7}  {result['per_second']:>8.2f}  {p50}  {p95}  {p99}  {load}"
+              f"  {result['rss_mib']:>8.1f}  {result['rss_growth_mib']:>+6.1f}  {result['errors']:>6}")
+    for key, result in current['results'].items():
+        if result['first_error']:
+            print(f"\n{key}: {result['errors']} errors, first one: {result['first_error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the practice pages with simulated students")
+    parser.add_argument('--only', nargs='+', metavar='TERM', help="only pages whose name contains one of these")
+    parser.add_argument('-s', '--sessions', nargs='+', type=int, default=DEFAULT_SESSIONS, metavar='N',
+                        help="simultaneous students, one run per count (default: %(default)s)")
+    parser.add_argument('-d', '--duration', type=float, default=DEFAULT_DURATION,
+                        help="seconds of load per page and student count (default: %(default)s)")
+    parser.add_argument('--think', type=float, default=DEFAULT_THINK,
+                        help="mean seconds between a student's clicks, 0 for none (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument('--json', type=Path, metavar='PATH', help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    current = run(args.only, args.sessions, args.duration, args.think, args.seed)
+    print_report(current)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"\nresults written to {args.json}")
+
+    return 1 if any(result['errors'] for result in current['results'].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,157 +1,41 @@
 import streamlit as st
-import random
-import sympy as sp
-import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import algebra_helpers, algebra_bank, rerun_timings
+from utils.algebra_backend import sp
+from utils.generators.algebra_generator import AlgebraGenerator
+from utils.generators.base_generator import session_rng
+
+timer = rerun_timings.PageTimer("Algebra")
 
 class algebra:
 
     @staticmethod
+    @timer.timed("latex")
     def latex_equation(equation):
         """Convert a sympy equation to a LaTeX string with some custom formatting"""
-        # Convert to standard LaTeX
-        latex_str = sp.latex(equation)
-        
-        # Add custom formatting for better display
-        # Replace decimal powers with roots when possible
-        latex_str = re.sub(r'\^\{0\.5\}', r'^{\\frac{1}{2}}', latex_str)
-        latex_str = r"\LARGE{" + latex_str + r"}"
-        
-        return latex_str
+        # cached per process, so reruns that only touch widgets skip the LaTeX printer
+        return algebra_helpers.latex_equation(equation)
     
 
     @staticmethod
     def count_operations(expr):
         """Count the number of operations in an expression - used for complexity"""
-        if isinstance(expr, sp.Eq):
-            return algebra.count_operations(expr.lhs) + algebra.count_operations(expr.rhs)
-        
-        if expr.is_Add or expr.is_Mul:
-            return sum(algebra.count_operations(arg) for arg in expr.args) + len(expr.args) - 1
-        
-        if expr.is_Pow:
-            return algebra.count_operations(expr.base) + algebra.count_operations(expr.exp) + 1
-        
-        if isinstance(expr, sp.Pow) and expr.exp == 0.5:  # sqrt
-            return algebra.count_operations(expr.base) + 1
-            
-        return 0  # Atomic expression (symbol or number)
+        return algebra_helpers.count_operations(expr)
 
 
     @staticmethod
+    @timer.timed("generate")
     def generate_equation(difficulty):
         """Generate a random algebra equation with a pedagogically sound solution path"""
-        # Define difficulty parameters
-        if difficulty == 'easy':
-            num_steps = 2
-            operations = ['add', 'sub', 'mul', 'div']
-            max_value = 5
-        elif difficulty == 'medium':
-            num_steps = 3
-            operations = ['add', 'sub', 'mul', 'div']
-            max_value = 8
-        elif difficulty == 'hard':
-            num_steps = 3
-            operations = ['add', 'sub', 'mul', 'div', 'sqr']
-            max_value = 10
-        else:  # extra_hard
-            num_steps = 4
-            operations = ['add', 'sub', 'mul', 'div', 'sqr', 'sqrt']
-            max_value = 12
-        
-        # Choose target variable
-        variables = ['x', 'y', 'z', 'a', 'b', 'c', 'm', 'n', 'p', 'q']
-        var_target = random.choice(variables)
-        var_solve = random.choice([v for v in variables if v != var_target])
-        
-        # Start with the target variable
-        target_sym = sp.symbols(var_target)
-        solve_sym = sp.symbols(var_solve)
-        
-        # Begin with the simplest equation: solve_var = target_var
-        current_expr = target_sym
-        
-        # Build the solution path by applying random operations
-        solution_path = []
-        final_operations = []
-        
-        # Operation functions and their inverses
-        op_funcs = {
-            'add': (lambda x, v: x + v, 'Subtract', lambda x, v: x - v),
-            'sub': (lambda x, v: x - v, 'Add', lambda x, v: x + v),
-            'mul': (lambda x, v: x * v, 'Divide by', lambda x, v: x / v),
-            'div': (lambda x, v: x / v, 'Multiply by', lambda x, v: x * v),
-            'sqr': (lambda x, v: x ** 2, 'Take the square root', lambda x, v: sp.sqrt(x)),
-            'sqrt': (lambda x, v: sp.sqrt(x), 'Square it', lambda x, v: x ** 2),
-        }
-        
-        # Avoid consecutive inverse operations
-        inverse_pairs = {
-            'add': 'sub', 'sub': 'add',
-            'mul': 'div', 'div': 'mul',
-            'sqr': 'sqrt', 'sqrt': 'sqr'
-        }
-        
-        prev_op = None
-        
-        for _ in range(num_steps):
-            # Choose an operation (avoiding inverse of the previous one)
-            available_ops = [op for op in operations if op != inverse_pairs.get(prev_op, None)]
-            if not available_ops:
-                available_ops = operations.copy()
-            
-            op_name = random.choice(available_ops)
-            prev_op = op_name
-            
-            # Choose a value for the operation
-            if op_name in ['sqr', 'sqrt']:
-                value = None
-            else:
-                # For division, avoid values that make fractions too complex
-                if op_name == 'div':
-                    value = random.choice([2, 3, 4, 5])
-                else:
-                    value = random.randint(2, max_value)
-            
-            # Get the forward operation function
-            op_func, inverse_name, inverse_func = op_funcs[op_name]
-            
-            # Apply the operation to our expression
-            if value is None:
-                current_expr = op_func(current_expr, None)
-            else:
-                current_expr = op_func(current_expr, value)
-            
-            # Store the inverse operation for the solution path
-            solution_path.append({
-                'operation': inverse_name,
-                'value': value
-            })
-            
-            # Store the forward operation for display
-            final_operations.append({
-                'operation': op_name,
-                'value': value
-            })
-        
-        # Create the final equation
-        final_equation = sp.Eq(solve_sym, current_expr)
-        
-        # Now create a proper solution path in reverse
-        solution_steps = []
-        for step in reversed(solution_path):
-            solution_steps.append(step)
-        
-        return {
-            'equation': final_equation,
-            'target_var': var_target,
-            'solve_var': var_solve,
-            'solution_steps': solution_steps,
-            'operations_applied': final_operations,
-            'steps_taken': [],
-            'current_state': final_equation,
-            'original_equation': final_equation,
-        }
-
+        # pull from the pre-built bank (utils/algebra_bank.py) when it exists, otherwise build one now
+        rng = session_rng("algebra_", difficulty)
+        problem = algebra_bank.sample_problem(difficulty, rng)
+        if problem is None:
+            problem = AlgebraGenerator.shared().with_rng(rng).generate_equation(difficulty)
+        return problem
 
     @staticmethod
     def analyze_equation_state(equation, target_var):
@@ -245,78 +129,18 @@ class algebra:
     @staticmethod
     def apply_operation(equation, operation, value=None):
         """Apply an algebraic operation to both sides of the equation"""
-        lhs, rhs = equation.args
-        
-        if operation == "add":
-            if value is None:
-                return equation
-            return sp.Eq(lhs + value, rhs + value)
-        
-        elif operation == "subtract":
-            if value is None:
-                return equation
-            return sp.Eq(lhs - value, rhs - value)
-        
-        elif operation == "multiply":
-            if value is None or value == 0:
-                return equation
-            return sp.Eq(lhs * value, rhs * value)
-        
-        elif operation == "divide":
-            if value is None or value == 0:
-                return equation
-            return sp.Eq(lhs / value, rhs / value)
-        
-        elif operation == "square":
-            return sp.Eq(lhs ** 2, rhs ** 2)
-        
-        elif operation == "sqrt":
-            try:
-                return sp.Eq(sp.sqrt(lhs), sp.sqrt(rhs))
-            except:
-                return equation
-        
-        # If operation not recognized, return the original equation
-        return equation
+        return algebra_helpers.apply_operation(equation, operation, value)
 
 
     @staticmethod
     def simplify_powers(expr):
-        # Look for sqrt(x**2) -> x pattern
-        if isinstance(expr, sp.Pow) and expr.exp == sp.Rational(1, 2):  # sqrt
-            if isinstance(expr.base, sp.Pow) and expr.base.exp == 2:
-                return expr.base.base  # sqrt(x**2) -> x
-            
-            # Recurse through the expression tree
-        if hasattr(expr, 'args') and len(expr.args) > 0:
-            return expr.func(*[algebra.simplify_powers(arg) for arg in expr.args])
-        return expr
+        return algebra_helpers.simplify_powers(expr)
     
 
     @staticmethod
     def minimal_simplify(equation):
         """Only perform basic simplification without solving"""
-        try:
-            # Basic expansion
-            lhs = sp.expand(equation.lhs)
-            rhs = sp.expand(equation.rhs)
-            
-            # Try sympy's built-in powsimp function first
-            lhs = sp.powsimp(lhs)
-            rhs = sp.powsimp(rhs)
-            
-            # Then apply our custom power simplifications
-            lhs = algebra.simplify_powers(lhs)
-            rhs = algebra.simplify_powers(rhs)
-            
-            expanded = sp.Eq(lhs, rhs)
-            
-            # Only update if it actually simplifies without solving
-            if algebra.count_operations(expanded) < algebra.count_operations(equation):
-                return expanded
-        except:
-            pass
-        return equation
+        return algebra_helpers.minimal_simplify(equation)
 
 
     @staticmethod
@@ -345,18 +169,16 @@ class algebra:
 
 
     @staticmethod
+    @timer.timed("step")
     def process_step(equation, operation, value, target_var):
         """Process a single algebraic step"""
-        # Apply the operation
-        new_eq = algebra.apply_operation(equation, operation, value)
+        # Apply the operation and do minimal simplification, reusing cached work on unchanged subtrees
+        new_eq, simplified_eq = algebra_helpers.apply_and_simplify(equation, operation, value)
         
         # Check if this makes any change
-        if str(new_eq) == str(equation):
+        if new_eq == equation:
             return False, equation, "This operation doesn't change the equation."
         
-        # Do minimal simplification
-        simplified_eq = algebra.minimal_simplify(new_eq)
-        
         # Check if solved
         solved = algebra.is_truly_solved(simplified_eq, target_var)
         
@@ -381,6 +203,7 @@ class algebra:
 
 
     @staticmethod
+    @timer.timed("session_init")
     def initialize_session_state():
         """Initialize all session state variables"""
         if 'problem' not in st.session_state:
@@ -434,6 +257,7 @@ class algebra:
 
 
     @staticmethod
+    @timer.timed("rerun")
     def main():
         st.title("Step-by-Step Algebra Practice")
         
@@ -450,6 +274,9 @@ class algebra:
                     # Penalty for showing solution
                     st.session_state.hint_used = True
         
+        # the selectbox is drawn further down, read its last value for the first problem
+        difficulty = st.session_state.get("algebra_difficulty", "easy")
+
         # Generate initial problem if needed
         if st.session_state.problem is None:
             st.session_state.problem = algebra.generate_equation(difficulty)
@@ -468,7 +295,8 @@ class algebra:
             st.write("")
             difficulty = st.selectbox(
                 "Select difficulty:",
-                ['easy', 'medium', 'hard', 'extra_hard']
+                ['easy', 'medium', 'hard', 'extra_hard'],
+                key="algebra_difficulty"
             )
             
             # Prepare next problem when sidebar is rendered
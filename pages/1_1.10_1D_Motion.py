@@ -1,102 +1,54 @@
 import streamlit as st
 import sys
 from pathlib import Path
-import numpy as np
-import matplotlib.pyplot as plt
-import random
-import pandas as pd
-
-# Use a dark background for matplotlib so it fits a "dark mode" style
-plt.style.use("dark_background")
+from functools import partial
 
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.generators.linear_motion_generator import LinearMotionGenerator
 from utils.generators.projectile_generator import ProjectileGenerator
+from utils.generators.base_generator import session_rng
+from utils import prefetch, graph_render, attempt_store, rerun_timings
+from utils.performance_table import PerformanceTable
+
+timer = rerun_timings.PageTimer("1D Motion")
+
 
 class graphing:
     def generate_position_time_graph():
         """
-        Returns (fig, direction, motion_state, graph_label) for a randomly generated position-time graph
+        Returns the GraphSpec of a randomly generated position-time graph
         """
-        fig, ax = plt.subplots(figsize=(3, 2))  # Smaller figure size
-        t = np.linspace(0, 5, 100)
-
-        # Randomly pick one of four "types"
-        graph_type = random.choice(["linear_positive", "linear_negative", 
-                                    "acceleration_positive", "acceleration_negative"])
-
-        if graph_type == "linear_positive":
-            position = 2 * t + 1    # slope > 0, constant velocity
-            correct_direction = "Forward"
-            correct_motion_state = "Constant Velocity"
-        elif graph_type == "linear_negative":
-            position = -1.5 * t + 5 # slope < 0, constant velocity
-            correct_direction = "Backward"
-            correct_motion_state = "Constant Velocity"
-        elif graph_type == "acceleration_positive":
-            position = t**2         # slope increasing over time
-            correct_direction = "Forward"
-            correct_motion_state = "Accelerating (positive)"
-        else:  # "acceleration_negative"
-            position = -0.5 * t**2 + 5
-            correct_direction = "Backward"
-            correct_motion_state = "Accelerating (negative)"
-
-        ax.plot(t, position, color="cyan")
-        ax.set_xlabel("Time (s)", color="white")
-        ax.set_ylabel("Position (m)", color="white")
-        ax.set_title("Position-Time Graph", color="white")
-        ax.tick_params(axis='x', colors='white')
-        ax.tick_params(axis='y', colors='white')
-
-        fig.tight_layout()
-
-        return (fig, correct_direction, correct_motion_state)
+        # Randomly pick one of four "types"; session state only keeps the small spec, not the image
+        return graph_render.random_graph("position", session_rng("graph_", "position"))
 
     def generate_velocity_time_graph():
         """
-        Returns (fig, direction, motion_state) for a randomly generated velocity-time graph
+        Returns the GraphSpec of a randomly generated velocity-time graph
         """
-        fig, ax = plt.subplots(figsize=(3, 2))  # Smaller figure size
-        t = np.linspace(0, 5, 100)
-
-        # Randomly pick one of four "types"
-        graph_type = random.choice(["constant_positive", "constant_negative", 
-                                    "increasing_positive", "decreasing_negative"])
-
-        if graph_type == "constant_positive":
-            velocity = np.ones_like(t) * 2  # constant velocity > 0
-            correct_direction = "Forward"
-            correct_motion_state = "Constant Velocity"
-        elif graph_type == "constant_negative":
-            velocity = np.ones_like(t) * -1.5  # constant velocity < 0
-            correct_direction = "Backward"
-            correct_motion_state = "Constant Velocity"
-        elif graph_type == "increasing_positive":
-            velocity = t  # starts at 0, increasing
-            correct_direction = "Forward"
-            correct_motion_state = "Accelerating (positive)"
-        else:  # "decreasing_negative"
-            velocity = -0.5 * t - 1  # negative velocity, becomes more negative
-            correct_direction = "Backward"
-            correct_motion_state = "Accelerating (negative)"
-
-        ax.plot(t, velocity, color="orange")
-        ax.set_xlabel("Time (s)", color="white")
-        ax.set_ylabel("Velocity (m/s)", color="white")
-        ax.set_title("Velocity-Time Graph", color="white")
-        ax.tick_params(axis='x', colors='white')
-        ax.tick_params(axis='y', colors='white')
-
-        fig.tight_layout()
-
-        return (fig, correct_direction, correct_motion_state)
+        return graph_render.random_graph("velocity", session_rng("graph_", "velocity"))
+
+    @timer.timed("render")
+    def show_graph(spec):
+        """Draw a graph from its spec - each one is only ever rendered once per process"""
+        st.image(graph_render.render(spec), width="stretch")
+
+    @timer.timed("render")
+    def render_match_set(main_spec):
+        """PNGs for the main graph and the option graphs, all from the warmed cache"""
+        return graph_render.render_many([main_spec] + list(st.session_state.option_graphs or []))
 
+    @st.cache_resource(show_spinner=False)
+    def warm_graphs():
+        """Render all eight graphs once per process"""
+        graph_render.warm_cache()
+
+    @st.fragment
+    @timer.timed("fragment")
     def graphing_practice():
         st.title("Position-Time and Velocity-Time Graph Recognition")
         st.write("Use this page to practice identifying direction and state of motion from different graphs.")
 
-        # Use session state to store the current graph (so it doesn't regenerate on button press)
+        # Use session state to store the current graph's spec (so it doesn't regenerate on button press)
         if "pt_graph" not in st.session_state:
             st.session_state.pt_graph = None
         if "vt_graph" not in st.session_state:
@@ -123,10 +75,10 @@ class graphing:
 
             # If we have a stored graph, display it
             if st.session_state.pt_graph is not None:
-                fig, correct_dir, correct_state = st.session_state.pt_graph
+                correct_dir, correct_state = graph_render.spec_answers(st.session_state.pt_graph)
                 probCol1, probCol2 = st.columns(2)
                 with probCol1:
-                    st.pyplot(fig)
+                    graphing.show_graph(st.session_state.pt_graph)
                 with probCol2:
                     # Let user pick answers
                     user_dir = st.selectbox(
@@ -160,10 +112,10 @@ class graphing:
 
             # If we have a stored graph, display it
             if st.session_state.vt_graph is not None:
-                fig, correct_dir, correct_state = st.session_state.vt_graph
+                correct_dir, correct_state = graph_render.spec_answers(st.session_state.vt_graph)
                 probCol1, probCol2 = st.columns(2)
                 with probCol1:
-                    st.pyplot(fig)
+                    graphing.show_graph(st.session_state.vt_graph)
                 with probCol2:
                     # Let user pick answers
                     user_dir = st.selectbox(
@@ -191,6 +143,8 @@ class graphing:
         # --------------------------------------------
         else:
             st.write("You'll see either a position-time or velocity-time graph and try to match it among multiple options of the other type.")
+            # draw every graph the first time anyone opens this screen, then it's all cached
+            graphing.warm_graphs()
 
             # We randomly decide which main graph to show (P-T or V-T)
             show_pt_first = st.selectbox("Which primary graph type?", 
@@ -206,10 +160,11 @@ class graphing:
                     ]
 
                 if st.session_state.match_pt_graph is not None:
-                    fig_pt, dir_pt, state_pt = st.session_state.match_pt_graph
+                    dir_pt, state_pt = graph_render.spec_answers(st.session_state.match_pt_graph)
+                    main_image, *option_images = graphing.render_match_set(st.session_state.match_pt_graph)
                     col1,col2,col3,col4 = st.columns(4)
                     with col1:
-                        st.pyplot(fig_pt)
+                        st.image(main_image, width="stretch")
                         st.write("Match this Position-Time Graph to the correct Velocity-Time Graph")
 
                     # Display option graphs in columns
@@ -217,9 +172,9 @@ class graphing:
                         option_columns = col2,col3,col4
                         labels = ["A", "B", "C"]
 
-                        for col, label, (fig_vt, dir_vt, state_vt) in zip(option_columns, labels, st.session_state.option_graphs):
+                        for col, label, option_image in zip(option_columns, labels, option_images):
                             with col:
-                                st.pyplot(fig_vt)
+                                st.image(option_image, width="stretch")
                                 st.write(f"Option {label}")
                                 
 
@@ -231,7 +186,8 @@ class graphing:
 
                         if st.button("Check Match"):
                             chosen_index = labels.index(user_choice)
-                            _, dir_vt_selected, state_vt_selected = st.session_state.option_graphs[chosen_index]
+                            dir_vt_selected, state_vt_selected = graph_render.spec_answers(
+                                st.session_state.option_graphs[chosen_index])
 
                             # Basic matching logic: compare direction & motion state
                             # (You might want more sophisticated logic in practice)
@@ -251,19 +207,20 @@ class graphing:
                     ]
 
                 if st.session_state.match_vt_graph is not None:
-                    fig_vt, dir_vt, state_vt = st.session_state.match_vt_graph
+                    dir_vt, state_vt = graph_render.spec_answers(st.session_state.match_vt_graph)
+                    main_image, *option_images = graphing.render_match_set(st.session_state.match_vt_graph)
                     col1,col2,col3,col4 = st.columns(4)
                     with col1:
-                        st.pyplot(fig_vt)
+                        st.image(main_image, width="stretch")
                         st.write("Match this Velocity-Time Graph to the correct Position-Time Graph below.")
 
                     if st.session_state.option_graphs:
                         option_columns = col2,col3,col4
                         labels = ["A", "B", "C"]
 
-                        for col, label, (fig_pt, dir_pt, state_pt) in zip(option_columns, labels, st.session_state.option_graphs):
+                        for col, label, option_image in zip(option_columns, labels, option_images):
                             with col:
-                                st.pyplot(fig_pt)
+                                st.image(option_image, width="stretch")
                                 st.write(f"Option {label}")
 
                         user_choice = st.selectbox(
@@ -273,7 +230,8 @@ class graphing:
 
                         if st.button("Check Match"):
                             chosen_index = labels.index(user_choice)
-                            _, dir_pt_selected, state_pt_selected = st.session_state.option_graphs[chosen_index]
+                            dir_pt_selected, state_pt_selected = graph_render.spec_answers(
+                                st.session_state.option_graphs[chosen_index])
 
                             if (dir_pt_selected == dir_vt) and (state_pt_selected == state_vt):
                                 st.success("Correct match!")
@@ -305,15 +263,12 @@ class linear_fns:
         prefix = "linear_motion"
         _, problem_types, difficulties = linear_fns.question_parameters()
             
-        performance_dict = {}
-        for p_type in problem_types:
-            performance_dict[p_type] = {}
-            for diff in difficulties:
-                performance_dict[p_type][diff] = {'attempts': 0, 'correct': 0}     
+        performance_dict = PerformanceTable(problem_types, difficulties)
         st.session_state[f"{prefix}_performance"] = performance_dict
         return performance_dict
 
     @staticmethod
+    @timer.timed("session_init")
     def initialize_session_state():
         prefix = "linear_motion"
         base_vars = [
@@ -338,90 +293,65 @@ class linear_fns:
     
         # Initialize performance tracking dictionary if it doesn't exist
         if f"{prefix}_performance" not in st.session_state:
-            st.session_state[f"{prefix}_performance"] = linear_fns.clear_performance_dataframe()
+            # pick up this student's counts from before a reload or reconnect
+            st.session_state[f"{prefix}_performance"] = attempt_store.restore_performance(
+                prefix, linear_fns.clear_performance_dataframe())
     
     @staticmethod
+    @timer.timed("generate")
     def generate_question(generator, problem_type, difficulty):
-        prefix = "linear_motion"
-        if problem_type == "No Time":
-            question, answer, unit = generator.no_time_question(difficulty)
-        elif problem_type == "No Distance":
-            question, answer, unit = generator.no_dist_question(difficulty)
-        elif problem_type == "No Acceleration":
-            question, answer, unit = generator.no_acc_question(difficulty)
-        elif problem_type == "No Final Velocity":
-            question, answer, unit = generator.no_vf_question(difficulty)
-        else:  # Mixed
-            question, answer, unit = generator.mixed_question(difficulty)
+        question, answer, unit = prefetch.next_question(
+            "linear_motion", (problem_type, difficulty),
+            partial(generator.for_session(problem_type, difficulty).generate_question, problem_type, difficulty))
         return question, answer, unit
 
     @staticmethod
-    def create_performance_dataframe():
-        """Create a pandas DataFrame from the performance tracking dictionary"""
+    @timer.timed("performance_table")
+    def performance_table():
+        """Markdown for the performance table - only rebuilt after a new attempt"""
         prefix = "linear_motion"
-        performance = st.session_state[f"{prefix}_performance"]
-        
-        # Create lists to hold data
-        rows = []
-        
-        # Format data for dataframe
-        for problem_type, difficulties in performance.items():
-            for difficulty, stats in difficulties.items():
-                attempts = stats['attempts']
-                correct = stats['correct']
-                
-                # Calculate percentage or display NA if no attempts
-                if attempts > 0:
-                    percentage = f"{(correct / attempts * 100):.1f}%"
-                    display = f"{correct}/{attempts} ({percentage})"
-                else:
-                    display = "0/0 (0.0%)"
-                    
-                rows.append({
-                    "Problem Type": problem_type,
-                    "Difficulty": difficulty,
-                    "Performance": display
-                })
-        
-        # Create DataFrame
-        df = pd.DataFrame(rows)
-        
-        # Pivot the dataframe to get desired format
-        pivot_df = df.pivot(index="Problem Type", columns="Difficulty", values="Performance")
-        
-        # Ensure all difficulty levels are present
-        for col in ["Easy", "Medium", "Hard"]:
-            if col not in pivot_df.columns:
-                pivot_df[col] = "0/0 (0.0%)"
-        
-        # Reorder columns
-        pivot_df = pivot_df[["Easy", "Medium", "Hard"]]
-        
-        return pivot_df
+        return st.session_state[f"{prefix}_performance"].to_markdown()
 
     @staticmethod
     def update_performance(problem_type, difficulty, is_correct):
         """Update the performance tracking dictionary when an answer is submitted"""
         prefix = "linear_motion"
         performance = st.session_state[f"{prefix}_performance"]
-        
-        # Increment attempts
-        performance[problem_type][difficulty]['attempts'] += 1
-        
-        # Increment correct if answer was correct
-        if is_correct:
-            performance[problem_type][difficulty]['correct'] += 1
-        
-        # Update session state
-        st.session_state[f"{prefix}_performance"] = performance
+        performance.record(problem_type, difficulty, is_correct)
+
+        # and keep it beyond this session (written to disk in the background)
+        attempt_store.record_attempt(prefix, problem_type, difficulty, is_correct)
+
+    @staticmethod
+    def new_question(generator, problem_type, difficulty):
+        """Swap in a fresh question. Used as a button callback, so it runs before the tab redraws"""
+        prefix = "linear_motion"
+        question, answer, unit = linear_fns.generate_question(generator, problem_type, difficulty)
+        st.session_state[f"{prefix}_question_id"] += 1
+        st.session_state[f"{prefix}_current_question"] = question
+        st.session_state[f"{prefix}_correct_answer"] = answer
+        st.session_state[f"{prefix}_unit"] = unit
+        st.session_state[f"{prefix}_submitted"] = False
+        generator.clear_answers()
+
+    @staticmethod
+    def reset_performance(generator, problem_type, difficulty):
+        """Clear the performance table and move on to a fresh question (button callback)"""
+        prefix = "linear_motion"
+        linear_fns.initialize_session_state()
+        st.session_state[f"{prefix}_performance"] = linear_fns.clear_performance_dataframe()
+        attempt_store.record_reset(prefix)
+        linear_fns.new_question(generator, problem_type, difficulty)
 
     @staticmethod
+    @st.fragment
+    @timer.timed("fragment")
     def linear_motion_problems():
         st.title("Linear Motion Problems")
         prefix = "linear_motion"
         linear_fns.initialize_session_state()
 
-        generator = LinearMotionGenerator()
+        generator = LinearMotionGenerator.shared()
 
         problem_type_dict, problem_types, difficulties = linear_fns.question_parameters()
         # UI Controls
@@ -433,12 +363,13 @@ class linear_fns:
                 options=list(problem_types),
                 key="problem_type_select")
                 
-            if selected_problem_type != "Mixed":
-                equation = problem_type_dict[selected_problem_type]  # Exclude Mixed from standalone LaTeX rendering
-                st.latex(equation)
-            else:
-                st.latex(r"v_f^2 = v_i^2 + 2a \cdot x")
-                st.latex(r"x = v_i \cdot t + \frac{1}{2} a \cdot t^2")
+            with timer.phase("latex"):
+                if selected_problem_type != "Mixed":
+                    equation = problem_type_dict[selected_problem_type]  # Exclude Mixed from standalone LaTeX rendering
+                    st.latex(equation)
+                else:
+                    st.latex(r"v_f^2 = v_i^2 + 2a \cdot x")
+                    st.latex(r"x = v_i \cdot t + \frac{1}{2} a \cdot t^2")
             problem_type = selected_problem_type
 
         with col2:
@@ -449,22 +380,16 @@ class linear_fns:
             )
             
             if selected_problem_type == "Mixed":
-                st.latex(r"v_f = v_i + a \cdot t")
-                st.latex(r"x = \frac{(v_f + v_i)}{2} \cdot t")
+                with timer.phase("latex"):
+                    st.latex(r"v_f = v_i + a \cdot t")
+                    st.latex(r"x = \frac{(v_f + v_i)}{2} \cdot t")
         with col3:
             st.write("")
         with col4:
             st.write("")
             st.write("")
-            if st.button("New Question",key=f"{prefix}_new_question"):
-                question, answer, unit = linear_fns.generate_question(generator, problem_type, difficulty)
-                st.session_state[f"{prefix}_question_id"] += 1
-                st.session_state[f"{prefix}_current_question"] = question
-                st.session_state[f"{prefix}_correct_answer"] = answer
-                st.session_state[f"{prefix}_unit"] = unit
-                st.session_state[f"{prefix}_submitted"] = False
-                generator.clear_answers()
-                st.rerun()
+            st.button("New Question", key=f"{prefix}_new_question",
+                      on_click=linear_fns.new_question, args=(generator, problem_type, difficulty))
         # Check if we need a new question
         if (problem_type != st.session_state[f"{prefix}_problem_type"] or 
             st.session_state[f"{prefix}_current_question"] is None):
@@ -479,8 +404,9 @@ class linear_fns:
             generator.clear_answers()
 
         # Display current question
-        st.subheader("Question:")
-        st.write(st.session_state[f"{prefix}_current_question"])
+        with timer.phase("render"):
+            st.subheader("Question:")
+            st.write(st.session_state[f"{prefix}_current_question"])
         in_col1, in_col2, in_col3 = st.columns(3)
         # Input fields
         with in_col1:
@@ -518,26 +444,17 @@ class linear_fns:
             
         
         with st.expander("Your Performance", expanded=False):
-            performance_df = linear_fns.create_performance_dataframe()
-            st.dataframe(performance_df, use_container_width=True)
+            st.markdown(linear_fns.performance_table())
         
         # Add a reset performance button
-        if st.button("Reset Performance Statistics",key=f"{prefix}_performance_reset"):
-            linear_fns.initialize_session_state()
-            st.session_state[f"{prefix}_performance"] = linear_fns.clear_performance_dataframe()
-            question, answer, unit = linear_fns.generate_question(generator, problem_type, difficulty)
-            st.session_state[f"{prefix}_question_id"] += 1
-            st.session_state[f"{prefix}_current_question"] = question
-            st.session_state[f"{prefix}_correct_answer"] = answer
-            st.session_state[f"{prefix}_unit"] = unit
-            st.session_state[f"{prefix}_submitted"] = False
-            generator.clear_answers()
-            st.rerun()
+        st.button("Reset Performance Statistics", key=f"{prefix}_performance_reset",
+                  on_click=linear_fns.reset_performance, args=(generator, problem_type, difficulty))
 
 
 
 class Projectile_fns:
     @staticmethod
+    @timer.timed("session_init")
     def initialize_projectile_session_state():
         if 'current_question' not in st.session_state:
             st.session_state.current_question = None
@@ -562,10 +479,12 @@ class Projectile_fns:
         if 'problem_type' not in st.session_state:
             st.session_state.problem_type = None
     @staticmethod
+    @timer.timed("generate")
     def generate_new_projectile_question(generator, problem_type, difficulty):
         st.session_state.current_question, st.session_state.correct_answer, \
         st.session_state.correct_answer2, st.session_state.unit, st.session_state.unit2 = \
-            generator.generate_question(problem_type, difficulty)
+            prefetch.next_question("proj", (problem_type, difficulty),
+                                   partial(generator.for_session(problem_type, difficulty).generate_question, problem_type, difficulty))
         st.session_state.difficulty = difficulty
         st.session_state.problem_type = problem_type
         st.session_state.user_answer = None
@@ -574,13 +493,15 @@ class Projectile_fns:
         st.session_state.question_id += 1
     
     @staticmethod
+    @st.fragment
+    @timer.timed("fragment")
     def projectile_practice():
         st.title("Projectile Motion")
         
         Projectile_fns.initialize_projectile_session_state()
         
         # Create generator instance
-        generator = ProjectileGenerator()
+        generator = ProjectileGenerator.shared()
         
         # UI Controls
         col1, col2 = st.columns(2)
@@ -604,7 +525,8 @@ class Projectile_fns:
             Projectile_fns.generate_new_projectile_question(generator, proj_problem_type, difficulty)
 
         if st.session_state.current_question:
-            st.write(st.session_state.current_question)
+            with timer.phase("render"):
+                st.write(st.session_state.current_question)
             
             # Input fields
             unit = st.session_state.unit
@@ -658,13 +580,15 @@ class Projectile_fns:
                 else:
                     st.error("Please enter an answer before submitting.")
 
-            # New Question button
-            if st.button("New Question"):
-                Projectile_fns.generate_new_projectile_question(generator, proj_problem_type, difficulty)
-                st.rerun()
+            # New Question button - a callback, so the new question is in place before the tab redraws
+            st.button("New Question", on_click=Projectile_fns.generate_new_projectile_question,
+                      args=(generator, proj_problem_type, difficulty))
 
 
+@timer.timed("rerun")
 def main():
+    # Each tab is an st.fragment: using a tab's widgets reruns just that tab,
+    # not the other tabs' generators, graphs and performance tables
     # Add tabs for quiz and explorer modes
     tab1, tab2,tab3 = st.tabs(["Linear Motion Problems", "Graphing Practice","Projectile Practice"])
     
@@ -1,7 +1,14 @@
 import streamlit as st
+import sys
+from pathlib import Path
 
 import random
 
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import rerun_timings
+
+timer = rerun_timings.PageTimer("Forces")
+
 st.set_page_config(page_title="Forces")
 st.sidebar.header("Forces")
 
@@ -19,6 +26,7 @@ def generate_acceleration_question():
     question = f"If a force of {force:.2f} N is applied to a mass of {mass:.2f} kg, what is the acceleration? (m/s²)"
     return question, acceleration
 
+@timer.timed("session_init")
 def initialize_session_state():
     if 'problem_type' not in st.session_state:
         st.session_state.problem_type = None
@@ -33,6 +41,7 @@ def initialize_session_state():
     if 'question_id' not in st.session_state:
         st.session_state.question_id = 0
 
+@timer.timed("generate")
 def generate_new_question(problem_type):
     if problem_type == "Calculate Force":
         st.session_state.current_question, st.session_state.correct_answer = generate_force_question()
@@ -43,6 +52,7 @@ def generate_new_question(problem_type):
     st.session_state.submitted = False
     st.session_state.question_id += 1  # Increment question ID for new input field key
 
+@timer.timed("rerun")
 def main():
     st.title("Forces Problems")
 
@@ -1,11 +1,16 @@
 # pages/collisions.py
 import streamlit as st
 import sys
+from functools import partial
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.generators.collision_generator import CollisionGenerator
+from utils import prefetch, rerun_timings
 
+timer = rerun_timings.PageTimer("Collisions")
+
+@timer.timed("session_init")
 def initialize_session_state():
     prefix = "collision_"  # hardcode this instead of getting from generator
     base_vars = [
@@ -38,10 +43,11 @@ def initialize_session_state():
         st.session_state[f"{prefix}total_correct"] = 0
 
 
+@timer.timed("rerun")
 def main():
     prefix = "collision_"  # use same prefix here
     st.title("Collisions")
-    generator = CollisionGenerator()
+    generator = CollisionGenerator.shared()
     initialize_session_state()
     correct = st.session_state[f"{prefix}total_correct"]
     total = st.session_state[f"{prefix}total_answered"]
@@ -71,7 +77,9 @@ def main():
         st.session_state[f"{prefix}current_question"] is None):
         
         # Generate new question and store in session state
-        question, answer, unit, answer2, unit2 = generator.generate_question(problem_type, difficulty)
+        question, answer, unit, answer2, unit2 = prefetch.next_question(
+            "collision", (problem_type, difficulty),
+            partial(generator.for_session(problem_type, difficulty).generate_question, problem_type, difficulty))
         st.session_state[f"{prefix}current_question"] = question
         st.session_state[f"{prefix}correct_answer"] = answer
         st.session_state[f"{prefix}correct_answer2"] = answer2
@@ -110,7 +118,9 @@ def main():
     
     # New Question button
     if st.button("New Question"):
-        question, answer, unit, answer2, unit2 = generator.generate_question(problem_type, difficulty)
+        question, answer, unit, answer2, unit2 = prefetch.next_question(
+            "collision", (problem_type, difficulty),
+            partial(generator.for_session(problem_type, difficulty).generate_question, problem_type, difficulty))
         st.session_state[f"{prefix}question_id"] += 1
         st.session_state[f"{prefix}current_question"] = question
         st.session_state[f"{prefix}correct_answer"] = answer
@@ -1,10 +1,16 @@
 import streamlit as st
 import sys
 from pathlib import Path
-import pandas as pd
+from functools import partial
 
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.generators.energy_generator import EnergyGenerator
+from utils import prefetch, attempt_store, rerun_timings
+from utils.performance_table import PerformanceTable
+
+timer = rerun_timings.PageTimer("Energy")
+
+
 class energy_basics:
 
     @staticmethod
@@ -21,18 +27,11 @@ class energy_basics:
         return problem_type_dict, problem_types, difficulties
     
     @staticmethod
+    @timer.timed("generate")
     def generate_question(generator, problem_type, difficulty):
-        if problem_type == "Elastic Potential Energy":
-            question, answer, unit = generator.elastic_problem(difficulty)
-        elif problem_type == "Kinetic Energy":
-            question, answer, unit = generator.kinetic_problem(difficulty)
-        elif problem_type == "Gravitational Potential Energy":
-            question, answer, unit = generator.gravitational_problem(difficulty)
-        elif problem_type == "Work":
-            question, answer, unit = generator.work_problem(difficulty)
-        else:
-            pass
-        
+        question, answer, unit = prefetch.next_question(
+            "energy_basics", (problem_type, difficulty),
+            partial(generator.for_session(problem_type, difficulty).generate_question, problem_type, difficulty))
         return question, answer, unit
     
     @staticmethod
@@ -41,15 +40,12 @@ class energy_basics:
         prefix = "energy_basics"
         _, problem_types, difficulties = energy_basics.question_parameters()
             
-        performance_dict = {}
-        for p_type in problem_types:
-            performance_dict[p_type] = {}
-            for diff in difficulties:
-                performance_dict[p_type][diff] = {'attempts': 0, 'correct': 0}     
+        performance_dict = PerformanceTable(problem_types, difficulties)
         st.session_state[f"{prefix}_performance"] = performance_dict
         return performance_dict
 
     @staticmethod
+    @timer.timed("session_init")
     def initialize_session_state():
         prefix = "energy_basics"
         base_vars = [
@@ -74,82 +70,63 @@ class energy_basics:
     
         # Initialize performance tracking dictionary if it doesn't exist
         if f"{prefix}_performance" not in st.session_state:
-            st.session_state[f"{prefix}_performance"] = energy_basics.clear_performance_dataframe()
+            # pick up this student's counts from before a reload or reconnect
+            st.session_state[f"{prefix}_performance"] = attempt_store.restore_performance(
+                prefix, energy_basics.clear_performance_dataframe())
     
 
 
     @staticmethod
-    def create_performance_dataframe():
-        """Create a pandas DataFrame from the performance tracking dictionary"""
+    @timer.timed("performance_table")
+    def performance_table():
+        """Markdown for the performance table - only rebuilt after a new attempt"""
         prefix = "energy_basics"
-        performance = st.session_state[f"{prefix}_performance"]
-        
-        # Create lists to hold data
-        rows = []
-        
-        # Format data for dataframe
-        for problem_type, difficulties in performance.items():
-            for difficulty, stats in difficulties.items():
-                attempts = stats['attempts']
-                correct = stats['correct']
-                
-                # Calculate percentage or display NA if no attempts
-                if attempts > 0:
-                    percentage = f"{(correct / attempts * 100):.1f}%"
-                    display = f"{correct}/{attempts} ({percentage})"
-                else:
-                    display = "0/0 (0.0%)"
-                    
-                rows.append({
-                    "Problem Type": problem_type,
-                    "Difficulty": difficulty,
-                    "Performance": display
-                })
-        
-        # Create DataFrame
-        df = pd.DataFrame(rows)
-        
-        # Pivot the dataframe to get desired format
-        pivot_df = df.pivot(index="Problem Type", columns="Difficulty", values="Performance")
-        
-        # Ensure all difficulty levels are present
-        for col in difficulties:
-            if col not in pivot_df.columns:
-                pivot_df[col] = "0/0 (0.0%)"
-        
-        # Reorder columns
-        pivot_df = pivot_df[list(difficulties.keys())]
-        
-        return pivot_df
+        return st.session_state[f"{prefix}_performance"].to_markdown()
 
     @staticmethod
     def update_performance(problem_type, difficulty, is_correct):
         """Update the performance tracking dictionary when an answer is submitted"""
         prefix = "energy_basics"
         performance = st.session_state[f"{prefix}_performance"]
-        
-        # Increment attempts
-        performance[problem_type][difficulty]['attempts'] += 1
-        
-        # Increment correct if answer was correct
-        if is_correct:
-            performance[problem_type][difficulty]['correct'] += 1
-        
-        # Update session state
-        st.session_state[f"{prefix}_performance"] = performance
+        performance.record(problem_type, difficulty, is_correct)
+
+        # and keep it beyond this session (written to disk in the background)
+        attempt_store.record_attempt(prefix, problem_type, difficulty, is_correct)
+
+    @staticmethod
+    def new_question(generator, problem_type, difficulty):
+        """Swap in a fresh question. Used as a button callback, so it runs before the tab redraws"""
+        prefix = "energy_basics"
+        question, answer, unit = energy_basics.generate_question(generator, problem_type, difficulty)
+        st.session_state[f"{prefix}_question_id"] += 1
+        st.session_state[f"{prefix}_current_question"] = question
+        st.session_state[f"{prefix}_correct_answer"] = answer
+        st.session_state[f"{prefix}_unit"] = unit
+        st.session_state[f"{prefix}_submitted"] = False
+        generator.clear_answers()
 
     @staticmethod
+    def reset_performance(generator, problem_type, difficulty):
+        """Clear the performance table and move on to a fresh question (button callback)"""
+        prefix = "energy_basics"
+        energy_basics.initialize_session_state()
+        st.session_state[f"{prefix}_performance"] = energy_basics.clear_performance_dataframe()
+        attempt_store.record_reset(prefix)
+        energy_basics.new_question(generator, problem_type, difficulty)
+
+    @staticmethod
+    @st.fragment
+    @timer.timed("fragment")
     def energy_basics_tab():
         st.title("Types of Energy Problems")
         prefix = "energy_basics"
         energy_basics.initialize_session_state()
 
-        generator = EnergyGenerator()
+        generator = EnergyGenerator.shared()
 
         problem_type_dict, problem_types, difficulties = energy_basics.question_parameters()
         with st.expander("Your Performance", expanded=False):
-            performance_df = energy_basics.create_performance_dataframe()
-            st.dataframe(performance_df, use_container_width=True)
+            st.markdown(energy_basics.performance_table())
 
         # UI Controls
         col1, col2 = st.columns(2)
@@ -183,8 +160,9 @@ class energy_basics:
             generator.clear_answers()
 
         # Display current question
-        st.subheader("Question:")
-        st.write(st.session_state[f"{prefix}_current_question"])
+        with timer.phase("render"):
+            st.subheader("Question:")
+            st.write(st.session_state[f"{prefix}_current_question"])
         
         # Input fields
         user_input = st.number_input(
@@ -219,29 +197,13 @@ class energy_basics:
             st.write("")            
            
         with in_col3: #new question button
-            if st.button("New Question",key=f"{prefix}_new_question"):
-                question, answer, unit = energy_basics.generate_question(generator, problem_type, difficulty)
-                st.session_state[f"{prefix}_question_id"] += 1
-                st.session_state[f"{prefix}_current_question"] = question
-                st.session_state[f"{prefix}_correct_answer"] = answer
-                st.session_state[f"{prefix}_unit"] = unit
-                st.session_state[f"{prefix}_submitted"] = False
-                generator.clear_answers()
-                st.rerun()
+            st.button("New Question", key=f"{prefix}_new_question",
+                      on_click=energy_basics.new_question, args=(generator, problem_type, difficulty))
 
         # reset performance button
 
-        if st.button("Reset Performance Statistics",key=f"{prefix}_performance_reset"):
-            energy_basics.initialize_session_state()
-            st.session_state[f"{prefix}_performance"] = energy_basics.clear_performance_dataframe()
-            question, answer, unit = energy_basics.generate_question(generator, problem_type, difficulty)
-            st.session_state[f"{prefix}_question_id"] += 1
-            st.session_state[f"{prefix}_current_question"] = question
-            st.session_state[f"{prefix}_correct_answer"] = answer
-            st.session_state[f"{prefix}_unit"] = unit
-            st.session_state[f"{prefix}_submitted"] = False
-            generator.clear_answers()
-            st.rerun()
+        st.button("Reset Performance Statistics", key=f"{prefix}_performance_reset",
+                  on_click=energy_basics.reset_performance, args=(generator, problem_type, difficulty))
 
 
 class energy_conservation:
@@ -259,16 +221,11 @@ class energy_conservation:
         return problem_type_dict, problem_types, difficulties
     
     @staticmethod
+    @timer.timed("generate")
     def generate_question(generator, problem_type, difficulty):
-        if problem_type == "Elastic <--> Kinetic":
-            question, answer, unit = generator.elastic_kinetic_problem(difficulty)
-        elif problem_type == "Gravitational <--> Kinetic":
-            question, answer, unit = generator.kinetic_gravitational_problem(difficulty)
-        elif problem_type == "Gravitational <--> Elastic":
-            question, answer, unit = generator.elastic_gravitational_problem(difficulty)
-        else:
-            pass
-        
+        question, answer, unit = prefetch.next_question(
+            "energy_conservation", (problem_type, difficulty),
+            partial(generator.for_session(problem_type, difficulty).generate_question, problem_type, difficulty))
         return question, answer, unit
     
     @staticmethod
@@ -277,15 +234,12 @@ class energy_conservation:
         prefix = "energy_conservation"
         _, problem_types, difficulties = energy_conservation.question_parameters()
             
-        performance_dict = {}
-        for p_type in problem_types:
-            performance_dict[p_type] = {}
-            for diff in difficulties:
-                performance_dict[p_type][diff] = {'attempts': 0, 'correct': 0}     
+        performance_dict = PerformanceTable(problem_types, difficulties)
         st.session_state[f"{prefix}_performance"] = performance_dict
         return performance_dict
 
     @staticmethod
+    @timer.timed("session_init")
     def initialize_session_state():
         prefix = "energy_conservation"
         base_vars = [
@@ -310,83 +264,64 @@ class energy_conservation:
     
         # Initialize performance tracking dictionary if it doesn't exist
         if f"{prefix}_performance" not in st.session_state:
-            st.session_state[f"{prefix}_performance"] = energy_conservation.clear_performance_dataframe()
+            # pick up this student's counts from before a reload or reconnect
+            st.session_state[f"{prefix}_performance"] = attempt_store.restore_performance(
+                prefix, energy_conservation.clear_performance_dataframe())
     
 
 
     @staticmethod
-    def create_performance_dataframe():
-        """Create a pandas DataFrame from the performance tracking dictionary"""
+    @timer.timed("performance_table")
+    def performance_table():
+        """Markdown for the performance table - only rebuilt after a new attempt"""
         prefix = "energy_conservation"
-        performance = st.session_state[f"{prefix}_performance"]
-        
-        # Create lists to hold data
-        rows = []
-        
-        # Format data for dataframe
-        for problem_type, difficulties in performance.items():
-            for difficulty, stats in difficulties.items():
-                attempts = stats['attempts']
-                correct = stats['correct']
-                
-                # Calculate percentage or display NA if no attempts
-                if attempts > 0:
-                    percentage = f"{(correct / attempts * 100):.1f}%"
-                    display = f"{correct}/{attempts} ({percentage})"
-                else:
-                    display = "0/0 (0.0%)"
-                    
-                rows.append({
-                    "Problem Type": problem_type,
-                    "Difficulty": difficulty,
-                    "Performance": display
-                })
-        
-        # Create DataFrame
-        df = pd.DataFrame(rows)
-        
-        # Pivot the dataframe to get desired format
-        pivot_df = df.pivot(index="Problem Type", columns="Difficulty", values="Performance")
-        
-        # Ensure all difficulty levels are present
-        for col in difficulties:
-            if col not in pivot_df.columns:
-                pivot_df[col] = "0/0 (0.0%)"
-        
-        # Reorder columns
-        pivot_df = pivot_df[list(difficulties.keys())]
-        
-        return pivot_df
+        return st.session_state[f"{prefix}_performance"].to_markdown()
 
     @staticmethod
     def update_performance(problem_type, difficulty, is_correct):
         """Update the performance tracking dictionary when an answer is submitted"""
         prefix = "energy_conservation"
         performance = st.session_state[f"{prefix}_performance"]
-        
-        # Increment attempts
-        performance[problem_type][difficulty]['attempts'] += 1
-        
-        # Increment correct if answer was correct
-        if is_correct:
-            performance[problem_type][difficulty]['correct'] += 1
-        
-        # Update session state
-        st.session_state[f"{prefix}_performance"] = performance
+        performance.record(problem_type, difficulty, is_correct)
+
+        # and keep it beyond this session (written to disk in the background)
+        attempt_store.record_attempt(prefix, problem_type, difficulty, is_correct)
+
+    @staticmethod
+    def new_question(generator, problem_type, difficulty):
+        """Swap in a fresh question. Used as a button callback, so it runs before the tab redraws"""
+        prefix = "energy_conservation"
+        question, answer, unit = energy_conservation.generate_question(generator, problem_type, difficulty)
+        st.session_state[f"{prefix}_question_id"] += 1
+        st.session_state[f"{prefix}_current_question"] = question
+        st.session_state[f"{prefix}_correct_answer"] = answer
+        st.session_state[f"{prefix}_unit"] = unit
+        st.session_state[f"{prefix}_submitted"] = False
+        generator.clear_answers()
 
     @staticmethod
+    def reset_performance(generator, problem_type, difficulty):
+        """Clear the performance table and move on to a fresh question (button callback)"""
+        prefix = "energy_conservation"
+        energy_conservation.initialize_session_state()
+        st.session_state[f"{prefix}_performance"] = energy_conservation.clear_performance_dataframe()
+        attempt_store.record_reset(prefix)
+        energy_conservation.new_question(generator, problem_type, difficulty)
+
+    @staticmethod
+    @st.fragment
+    @timer.timed("fragment")
     def energy_conservation_tab():
         st.title("Conservation of Energy Problems")
         prefix = "energy_conservation"
         energy_conservation.initialize_session_state()
 
-        generator = EnergyGenerator()
+        generator = EnergyGenerator.shared()
 
         problem_type_dict, problem_types, difficulties = energy_conservation.question_parameters()
 
         with st.expander("Your Performance", expanded=False):
-            performance_df = energy_conservation.create_performance_dataframe()
-            st.dataframe(performance_df, use_container_width=True)
+            st.markdown(energy_conservation.performance_table())
         # UI Controls
         col1, col2 = st.columns(2)
         with col1:
@@ -420,8 +355,9 @@ class energy_conservation:
             generator.clear_answers()
 
         # Display current question
-        st.subheader("Question:")
-        st.write(st.session_state[f"{prefix}_current_question"])
+        with timer.phase("render"):
+            st.subheader("Question:")
+            st.write(st.session_state[f"{prefix}_current_question"])
         user_input = st.number_input(
                 f"Answer (in {st.session_state[f'{prefix}_unit']}):",
                 value=None,
@@ -454,15 +390,8 @@ class energy_conservation:
             st.write("")
            
         with in_col3:
-            if st.button("New Question",key=f"{prefix}_new_question"):
-                question, answer, unit = energy_conservation.generate_question(generator, problem_type, difficulty)
-                st.session_state[f"{prefix}_question_id"] += 1
-                st.session_state[f"{prefix}_current_question"] = question
-                st.session_state[f"{prefix}_correct_answer"] = answer
-                st.session_state[f"{prefix}_unit"] = unit
-                st.session_state[f"{prefix}_submitted"] = False
-                generator.clear_answers()
-                st.rerun()
+            st.button("New Question", key=f"{prefix}_new_question",
+                      on_click=energy_conservation.new_question, args=(generator, problem_type, difficulty))
             st.write("")
              # Submit button
             
@@ -473,20 +402,13 @@ class energy_conservation:
         
         # Add a reset performance button
 
-        if st.button("Reset Performance Statistics",key=f"{prefix}_performance_reset"):
-            energy_conservation.initialize_session_state()
-            st.session_state[f"{prefix}_performance"] = energy_conservation.clear_performance_dataframe()
-            question, answer, unit = energy_conservation.generate_question(generator, problem_type, difficulty)
-            st.session_state[f"{prefix}_question_id"] += 1
-            st.session_state[f"{prefix}_current_question"] = question
-            st.session_state[f"{prefix}_correct_answer"] = answer
-            st.session_state[f"{prefix}_unit"] = unit
-            st.session_state[f"{prefix}_submitted"] = False
-            generator.clear_answers()
-            st.rerun()
+        st.button("Reset Performance Statistics", key=f"{prefix}_performance_reset",
+                  on_click=energy_conservation.reset_performance, args=(generator, problem_type, difficulty))
 
 
+@timer.timed("rerun")
 def main():
+    # Each tab is an st.fragment: using a tab's widgets reruns just that tab
     # Add tabs for quiz and explorer modes
     tab1, tab2 = st.tabs(["Types of Energy", "Conservation of Energy"])
     
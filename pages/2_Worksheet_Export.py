@@ -0,0 +1,79 @@
+import streamlit as st
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import rerun_timings, worksheet_export
+
+# the app builds the files in memory for the download buttons, bigger runs belong on the command line
+MAX_PROBLEMS = 5000
+
+timer = rerun_timings.PageTimer("Worksheet Export")
+
+def initialize_session_state():
+    if 'worksheet_files' not in st.session_state:
+        st.session_state.worksheet_files = None
+
+def clear_files():
+    # whatever was built no longer matches the options
+    st.session_state.worksheet_files = None
+
+@timer.timed("build")
+def build_worksheet(source, count, fmt, problem_types, difficulties, seed):
+    """Run the export into a scratch folder and keep both files' bytes for the download buttons"""
+    bar = st.progress(0.0, text="Building worksheet...")
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = worksheet_export.export(
+            source, count, Path(scratch) / source, fmt, problem_types, difficulties, seed,
+            progress=lambda done: bar.progress(done / count, text=f"{done}/{count} problems"))
+        st.session_state.worksheet_files = [(path.name, path.read_bytes()) for path in paths]
+    bar.empty()
+
+@timer.timed("rerun")
+def main():
+    initialize_session_state()
+    st.title("Worksheet Export")
+    st.write("Build a worksheet of practice problems and a separate answer key to print or hand out.")
+
+    source = st.selectbox("Problems from", list(worksheet_export.SOURCES),
+                          format_func=lambda key: worksheet_export.SOURCES[key].title, on_change=clear_files)
+    spec = worksheet_export.SOURCES[source]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        problem_types = st.multiselect("Problem types", spec.problem_types, default=spec.problem_types,
+                                       on_change=clear_files, key=f"worksheet_types_{source}")
+    with col2:
+        difficulties = st.multiselect("Difficulties", spec.difficulties, default=spec.difficulties,
+                                      on_change=clear_files, key=f"worksheet_difficulties_{source}")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        count = st.number_input("Number of problems", min_value=1, max_value=MAX_PROBLEMS, value=20,
+                                on_change=clear_files)
+    with col2:
+        fmt = st.selectbox("Format", list(worksheet_export.FORMATS), format_func=str.upper, on_change=clear_files)
+    with col3:
+        seed = st.number_input("Seed (optional)", min_value=0, value=None, step=1, on_change=clear_files,
+                               help="The same seed and options give the same worksheet")
+    st.caption(f"Up to {MAX_PROBLEMS} problems here. For more, use `python utils/worksheet_export.py`.")
+
+    if not problem_types or not difficulties:
+        st.warning("Pick at least one problem type and one difficulty.")
+        return
+
+    if st.button("Build worksheet", type="primary"):
+        build_worksheet(source, int(count), fmt, problem_types, difficulties, seed)
+
+    if st.session_state.worksheet_files:
+        mime = worksheet_export.FORMATS[fmt].mime
+        (worksheet_name, worksheet), (key_name, key) = st.session_state.worksheet_files
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Download worksheet", worksheet, file_name=worksheet_name, mime=mime)
+        with col2:
+            st.download_button("Download answer key", key, file_name=key_name, mime=mime)
+
+if __name__ == "__main__":
+    main()
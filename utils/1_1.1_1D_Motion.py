@@ -1,10 +1,12 @@
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.generators.linear_motion_generator import LinearMotionGenerator
+from utils import attempt_store
+from utils.performance_table import PerformanceTable
+
 
 def initialize_session_state():
     prefix = "linear_motion"
@@ -32,10 +34,13 @@ def initialize_session_state():
         
     # Initialize performance tracking dictionary if it doesn't exist
     if f"{prefix}_performance" not in st.session_state:
-        st.session_state[f"{prefix}_performance"] = clear_performance_dataframe()
+        # pick up this student's counts from before a reload or reconnect
+        st.session_state[f"{prefix}_performance"] = attempt_store.restore_performance(
+            prefix, clear_performance_dataframe())
 
 
 def generate_question(generator, problem_type, difficulty):
+    generator = generator.for_session(problem_type, difficulty)
     if problem_type == "No Time":
         question, answer, unit = generator.no_time_question(difficulty)
     elif problem_type == "No Distance":
@@ -53,60 +58,16 @@ def update_performance(problem_type, difficulty, is_correct):
     """Update the performance tracking dictionary when an answer is submitted"""
     prefix = "linear_motion"
     performance = st.session_state[f"{prefix}_performance"]
-    
-    # Increment attempts
-    performance[problem_type][difficulty]['attempts'] += 1
-    
-    # Increment correct if answer was correct
-    if is_correct:
-        performance[problem_type][difficulty]['correct'] += 1
-    
-    # Update session state
-    st.session_state[f"{prefix}_performance"] = performance
+    performance.record(problem_type, difficulty, is_correct)
+
+    # and keep it beyond this session (written to disk in the background)
+    attempt_store.record_attempt(prefix, problem_type, difficulty, is_correct)
 
 
-def create_performance_dataframe():
-    """Create a pandas DataFrame from the performance tracking dictionary"""
+def performance_table():
+    """Markdown for the performance table - only rebuilt after a new attempt"""
     prefix = "linear_motion"
-    performance = st.session_state[f"{prefix}_performance"]
-    
-    # Create lists to hold data
-    rows = []
-    
-    # Format data for dataframe
-    for problem_type, difficulties in performance.items():
-        for difficulty, stats in difficulties.items():
-            attempts = stats['attempts']
-            correct = stats['correct']
-            
-            # Calculate percentage or display NA if no attempts
-            if attempts > 0:
-                percentage = f"{(correct / attempts * 100):.1f}%"
-                display = f"{correct}/{attempts} ({percentage})"
-            else:
-                display = "0/0 (0.0%)"
-                
-            rows.append({
-                "Problem Type": problem_type,
-                "Difficulty": difficulty,
-                "Performance": display
-            })
-    
-    # Create DataFrame
-    df = pd.DataFrame(rows)
-    
-    # Pivot the dataframe to get desired format
-    pivot_df = df.pivot(index="Problem Type", columns="Difficulty", values="Performance")
-    
-    # Ensure all difficulty levels are present
-    for col in ["Easy", "Medium", "Hard"]:
-        if col not in pivot_df.columns:
-            pivot_df[col] = "0/0 (0.0%)"
-    
-    # Reorder columns
-    pivot_df = pivot_df[["Easy", "Medium", "Hard"]]
-    
-    return pivot_df
+    return st.session_state[f"{prefix}_performance"].to_markdown()
 
 def clear_performance_dataframe():
     """Reset the performance tracking dictionary"""
@@ -114,11 +75,7 @@ def clear_performance_dataframe():
     problem_types = ["Mixed", "No Time", "No Distance", "No Acceleration", "No Final Velocity"]
     difficulties = ["Easy", "Medium", "Hard"]
         
-    performance_dict = {}
-    for p_type in problem_types:
-        performance_dict[p_type] = {}
-        for diff in difficulties:
-            performance_dict[p_type][diff] = {'attempts': 0, 'correct': 0}
+    performance_dict = PerformanceTable(problem_types, difficulties)
             
     st.session_state[f"{prefix}_performance"] = performance_dict
 
@@ -130,7 +87,7 @@ def main():
     prefix = "linear_motion"
     initialize_session_state()
 
-    generator = LinearMotionGenerator()
+    generator = LinearMotionGenerator.shared()
 
     # UI Controls
     col1, col2 = st.columns(2)
@@ -223,13 +180,13 @@ def main():
         st.rerun()
     
     with st.expander("Your Performance", expanded=False):
-        performance_df = create_performance_dataframe()
-        st.dataframe(performance_df, use_container_width=True)
+        st.markdown(performance_table())
     
     # Add a reset performance button
     if st.button("Reset Performance Statistics"):
         initialize_session_state()
         st.session_state[f"{prefix}_performance"] = clear_performance_dataframe()
+        attempt_store.record_reset(prefix)
         question, answer, unit = generate_question(generator, problem_type, difficulty)
         st.session_state[f"{prefix}_question_id"] += 1
         st.session_state[f"{prefix}_current_question"] = question
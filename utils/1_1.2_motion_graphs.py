@@ -1,90 +1,27 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-import random
+import sys
+from pathlib import Path
 
-# Use a dark background for matplotlib so it fits a "dark mode" style
-plt.style.use("dark_background")
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import graph_render
+from utils.generators.base_generator import session_rng
 
 def generate_position_time_graph():
     """
-    Returns (fig, direction, motion_state, graph_label) for a randomly generated position-time graph
+    Returns the GraphSpec of a randomly generated position-time graph
     """
-    fig, ax = plt.subplots(figsize=(3, 2))  # Smaller figure size
-    t = np.linspace(0, 5, 100)
-
-    # Randomly pick one of four "types"
-    graph_type = random.choice(["linear_positive", "linear_negative", 
-                                "acceleration_positive", "acceleration_negative"])
-
-    if graph_type == "linear_positive":
-        position = 2 * t + 1    # slope > 0, constant velocity
-        correct_direction = "Forward"
-        correct_motion_state = "Constant Velocity"
-    elif graph_type == "linear_negative":
-        position = -1.5 * t + 5 # slope < 0, constant velocity
-        correct_direction = "Backward"
-        correct_motion_state = "Constant Velocity"
-    elif graph_type == "acceleration_positive":
-        position = t**2         # slope increasing over time
-        correct_direction = "Forward"
-        correct_motion_state = "Accelerating (positive)"
-    else:  # "acceleration_negative"
-        position = -0.5 * t**2 + 5
-        correct_direction = "Backward"
-        correct_motion_state = "Accelerating (negative)"
-
-    ax.plot(t, position, color="cyan")
-    ax.set_xlabel("Time (s)", color="white")
-    ax.set_ylabel("Position (m)", color="white")
-    ax.set_title("Position-Time Graph", color="white")
-    ax.tick_params(axis='x', colors='white')
-    ax.tick_params(axis='y', colors='white')
-
-    fig.tight_layout()
-
-    return (fig, correct_direction, correct_motion_state)
-
+    # Randomly pick one of four "types"; session state only keeps the small spec, not the image
+    return graph_render.random_graph("position", session_rng("graph_", "position"))
 
 def generate_velocity_time_graph():
     """
-    Returns (fig, direction, motion_state) for a randomly generated velocity-time graph
+    Returns the GraphSpec of a randomly generated velocity-time graph
     """
-    fig, ax = plt.subplots(figsize=(3, 2))  # Smaller figure size
-    t = np.linspace(0, 5, 100)
-
-    # Randomly pick one of four "types"
-    graph_type = random.choice(["constant_positive", "constant_negative", 
-                                "increasing_positive", "decreasing_negative"])
-
-    if graph_type == "constant_positive":
-        velocity = np.ones_like(t) * 2  # constant velocity > 0
-        correct_direction = "Forward"
-        correct_motion_state = "Constant Velocity"
-    elif graph_type == "constant_negative":
-        velocity = np.ones_like(t) * -1.5  # constant velocity < 0
-        correct_direction = "Backward"
-        correct_motion_state = "Constant Velocity"
-    elif graph_type == "increasing_positive":
-        velocity = t  # starts at 0, increasing
-        correct_direction = "Forward"
-        correct_motion_state = "Accelerating (positive)"
-    else:  # "decreasing_negative"
-        velocity = -0.5 * t - 1  # negative velocity, becomes more negative
-        correct_direction = "Backward"
-        correct_motion_state = "Accelerating (negative)"
-
-    ax.plot(t, velocity, color="orange")
-    ax.set_xlabel("Time (s)", color="white")
-    ax.set_ylabel("Velocity (m/s)", color="white")
-    ax.set_title("Velocity-Time Graph", color="white")
-    ax.tick_params(axis='x', colors='white')
-    ax.tick_params(axis='y', colors='white')
-
-    fig.tight_layout()
-
-    return (fig, correct_direction, correct_motion_state)
+    return graph_render.random_graph("velocity", session_rng("graph_", "velocity"))
 
+def show_graph(spec):
+    """Draw a graph from its spec - each one is only ever rendered once per process"""
+    st.image(graph_render.render(spec), width="stretch")
 
 def app():
     st.title("Position-Time and Velocity-Time Graph Recognition")
@@ -117,10 +54,10 @@ def app():
 
         # If we have a stored graph, display it
         if st.session_state.pt_graph is not None:
-            fig, correct_dir, correct_state = st.session_state.pt_graph
+            correct_dir, correct_state = graph_render.spec_answers(st.session_state.pt_graph)
             probCol1, probCol2 = st.columns(2)
             with probCol1:
-                st.pyplot(fig)
+                show_graph(st.session_state.pt_graph)
             with probCol2:
                 # Let user pick answers
                 user_dir = st.selectbox(
@@ -154,10 +91,10 @@ def app():
 
         # If we have a stored graph, display it
         if st.session_state.vt_graph is not None:
-            fig, correct_dir, correct_state = st.session_state.vt_graph
+            correct_dir, correct_state = graph_render.spec_answers(st.session_state.vt_graph)
             probCol1, probCol2 = st.columns(2)
             with probCol1:
-                st.pyplot(fig)
+                show_graph(st.session_state.vt_graph)
             with probCol2:
                 # Let user pick answers
                 user_dir = st.selectbox(
@@ -200,10 +137,10 @@ def app():
                 ]
 
             if st.session_state.match_pt_graph is not None:
-                fig_pt, dir_pt, state_pt = st.session_state.match_pt_graph
+                dir_pt, state_pt = graph_render.spec_answers(st.session_state.match_pt_graph)
                 col1,col2,col3,col4 = st.columns(4)
                 with col1:
-                    st.pyplot(fig_pt)
+                    show_graph(st.session_state.match_pt_graph)
                     st.write("Match this Position-Time Graph to the correct Velocity-Time Graph")
 
                 # Display option graphs in columns
@@ -211,9 +148,9 @@ def app():
                     option_columns = col2,col3,col4
                     labels = ["A", "B", "C"]
 
-                    for col, label, (fig_vt, dir_vt, state_vt) in zip(option_columns, labels, st.session_state.option_graphs):
+                    for col, label, option in zip(option_columns, labels, st.session_state.option_graphs):
                         with col:
-                            st.pyplot(fig_vt)
+                            show_graph(option)
                             st.write(f"Option {label}")
                             
 
@@ -225,7 +162,8 @@ def app():
 
                     if st.button("Check Match"):
                         chosen_index = labels.index(user_choice)
-                        _, dir_vt_selected, state_vt_selected = st.session_state.option_graphs[chosen_index]
+                        dir_vt_selected, state_vt_selected = graph_render.spec_answers(
+                            st.session_state.option_graphs[chosen_index])
 
                         # Basic matching logic: compare direction & motion state
                         # (You might want more sophisticated logic in practice)
@@ -245,19 +183,19 @@ def app():
                 ]
 
             if st.session_state.match_vt_graph is not None:
-                fig_vt, dir_vt, state_vt = st.session_state.match_vt_graph
+                dir_vt, state_vt = graph_render.spec_answers(st.session_state.match_vt_graph)
                 col1,col2,col3,col4 = st.columns(4)
                 with col1:
-                    st.pyplot(fig_vt)
+                    show_graph(st.session_state.match_vt_graph)
                     st.write("Match this Velocity-Time Graph to the correct Position-Time Graph below.")
 
                 if st.session_state.option_graphs:
                     option_columns = col2,col3,col4
                     labels = ["A", "B", "C"]
 
-                    for col, label, (fig_pt, dir_pt, state_pt) in zip(option_columns, labels, st.session_state.option_graphs):
+                    for col, label, option in zip(option_columns, labels, st.session_state.option_graphs):
                         with col:
-                            st.pyplot(fig_pt)
+                            show_graph(option)
                             st.write(f"Option {label}")
 
                     user_choice = st.selectbox(
@@ -267,7 +205,8 @@ def app():
 
                     if st.button("Check Match"):
                         chosen_index = labels.index(user_choice)
-                        _, dir_pt_selected, state_pt_selected = st.session_state.option_graphs[chosen_index]
+                        dir_pt_selected, state_pt_selected = graph_render.spec_answers(
+                            st.session_state.option_graphs[chosen_index])
 
                         if (dir_pt_selected == dir_vt) and (state_pt_selected == state_vt):
                             st.success("Correct match!")
@@ -34,7 +34,7 @@ def initialize_projectile_session_state():
 def generate_new_projectile_question(generator, problem_type, difficulty):
     st.session_state.current_question, st.session_state.correct_answer, \
     st.session_state.correct_answer2, st.session_state.unit, st.session_state.unit2 = \
-        generator.generate_question(problem_type, difficulty)
+        generator.for_session(problem_type, difficulty).generate_question(problem_type, difficulty)
     st.session_state.difficulty = difficulty
     st.session_state.problem_type = problem_type
     st.session_state.user_answer = None
@@ -48,7 +48,7 @@ def main():
     initialize_projectile_session_state()
     
     # Create generator instance
-    generator = ProjectileGenerator()
+    generator = ProjectileGenerator.shared()
     
     # UI Controls
     col1, col2 = st.columns(2)
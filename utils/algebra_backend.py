@@ -0,0 +1,25 @@
+"""Which symbolic engine the algebra trainer runs on.
+
+By default it's utils/expression_tree.py, a small expression tree that covers exactly
+what the trainer builds and prints the same as SymPy without the import cost. Set
+ALGEBRA_BACKEND=sympy to run everything on SymPy instead (e.g. to compare the two).
+
+    from utils.algebra_backend import sp
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.lazy_imports import lazy_import
+
+BACKENDS = ('tree', 'sympy')
+BACKEND = os.environ.get("ALGEBRA_BACKEND", "tree").lower()
+
+if BACKEND not in BACKENDS:
+    raise ImportError(f"ALGEBRA_BACKEND must be one of {', '.join(BACKENDS)}, not {BACKEND!r}")
+
+if BACKEND == 'sympy':
+    sp = lazy_import("sympy")
+else:
+    from utils import expression_tree as sp
@@ -0,0 +1,201 @@
+"""Pre-generated algebra problems, built offline and memory-mapped by the app.
+
+Build the bank once (e.g. when the container is set up):
+
+    python utils/algebra_bank.py --count 5000
+
+Each difficulty gets one file, data/algebra_bank/<difficulty>.bank:
+
+    8 bytes   magic b"ALGBANK1"
+    8 bytes   number of problems n (little-endian uint64)
+    8*(n+1)   offsets of each record, relative to the start of the records
+    ...       records, one compact JSON object each
+
+A record holds the srepr of the equation plus everything else generate_equation
+returns, so picking a problem is one offset lookup, one json.loads and one sp.sympify
+(none once that equation has been parsed before in this process).
+"""
+import argparse
+import json
+import mmap
+import random
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.generators.algebra_generator import AlgebraGenerator, DIFFICULTIES
+from utils.algebra_backend import sp
+
+BANK_DIR = Path(__file__).parent.parent / "data" / "algebra_bank"
+MAGIC = b"ALGBANK1"
+HEADER = struct.Struct("<8sQ")
+DEFAULT_COUNT = 5000
+
+
+def bank_path(difficulty, bank_dir=BANK_DIR):
+    return Path(bank_dir) / f"{difficulty}.bank"
+
+
+# ----------------------------------------------------------------------
+# Building
+# ----------------------------------------------------------------------
+
+def problem_record(problem):
+    """The parts of a generate_equation problem worth storing, as plain JSON types"""
+    return {
+        'equation': sp.srepr(problem['equation']),
+        'target_var': problem['target_var'],
+        'solve_var': problem['solve_var'],
+        'solution_steps': problem['solution_steps'],
+        'operations_applied': problem['operations_applied'],
+    }
+
+
+def build_records(difficulty, count, max_attempts=None, rng=None):
+    """Up to `count` distinct problems for one difficulty (fewer if the generator runs dry)"""
+    generator = AlgebraGenerator(rng=rng)
+    max_attempts = max_attempts or count * 20
+    seen = set()
+    records = []
+    for _ in range(max_attempts):
+        if len(records) >= count:
+            break
+        record = problem_record(generator.generate_equation(difficulty))
+        # same equation solved for the same variable is the same problem, whatever ops built it
+        key = (record['equation'], record['target_var'])
+        if key in seen:
+            continue
+        seen.add(key)
+        records.append(record)
+    return records
+
+
+def write_bank(path, records):
+    """Write records in the bank layout described at the top of this module"""
+    encoded = [json.dumps(record, separators=(',', ':')).encode('utf-8') for record in records]
+    offsets = array('Q', [0])
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(encoded)))
+        f.write(offsets.tobytes())
+        for blob in encoded:
+            f.write(blob)
+    # swap in whole so a running app never maps a half-written file
+    tmp_path.replace(path)
+
+
+def build_bank(difficulties=DIFFICULTIES, count=DEFAULT_COUNT, seed=None, bank_dir=BANK_DIR):
+    """Build and write the bank for each difficulty, returning {difficulty: problems written}"""
+    rng = random.Random(seed)
+    written = {}
+    for difficulty in difficulties:
+        records = build_records(difficulty, count, rng=rng)
+        write_bank(bank_path(difficulty, bank_dir), records)
+        written[difficulty] = len(records)
+    return written
+
+
+# ----------------------------------------------------------------------
+# Loading
+# ----------------------------------------------------------------------
+
+class ProblemBank:
+    """Read-only view of one .bank file, memory-mapped so it is shared between sessions"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an algebra problem bank")
+        self.count = count
+        offsets_end = HEADER.size + 8 * (count + 1)
+        if sys.byteorder == 'little':
+            self._offsets = memoryview(self._map)[HEADER.size:offsets_end].cast('Q')
+        else:
+            self._offsets = array('Q', self._map[HEADER.size:offsets_end])
+            self._offsets.byteswap()
+        self._records_start = offsets_end
+        # parsed equations by index - expressions are immutable, so sessions can share them
+        self._equations = {}
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        """The stored record at `index`, still holding the equation as an srepr string"""
+        start = self._records_start + self._offsets[index]
+        end = self._records_start + self._offsets[index + 1]
+        return json.loads(self._map[start:end])
+
+    def problem(self, index):
+        """The problem at `index`, shaped like AlgebraGenerator.generate_equation's result"""
+        record = self.record(index)
+        equation = self._equations.get(index)
+        if equation is None:
+            equation = self._equations[index] = sp.sympify(record['equation'])
+        record.update({
+            'equation': equation,
+            'steps_taken': [],
+            'current_state': equation,
+            'original_equation': equation,
+        })
+        return record
+
+    def sample(self, rng=random):
+        return self.problem(rng.randrange(self.count))
+
+
+# one mapped bank per difficulty per process; None when the file hasn't been built
+_banks = {}
+_banks_lock = threading.Lock()
+
+
+def load_bank(difficulty):
+    with _banks_lock:
+        if difficulty not in _banks:
+            path = bank_path(difficulty)
+            bank = ProblemBank(path) if path.exists() else None
+            # an empty bank is no use either, so fall back to generating
+            _banks[difficulty] = bank if bank else None
+        return _banks[difficulty]
+
+
+def sample_problem(difficulty, rng=random):
+    """A random banked problem, or None if there's no bank for this difficulty"""
+    bank = load_bank(difficulty)
+    if bank is None:
+        return None
+    return bank.sample(rng)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the pre-generated algebra problem bank")
+    parser.add_argument('difficulties', nargs='*', metavar='difficulty',
+                        help=f"any of {', '.join(DIFFICULTIES)} (default: all)")
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT,
+                        help="distinct problems per difficulty (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=None, help="seed for a reproducible bank")
+    parser.add_argument('--out', type=Path, default=BANK_DIR, help="output directory")
+    args = parser.parse_args(argv)
+    unknown = set(args.difficulties) - set(DIFFICULTIES)
+    if unknown:
+        parser.error(f"unknown difficulty: {', '.join(sorted(unknown))}")
+
+    written = build_bank(args.difficulties or DIFFICULTIES, args.count, args.seed, args.out)
+    for difficulty, count in written.items():
+        print(f"{difficulty}: {count} problems -> {bank_path(difficulty, args.out)}")
+
+
+if __name__ == '__main__':
+    main()
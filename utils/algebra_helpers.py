@@ -0,0 +1,174 @@
+"""Symbolic helpers for the algebra page, on whichever engine utils.algebra_backend picked.
+
+Page scripts are re-executed on every Streamlit rerun, so anything cached
+here lives for the whole process instead of a single rerun.
+"""
+import re
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.algebra_backend import sp
+
+LATEX_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=LATEX_CACHE_SIZE)
+def latex_equation(equation):
+    """Convert a sympy equation to a LaTeX string with some custom formatting.
+    Cached on the equation itself: expressions hash and compare structurally."""
+    # Convert to standard LaTeX
+    latex_str = sp.latex(equation)
+
+    # Add custom formatting for better display
+    # Replace decimal powers with roots when possible
+    latex_str = re.sub(r'\^\{0\.5\}', r'^{\\frac{1}{2}}', latex_str)
+    latex_str = r"\LARGE{" + latex_str + r"}"
+
+    return latex_str
+
+
+def latex_cache_info():
+    """hits, misses, maxsize and currsize of the LaTeX cache"""
+    return latex_equation.cache_info()
+
+
+# --------------------------------------------
+# Step simplification
+# --------------------------------------------
+# Expressions are immutable and hash structurally, so results are memoized per
+# subtree: after a step only the nodes the operation created get walked again.
+
+SIMPLIFY_CACHE_SIZE = 4096
+
+# side -> simplified side, filled by simplify_side and by the shortcuts in apply_and_simplify.
+# Every Streamlit session runs on its own thread, so reads and writes go through _simplified_lock.
+_simplified_sides = {}
+_simplified_lock = threading.Lock()
+
+
+def _lookup(key):
+    with _simplified_lock:
+        return _simplified_sides.get(key)
+
+
+def _remember(key, value):
+    with _simplified_lock:
+        if key not in _simplified_sides and len(_simplified_sides) >= SIMPLIFY_CACHE_SIZE:
+            # dicts keep insertion order, drop the oldest entry
+            _simplified_sides.pop(next(iter(_simplified_sides)), None)
+        _simplified_sides[key] = value
+
+
+@lru_cache(maxsize=SIMPLIFY_CACHE_SIZE)
+def count_operations(expr):
+    """Count the number of operations in an expression - used for complexity"""
+    if isinstance(expr, sp.Eq):
+        return count_operations(expr.lhs) + count_operations(expr.rhs)
+
+    if expr.is_Add or expr.is_Mul:
+        return sum(count_operations(arg) for arg in expr.args) + len(expr.args) - 1
+
+    if expr.is_Pow:
+        return count_operations(expr.base) + count_operations(expr.exp) + 1
+
+    return 0  # Atomic expression (symbol or number)
+
+
+@lru_cache(maxsize=SIMPLIFY_CACHE_SIZE)
+def simplify_powers(expr):
+    # Look for sqrt(x**2) -> x pattern
+    if isinstance(expr, sp.Pow) and expr.exp == sp.Rational(1, 2):  # sqrt
+        if isinstance(expr.base, sp.Pow) and expr.base.exp == 2:
+            return expr.base.base  # sqrt(x**2) -> x
+
+    # Recurse through the expression tree
+    if expr.args:
+        return expr.func(*[simplify_powers(arg) for arg in expr.args])
+    return expr
+
+
+def simplify_side(expr):
+    """expand, powsimp, then our power simplifications, for one side of an equation"""
+    simplified = _lookup(expr)
+    if simplified is None:
+        simplified = simplify_powers(sp.powsimp(sp.expand(expr)))
+        _remember(expr, simplified)
+        _remember(simplified, simplified)
+    return simplified
+
+
+def minimal_simplify(equation):
+    """Only perform basic simplification without solving"""
+    try:
+        expanded = sp.Eq(simplify_side(equation.lhs), simplify_side(equation.rhs))
+
+        # Only update if it actually simplifies without solving
+        if count_operations(expanded) < count_operations(equation):
+            return expanded
+    except Exception:
+        pass
+    return equation
+
+
+def apply_operation(equation, operation, value=None):
+    """Apply an algebraic operation to both sides of the equation"""
+    lhs, rhs = equation.args
+
+    if operation == "add":
+        if value is None:
+            return equation
+        return sp.Eq(lhs + value, rhs + value)
+
+    elif operation == "subtract":
+        if value is None:
+            return equation
+        return sp.Eq(lhs - value, rhs - value)
+
+    elif operation == "multiply":
+        if value is None or value == 0:
+            return equation
+        return sp.Eq(lhs * value, rhs * value)
+
+    elif operation == "divide":
+        if value is None or value == 0:
+            return equation
+        return sp.Eq(lhs / value, rhs / value)
+
+    elif operation == "square":
+        return sp.Eq(lhs ** 2, rhs ** 2)
+
+    elif operation == "sqrt":
+        try:
+            return sp.Eq(sp.sqrt(lhs), sp.sqrt(rhs))
+        except Exception:
+            return equation
+
+    # If operation not recognized, return the original equation
+    return equation
+
+
+def _is_simplified(expr):
+    return _lookup(expr) == expr
+
+
+def apply_and_simplify(equation, operation, value=None):
+    """apply_operation followed by minimal_simplify, returns (applied, simplified).
+
+    Adding or subtracting a number on a side that is already simplified leaves its
+    existing terms untouched (the Add is flattened), so the new side is simplified
+    as built and only gets recorded; every other step goes through minimal_simplify,
+    which re-walks only subtrees it has not seen before."""
+    new_eq = apply_operation(equation, operation, value)
+    if new_eq == equation or not isinstance(new_eq, sp.Eq):
+        return new_eq, new_eq
+
+    if (operation in ("add", "subtract")
+            and _is_simplified(equation.lhs) and _is_simplified(equation.rhs)):
+        _remember(new_eq.lhs, new_eq.lhs)
+        _remember(new_eq.rhs, new_eq.rhs)
+        return new_eq, new_eq
+
+    return new_eq, minimal_simplify(new_eq)
@@ -0,0 +1,258 @@
+"""Every submitted answer, kept in a local SQLite database.
+
+Pages still keep their `<prefix>_performance` table in session state for what's on
+screen, but each answer is also recorded here, so a student's counts come back after a
+reconnect and attempts can be added up across students.
+
+Recording never touches the disk: record_attempt() appends to an in-memory buffer, and
+one writer thread per process drains it every FLUSH_INTERVAL seconds (sooner once
+BATCH_SIZE rows are waiting), writing each batch in a single transaction. Reads go
+through a connection per thread, and the database runs in WAL mode, so readers
+never wait on that writer or on each other.
+
+"Reset performance" doesn't delete anything, it stores when the student reset that
+page and only later attempts count towards their table.
+"""
+import atexit
+import collections
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import streamlit as st
+
+DB_PATH = Path(__file__).parent.parent / "data" / "attempts.sqlite3"
+FLUSH_INTERVAL = 0.5  # seconds between flushes of the write buffer
+BATCH_SIZE = 500      # flush early once this many rows are waiting
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    page TEXT NOT NULL,
+    problem_type TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_student ON attempts (student, page, created_at);
+CREATE INDEX IF NOT EXISTS attempts_by_page ON attempts (page, problem_type, difficulty);
+CREATE TABLE IF NOT EXISTS resets (
+    student TEXT NOT NULL,
+    page TEXT NOT NULL,
+    reset_at REAL NOT NULL,
+    PRIMARY KEY (student, page)
+);
+"""
+
+
+class AttemptStore:
+    """Write-behind store for one database file; use get_store() for the shared one"""
+
+    def __init__(self, path=DB_PATH, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # the writer's connection, only ever used on the writer thread after setup
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+
+        # deque.append is atomic, so recording needs no lock at all
+        self._buffer = collections.deque()
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._readers = threading.local()
+
+        self._thread = threading.Thread(target=self._run, name="attempt_store_writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- writing ---
+
+    def _enqueue(self, kind, row):
+        if self._closed:
+            raise RuntimeError("attempt store is closed")
+        with self._idle:
+            self._pending += 1
+        self._buffer.append((kind, row))
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+
+    def record_attempt(self, student, page, problem_type, difficulty, is_correct):
+        """Queue one answered question; returns straight away"""
+        self._enqueue('attempt', (student, page, problem_type, difficulty,
+                                  int(bool(is_correct)), time.time()))
+
+    def record_reset(self, student, page):
+        """Queue a reset of this student's table on `page`; returns straight away"""
+        self._enqueue('reset', (student, page, time.time()))
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_buffered()
+            if self._closed and not self._buffer:
+                return
+
+    def _insert(self, batch):
+        attempts = [row for kind, row in batch if kind == 'attempt']
+        resets = [row for kind, row in batch if kind == 'reset']
+        # attempts and resets carry their own timestamps, so their order doesn't matter
+        with self._writer:
+            self._writer.executemany(
+                "INSERT INTO attempts (student, page, problem_type, difficulty, correct, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)", attempts)
+            self._writer.executemany(
+                "INSERT OR REPLACE INTO resets (student, page, reset_at) VALUES (?, ?, ?)", resets)
+
+    def _write_buffered(self):
+        while self._buffer:
+            batch = []
+            while self._buffer and len(batch) < self.batch_size:
+                batch.append(self._buffer.popleft())
+            try:
+                self._insert(batch)
+            except sqlite3.OperationalError:
+                # locked database, full disk and the like: worth trying again
+                logger.exception("couldn't write %d attempts, will retry", len(batch))
+                self._buffer.extendleft(reversed(batch))
+                if self._closed:
+                    return
+                time.sleep(self.flush_interval)
+                continue
+            except sqlite3.Error:
+                # a row that will never go in (e.g. a NULL column); write the rest one at a
+                # time and drop the ones that fail, so they don't hold up everything after them
+                for entry in batch:
+                    try:
+                        self._insert([entry])
+                    except sqlite3.Error:
+                        logger.exception("dropping %s that couldn't be written: %r", *entry)
+            with self._idle:
+                self._pending -= len(batch)
+                if not self._pending:
+                    self._idle.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until everything recorded so far is on disk; True if it got there in time"""
+        self._wake.set()
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def close(self, timeout=5):
+        """Write out whatever is still buffered and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    # --- reading ---
+
+    def _reader(self):
+        conn = getattr(self._readers, 'conn', None)
+        if conn is None:
+            conn = self._readers.conn = self._connect()
+        return conn
+
+    def student_performance(self, student, page):
+        """{(problem_type, difficulty): (attempts, correct)} since this student's last reset"""
+        rows = self._reader().execute(
+            "SELECT problem_type, difficulty, COUNT(*), SUM(correct) FROM attempts"
+            " WHERE student = ? AND page = ? AND created_at > COALESCE("
+            "   (SELECT reset_at FROM resets WHERE student = ? AND page = ?), 0)"
+            " GROUP BY problem_type, difficulty",
+            (student, page, student, page))
+        return {(problem_type, difficulty): (attempts, correct)
+                for problem_type, difficulty, attempts, correct in rows}
+
+    def page_performance(self, page):
+        """{(problem_type, difficulty): (attempts, correct, students)} over every student"""
+        rows = self._reader().execute(
+            "SELECT problem_type, difficulty, COUNT(*), SUM(correct), COUNT(DISTINCT student)"
+            " FROM attempts WHERE page = ? GROUP BY problem_type, difficulty", (page,))
+        return {(problem_type, difficulty): (attempts, correct, students)
+                for problem_type, difficulty, attempts, correct, students in rows}
+
+
+# one store per process, shared by every session
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AttemptStore()
+            atexit.register(_store.close)
+        return _store
+
+
+# what uuid4().hex[:12] gives; anything else in ?student= is ignored
+STUDENT_ID = re.compile(r"[0-9a-f]{12}")
+
+
+def current_student():
+    """A stable id for whoever is using this session.
+
+    It's kept in the page URL (?student=...), so reloading or reconnecting with the same
+    link picks the same history back up. That link is the only thing identifying a student:
+    anyone who opens a copy of it (e.g. one shared with the class) reads and adds to the same
+    history, and resets it. An id that isn't in the format we hand out is replaced by a new one."""
+    student = st.query_params.get("student") or st.session_state.get("student_id")
+    if not student or not STUDENT_ID.fullmatch(student):
+        student = uuid.uuid4().hex[:12]
+    if st.query_params.get("student") != student:
+        st.query_params["student"] = student
+    st.session_state["student_id"] = student
+    return student
+
+
+def record_attempt(page, problem_type, difficulty, is_correct):
+    """Record an answer from this session's student on `page` (a page's state prefix)"""
+    get_store().record_attempt(current_student(), page, problem_type, difficulty, is_correct)
+
+
+def record_reset(page):
+    get_store().record_reset(current_student(), page)
+
+
+def restore_performance(page, performance):
+    """Fill a fresh PerformanceTable in place with this student's stored counts.
+
+    Meant for when a session first sets up its table; answers from the last flush
+    interval may not be on disk yet and aren't included."""
+    stored = get_store().student_performance(current_student(), page)
+    for (problem_type, difficulty), (attempts, correct) in stored.items():
+        performance.set_counts(problem_type, difficulty, attempts, correct)
+    return performance
+
+
+if __name__ == '__main__':
+    # quick look at what's been recorded: python utils/attempt_store.py [page]
+    store = get_store()
+    pages = sys.argv[1:] or [row[0] for row in store._reader().execute(
+        "SELECT DISTINCT page FROM attempts ORDER BY page")]
+    for page in pages:
+        print(page)
+        for (problem_type, difficulty), (attempts, correct, students) in sorted(
+                store.page_performance(page).items()):
+            print(f"  {problem_type:35} {difficulty:8} {correct}/{attempts} from {students} students")
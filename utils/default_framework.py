@@ -1,9 +1,11 @@
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.generators._generator import Generator
+from utils import attempt_store
+from utils.performance_table import PerformanceTable
+
 
 """Replaceables: default_class, default_prefix, default_tab, Default Title, generator (not search and replaceable)"""
 """Fillables: problem_type_dict, difficulties"""
@@ -25,11 +27,7 @@ class default_class:
         prefix = "default_prefix"
         _, problem_types, difficulties = default_class.question_parameters()
             
-        performance_dict = {}
-        for p_type in problem_types:
-            performance_dict[p_type] = {}
-            for diff in difficulties:
-                performance_dict[p_type][diff] = {'attempts': 0, 'correct': 0}     
+        performance_dict = PerformanceTable(problem_types, difficulties)
         st.session_state[f"{prefix}_performance"] = performance_dict
         return performance_dict
 
@@ -58,7 +56,9 @@ class default_class:
     
         # Initialize performance tracking dictionary if it doesn't exist
         if f"{prefix}_performance" not in st.session_state:
-            st.session_state[f"{prefix}_performance"] = default_class.clear_performance_dataframe()
+            # pick up this student's counts from before a reload or reconnect
+            st.session_state[f"{prefix}_performance"] = attempt_store.restore_performance(
+                prefix, default_class.clear_performance_dataframe())
     
     @staticmethod
     def generate_question(generator, problem_type, difficulty):
@@ -71,78 +71,55 @@ class default_class:
         return question, answer, unit
 
     @staticmethod
-    def create_performance_dataframe():
-        """Create a pandas DataFrame from the performance tracking dictionary"""
+    def performance_table():
+        """Markdown for the performance table - only rebuilt after a new attempt"""
         prefix = "default_prefix"
-        performance = st.session_state[f"{prefix}_performance"]
-        
-        # Create lists to hold data
-        rows = []
-        
-        # Format data for dataframe
-        for problem_type, difficulties in performance.items():
-            for difficulty, stats in difficulties.items():
-                attempts = stats['attempts']
-                correct = stats['correct']
-                
-                # Calculate percentage or display NA if no attempts
-                if attempts > 0:
-                    percentage = f"{(correct / attempts * 100):.1f}%"
-                    display = f"{correct}/{attempts} ({percentage})"
-                else:
-                    display = "0/0 (0.0%)"
-                    
-                rows.append({
-                    "Problem Type": problem_type,
-                    "Difficulty": difficulty,
-                    "Performance": display
-                })
-        
-        # Create DataFrame
-        df = pd.DataFrame(rows)
-        
-        # Pivot the dataframe to get desired format
-        pivot_df = df.pivot(index="Problem Type", columns="Difficulty", values="Performance")
-        
-        # Ensure all difficulty levels are present
-        for col in ["Easy", "Medium", "Hard"]:
-            if col not in pivot_df.columns:
-                pivot_df[col] = "0/0 (0.0%)"
-        
-        # Reorder columns
-        pivot_df = pivot_df[["Easy", "Medium", "Hard"]]
-        
-        return pivot_df
+        return st.session_state[f"{prefix}_performance"].to_markdown()
 
     @staticmethod
     def update_performance(problem_type, difficulty, is_correct):
         """Update the performance tracking dictionary when an answer is submitted"""
         prefix = "default_prefix"
         performance = st.session_state[f"{prefix}_performance"]
-        
-        # Increment attempts
-        performance[problem_type][difficulty]['attempts'] += 1
-        
-        # Increment correct if answer was correct
-        if is_correct:
-            performance[problem_type][difficulty]['correct'] += 1
-        
-        # Update session state
-        st.session_state[f"{prefix}_performance"] = performance
+        performance.record(problem_type, difficulty, is_correct)
+
+        # and keep it beyond this session (written to disk in the background)
+        attempt_store.record_attempt(prefix, problem_type, difficulty, is_correct)
+
+    @staticmethod
+    def new_question(generator, problem_type, difficulty):
+        """Swap in a fresh question. Used as a button callback, so it runs before the tab redraws"""
+        prefix = "default_prefix"
+        question, answer, unit = default_class.generate_question(generator, problem_type, difficulty)
+        st.session_state[f"{prefix}_question_id"] += 1
+        st.session_state[f"{prefix}_current_question"] = question
+        st.session_state[f"{prefix}_correct_answer"] = answer
+        st.session_state[f"{prefix}_unit"] = unit
+        st.session_state[f"{prefix}_submitted"] = False
+        generator.clear_answers()
+
+    @staticmethod
+    def reset_performance(generator, problem_type, difficulty):
+        """Clear the performance table and move on to a fresh question (button callback)"""
+        prefix = "default_prefix"
+        default_class.initialize_session_state()
+        st.session_state[f"{prefix}_performance"] = default_class.clear_performance_dataframe()
+        attempt_store.record_reset(prefix)
+        default_class.new_question(generator, problem_type, difficulty)
 
     @staticmethod
+    @st.fragment
     def default_tab():
         st.title("Default Title")
         prefix = "default_prefix"
         default_class.initialize_session_state()
 
-        generator = _Generator()
+        generator = _Generator.shared()
 
         problem_type_dict, problem_types, difficulties = default_class.question_parameters()
 
         with st.expander("Your Performance", expanded=False):
-            performance_df = default_class.create_performance_dataframe()
-            st.dataframe(performance_df, use_container_width=True)
+            st.markdown(default_class.performance_table())
 
         # UI Controls
         col1, col2 = st.columns(2)
@@ -213,26 +190,10 @@ class default_class:
             st.write("")
            
         with in_col3:
-            if st.button("New Question",key=f"{prefix}_new_question"):
-                question, answer, unit = default_class.generate_question(generator, problem_type, difficulty)
-                st.session_state[f"{prefix}_question_id"] += 1
-                st.session_state[f"{prefix}_current_question"] = question
-                st.session_state[f"{prefix}_correct_answer"] = answer
-                st.session_state[f"{prefix}_unit"] = unit
-                st.session_state[f"{prefix}_submitted"] = False
-                generator.clear_answers()
-                st.rerun()
+            st.button("New Question", key=f"{prefix}_new_question",
+                      on_click=default_class.new_question, args=(generator, problem_type, difficulty))
 
         # Add a reset performance button further down
         st.write("")
-        if st.button("Reset Performance Statistics",key=f"{prefix}_performance_reset"):
-            default_class.initialize_session_state()
-            st.session_state[f"{prefix}_performance"] = default_class.clear_performance_dataframe()
-            question, answer, unit = default_class.generate_question(generator, problem_type, difficulty)
-            st.session_state[f"{prefix}_question_id"] += 1
-            st.session_state[f"{prefix}_current_question"] = question
-            st.session_state[f"{prefix}_correct_answer"] = answer
-            st.session_state[f"{prefix}_unit"] = unit
-            st.session_state[f"{prefix}_submitted"] = False
-            generator.clear_answers()
-            st.rerun()
+        st.button("Reset Performance Statistics", key=f"{prefix}_performance_reset",
+                  on_click=default_class.reset_performance, args=(generator, problem_type, difficulty))
@@ -0,0 +1,84 @@
+"""Hidden page (/diagnostics) with the rerun timings from utils/rerun_timings.py and the process caches"""
+import streamlit as st
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import algebra_helpers, rerun_timings
+
+
+def bucket_label(index):
+    bounds = rerun_timings.BUCKETS_MS
+    if index == len(bounds) - 1:
+        return f"> {bounds[-2]:g} ms"
+    return f"<= {bounds[index]:g} ms"
+
+
+def page_table(histograms, page):
+    """Markdown table of one page's phases"""
+    lines = ["| Phase | Runs | Mean | p50 | p90 | p99 | Max |", "|---" * 7 + "|"]
+    for (row_page, phase), h in sorted(histograms.items()):
+        if row_page != page:
+            continue
+        cells = [f"{value:.2f} ms" for value in
+                 (h.mean_ms, h.quantile(0.5), h.quantile(0.9), h.quantile(0.99), h.max_ms)]
+        lines.append(f"| {phase} | {h.count} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def cache_section():
+    st.subheader("Algebra LaTeX cache")
+    info = algebra_helpers.latex_cache_info()
+    lookups = info.hits + info.misses
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Hit rate", f"{info.hits / lookups:.0%}" if lookups else "-")
+    col2.metric("Hits / misses", f"{info.hits} / {info.misses}")
+    col3.metric("Entries", f"{info.currsize} / {info.maxsize}")
+
+
+def timings_section():
+    st.title("Rerun Timings")
+
+    if not rerun_timings.ENABLED:
+        st.info("Timings are off. Start the app with `RERUN_TIMINGS=1` to collect them"
+                " (and `RERUN_TIMINGS_FILE=path` to also write them out when it stops).")
+        return
+
+    histograms = rerun_timings.snapshot()
+    if not histograms:
+        st.write("Nothing timed yet, use some of the practice pages first.")
+        return
+
+    st.caption("Every session on this server since it started (or since the last reset). "
+               "Percentiles are bucket upper bounds.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Download as TSV", rerun_timings.to_tsv(histograms),
+                           file_name="rerun_timings.tsv", mime="text/tab-separated-values")
+    with col2:
+        if st.button("Reset timings"):
+            rerun_timings.reset()
+            st.rerun()
+
+    pages = sorted({page for page, _ in histograms})
+    for page in pages:
+        st.subheader(page)
+        st.markdown(page_table(histograms, page))
+
+    st.subheader("Histogram")
+    key = st.selectbox("Page and phase", sorted(histograms), format_func=lambda key: f"{key[0]} - {key[1]}")
+    h = histograms[key]
+    # only up to the slowest bucket that has anything in it
+    last = max(i for i, n in enumerate(h.buckets) if n)
+    st.bar_chart({"duration": [bucket_label(i) for i in range(last + 1)], "runs": h.buckets[:last + 1]},
+                 x="duration", y="runs", sort=False)
+
+
+def main():
+    timings_section()
+    st.divider()
+    cache_section()
+
+
+main()
@@ -0,0 +1,1115 @@
+"""Small expression trees for the algebra trainer, standing in for SymPy.
+
+The trainer only ever builds rational numbers, single-letter symbols, sums, products
+and powers with rational exponents (squares, square roots and the reciprocals that
+division makes), tied together by Eq. Nodes here are canonicalized on construction
+the way SymPy's automatic evaluation treats that grammar: like terms collected,
+a numeric coefficient distributed over a sum, surds reduced and rationalized. They
+print the same str and LaTeX SymPy would, so this module can be used in place of
+`sympy` by algebra_helpers, the algebra generator and the page (see algebra_backend.py).
+
+Only the slice of the SymPy API those callers touch is provided: Symbol/symbols,
+Integer/Rational, Add/Mul/Pow/Eq, sqrt, expand, powsimp, latex, srepr and sympify,
+plus the node attributes they read (args, func, lhs/rhs, base/exp, free_symbols,
+is_Add/is_Mul/is_Pow/is_number, as_ordered_factors).
+"""
+import ast
+import math
+import re
+from fractions import Fraction
+
+__all__ = [
+    'Expr', 'Number', 'Symbol', 'Add', 'Mul', 'Pow', 'Eq', 'Equality',
+    'Integer', 'Rational', 'symbols', 'sqrt', 'expand', 'powsimp',
+    'latex', 'srepr', 'sympify',
+]
+
+# SymPy's class keys, used for its canonical sort order
+_NUMBER_CLASS = (1, 0, 'Number')
+_SYMBOL_CLASS = (2, 0, 'Symbol')
+_MUL_CLASS = (3, 0, 'Mul')
+_ADD_CLASS = (3, 1, 'Add')
+_POW_CLASS = (3, 2, 'Pow')
+
+# SymPy's printing precedences
+_PREC_ADD = 40
+_PREC_MUL = 50
+_PREC_POW = 60
+_PREC_ATOM = 1000
+
+
+def _sympify(value):
+    if isinstance(value, Expr):
+        return value
+    if isinstance(value, (int, Fraction)) and not isinstance(value, bool):
+        return Number(value)
+    raise TypeError(f"can't use {value!r} in an expression")
+
+
+def _exponent(value):
+    if isinstance(value, Number):
+        return value.value
+    if isinstance(value, (int, Fraction)) and not isinstance(value, bool):
+        return Fraction(value)
+    raise TypeError(f"only rational exponents are supported, got {value!r}")
+
+
+class Expr:
+    """Base class for every node; immutable and hashed structurally like SymPy's Basic"""
+    __slots__ = ('args', '_hash', '_key')
+
+    is_Add = is_Mul = is_Pow = is_Symbol = is_Number = is_Rational = is_Integer = False
+    is_Atom = False
+
+    @classmethod
+    def _new(cls, args):
+        obj = object.__new__(cls)
+        obj.args = args
+        obj._hash = None
+        obj._key = None
+        return obj
+
+    @property
+    def func(self):
+        return type(self)
+
+    def __reduce__(self):
+        return (type(self), self.args)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((type(self).__name__, self.args))
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return False
+        return hash(self) == hash(other) and self.args == other.args
+
+    def __ne__(self, other):
+        return not self == other
+
+    # --- arithmetic, building canonical nodes like SymPy's operators do ---
+
+    def __add__(self, other):
+        try:
+            return _add([self, _sympify(other)])
+        except TypeError:
+            return NotImplemented
+
+    def __radd__(self, other):
+        try:
+            return _add([_sympify(other), self])
+        except TypeError:
+            return NotImplemented
+
+    def __sub__(self, other):
+        try:
+            return _add([self, _mul([MINUS_ONE, _sympify(other)])])
+        except TypeError:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        try:
+            return _add([_sympify(other), _mul([MINUS_ONE, self])])
+        except TypeError:
+            return NotImplemented
+
+    def __mul__(self, other):
+        try:
+            return _mul([self, _sympify(other)])
+        except TypeError:
+            return NotImplemented
+
+    def __rmul__(self, other):
+        try:
+            return _mul([_sympify(other), self])
+        except TypeError:
+            return NotImplemented
+
+    def __truediv__(self, other):
+        try:
+            return _mul([self, _pow(_sympify(other), Fraction(-1))])
+        except TypeError:
+            return NotImplemented
+
+    def __rtruediv__(self, other):
+        try:
+            return _mul([_sympify(other), _pow(self, Fraction(-1))])
+        except TypeError:
+            return NotImplemented
+
+    def __pow__(self, exponent):
+        try:
+            return _pow(self, _exponent(exponent))
+        except TypeError:
+            return NotImplemented
+
+    def __neg__(self):
+        return _mul([MINUS_ONE, self])
+
+    def __pos__(self):
+        return self
+
+    # --- the bits of SymPy's Expr interface the trainer reads ---
+
+    @property
+    def free_symbols(self):
+        symbols = set()
+        for arg in self.args:
+            symbols |= arg.free_symbols
+        return symbols
+
+    @property
+    def is_number(self):
+        return all(arg.is_number for arg in self.args)
+
+    def as_coeff_Mul(self):
+        """(rational coefficient, rest) - the coefficient is 1 unless this is a Mul that has one"""
+        return Fraction(1), self
+
+    def as_ordered_factors(self):
+        return [self]
+
+    def could_extract_minus_sign(self):
+        return False
+
+    def sort_key(self):
+        if self._key is None:
+            self._key = _sort_key(self)
+        return self._key
+
+    def __float__(self):
+        raise TypeError(f"{self} is not a number")
+
+    def __str__(self):
+        return _str(self)
+
+    __repr__ = __str__
+
+
+class Number(Expr):
+    """A rational number"""
+    __slots__ = ('value',)
+
+    is_Number = is_Rational = is_Atom = True
+
+    def __new__(cls, value, denominator=None):
+        obj = object.__new__(cls)
+        obj.value = Fraction(value) if denominator is None else Fraction(value, denominator)
+        obj.args = ()
+        obj._hash = None
+        obj._key = None
+        return obj
+
+    def __reduce__(self):
+        return (Number, (self.value,))
+
+    @property
+    def is_Integer(self):
+        return self.value.denominator == 1
+
+    @property
+    def p(self):
+        return self.value.numerator
+
+    @property
+    def q(self):
+        return self.value.denominator
+
+    @property
+    def free_symbols(self):
+        return set()
+
+    @property
+    def is_number(self):
+        return True
+
+    def __hash__(self):
+        # same hash as the plain int/Fraction, since they compare equal
+        return hash(self.value)
+
+    def __eq__(self, other):
+        if isinstance(other, Number):
+            return self.value == other.value
+        if isinstance(other, (int, Fraction)) and not isinstance(other, bool):
+            return self.value == other
+        return False
+
+    def __lt__(self, other):
+        return self.value < _exponent(other)
+
+    def __gt__(self, other):
+        return self.value > _exponent(other)
+
+    def __float__(self):
+        return float(self.value)
+
+    def __int__(self):
+        return int(self.value)
+
+    def as_coeff_Mul(self):
+        return self.value, ONE
+
+    def could_extract_minus_sign(self):
+        return self.value < 0
+
+
+class Symbol(Expr):
+    __slots__ = ('name',)
+
+    is_Symbol = is_Atom = True
+
+    def __new__(cls, name):
+        obj = object.__new__(cls)
+        obj.name = name
+        obj.args = ()
+        obj._hash = None
+        obj._key = None
+        return obj
+
+    def __reduce__(self):
+        return (Symbol, (self.name,))
+
+    def __hash__(self):
+        return hash(('Symbol', self.name))
+
+    def __eq__(self, other):
+        return isinstance(other, Symbol) and other.name == self.name
+
+    @property
+    def free_symbols(self):
+        return {self}
+
+    @property
+    def is_number(self):
+        return False
+
+
+class Add(Expr):
+    __slots__ = ()
+    is_Add = True
+
+    def __new__(cls, *args):
+        return _add([_sympify(arg) for arg in args])
+
+    def as_ordered_terms(self):
+        return _ordered_terms(self)
+
+
+class Mul(Expr):
+    __slots__ = ()
+    is_Mul = True
+
+    def __new__(cls, *args):
+        return _mul([_sympify(arg) for arg in args])
+
+    def as_coeff_Mul(self):
+        first = self.args[0]
+        if first.is_Number:
+            rest = self.args[1:]
+            return first.value, rest[0] if len(rest) == 1 else Mul._new(rest)
+        return Fraction(1), self
+
+    def as_ordered_factors(self):
+        # args are kept in SymPy's sort order already
+        return list(self.args)
+
+    def could_extract_minus_sign(self):
+        return self.args[0].is_Number and self.args[0].value < 0
+
+
+class Pow(Expr):
+    __slots__ = ()
+    is_Pow = True
+
+    def __new__(cls, base, exp):
+        return _pow(_sympify(base), _exponent(exp))
+
+    @property
+    def base(self):
+        return self.args[0]
+
+    @property
+    def exp(self):
+        return self.args[1]
+
+    def __float__(self):
+        return float(self.args[0]) ** float(self.args[1])
+
+
+class Eq:
+    """An equation lhs = rhs; unlike SymPy it never evaluates to True/False"""
+    __slots__ = ('args', '_hash')
+
+    def __init__(self, lhs, rhs):
+        self.args = (_sympify(lhs), _sympify(rhs))
+        self._hash = None
+
+    def __reduce__(self):
+        return (Eq, self.args)
+
+    @property
+    def func(self):
+        return Eq
+
+    @property
+    def lhs(self):
+        return self.args[0]
+
+    @property
+    def rhs(self):
+        return self.args[1]
+
+    @property
+    def free_symbols(self):
+        return self.args[0].free_symbols | self.args[1].free_symbols
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(('Eq', self.args))
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, Eq) and self.args == other.args
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __str__(self):
+        return f"Eq({_str(self.args[0])}, {_str(self.args[1])})"
+
+    __repr__ = __str__
+
+
+Equality = Eq
+
+ONE = Number(1)
+ZERO = Number(0)
+MINUS_ONE = Number(-1)
+
+
+def Integer(value):
+    return Number(int(value))
+
+
+def Rational(p, q=1):
+    return Number(p, q)
+
+
+def symbols(names):
+    """symbols('x') -> Symbol, symbols('x y') or symbols('x, y') -> tuple of Symbols"""
+    split = [name for name in re.split(r'[\s,]+', names.strip()) if name]
+    if len(split) == 1:
+        return Symbol(split[0])
+    return tuple(Symbol(name) for name in split)
+
+
+def sqrt(expr):
+    return _pow(_sympify(expr), Fraction(1, 2))
+
+
+# ----------------------------------------------------------------------
+# Canonicalization
+# ----------------------------------------------------------------------
+
+def _keep_coeff(coeff, rest):
+    if coeff == 1:
+        return rest
+    if rest.is_Mul:
+        return Mul._new((Number(coeff),) + rest.args)
+    return Mul._new((Number(coeff), rest))
+
+
+def _add(terms):
+    constant = Fraction(0)
+    coeffs = {}
+    stack = list(terms)
+    while stack:
+        term = stack.pop()
+        if term.is_Add:
+            stack.extend(term.args)
+        elif term.is_Number:
+            constant += term.value
+        else:
+            coeff, rest = term.as_coeff_Mul()
+            coeffs[rest] = coeffs.get(rest, 0) + coeff
+
+    args = [_keep_coeff(coeff, rest) for rest, coeff in coeffs.items() if coeff != 0]
+    if constant != 0:
+        args.append(Number(constant))
+    if not args:
+        return ZERO
+    if len(args) == 1:
+        return args[0]
+    args.sort(key=_sort_key_of)
+    return Add._new(tuple(args))
+
+
+def _rational_gcd(a, b):
+    return Fraction(math.gcd(a.numerator, b.numerator),
+                    math.lcm(a.denominator, b.denominator))
+
+
+def _merge_surds(surds):
+    """Combine roots of positive numbers the way SymPy's Mul does.
+
+    `surds` maps base -> total exponent. Bases under the same exponent multiply
+    (sqrt(2)*sqrt(3) -> sqrt(6)), whole powers move into the coefficient, and bases
+    sharing a factor pull it out under the summed exponent (2**(1/3)*6**(1/4) ->
+    2**(7/12)*3**(1/4)). Returns (coefficient, factors)."""
+    coeff = Fraction(1)
+    by_exp = {}
+    for base, exp in surds.items():
+        by_exp[exp] = by_exp.get(exp, 1) * base
+
+    pending = []
+    for exp, base in by_exp.items():
+        if exp.denominator == 1:
+            coeff *= base ** exp.numerator
+            continue
+        if exp > 1:
+            whole = math.floor(exp)
+            coeff *= base ** whole
+            exp -= whole
+        pending.append((base, exp))
+
+    merged = {}
+    i = 0
+    while i < len(pending):
+        base_i, exp_i = pending[i]
+        grown = []
+        for j in range(i + 1, len(pending)):
+            base_j, exp_j = pending[j]
+            common = _rational_gcd(base_i, base_j)
+            if common != 1:
+                exp = exp_i + exp_j
+                if exp.denominator == 1:
+                    coeff *= common ** exp.numerator
+                else:
+                    if exp > 1:
+                        whole = math.floor(exp)
+                        coeff *= common ** whole
+                        exp -= whole
+                    grown.append((common, exp))
+                pending[j] = (base_j / common, exp_j)
+                base_i /= common
+                if base_i == 1:
+                    break
+        if base_i != 1:
+            power = _pow(Number(base_i), exp_i)
+            for factor in (power.args if power.is_Mul else (power,)):
+                if factor.is_Number:
+                    coeff *= factor.value
+                else:
+                    exp = factor.args[1].value
+                    merged[exp] = merged.get(exp, 1) * factor.args[0].value
+        pending.extend(grown)
+        i += 1
+
+    factors = []
+    for exp, base in merged.items():
+        power = _pow(Number(base), exp)
+        if power.is_Number:
+            coeff *= power.value
+        else:
+            factors.append(power)
+    return coeff, factors
+
+
+def _mul(factors):
+    coeff = Fraction(1)
+    powers = {}
+    stack = list(factors)
+    while stack:
+        factor = stack.pop()
+        if factor.is_Mul:
+            stack.extend(factor.args)
+        elif factor.is_Number:
+            coeff *= factor.value
+        elif factor.is_Pow:
+            base = factor.args[0]
+            powers[base] = powers.get(base, 0) + factor.args[1].value
+        else:
+            powers[factor] = powers.get(factor, 0) + 1
+    if coeff == 0:
+        return ZERO
+
+    surds = {}
+    evaluated = []
+    for base, exp in powers.items():
+        if exp == 0:
+            continue
+        if base.is_Number and base.value > 0 and exp.denominator != 1:
+            surds[base.value] = exp
+        else:
+            evaluated.append(_pow(base, exp))
+    if surds:
+        surd_coeff, surd_factors = _merge_surds(surds)
+        coeff *= surd_coeff
+        evaluated.extend(surd_factors)
+
+    rest = []
+    regroup = False
+    for factor in evaluated:
+        if factor.is_Number:
+            coeff *= factor.value
+        else:
+            # e.g. sqrt(8) -> 2*sqrt(2), or (2*x)**2 -> 4*x**2: go round again to merge
+            regroup = regroup or factor.is_Mul
+            rest.append(factor)
+    if regroup:
+        return _mul([Number(coeff)] + rest)
+
+    if coeff == 0:
+        return ZERO
+    if not rest:
+        return Number(coeff)
+    if len(rest) == 1:
+        if coeff == 1:
+            return rest[0]
+        if rest[0].is_Add:
+            # 2*(x + 3) -> 2*x + 6
+            return _add([_mul([Number(coeff), term]) for term in rest[0].args])
+    rest.sort(key=_sort_key_of)
+    if coeff != 1:
+        rest.insert(0, Number(coeff))
+    return Mul._new(tuple(rest))
+
+
+def _integer_root(n, q):
+    root = int(round(n ** (1.0 / q)))
+    for candidate in (root - 1, root, root + 1):
+        if candidate >= 0 and candidate ** q == n:
+            return candidate
+    return None
+
+
+def _split_power(n, q):
+    """n == outside**q * inside with inside free of q-th powers (as far as small primes go)"""
+    outside, inside = 1, 1
+    factor = 2
+    while factor * factor <= n and factor < 1000:
+        count = 0
+        while n % factor == 0:
+            n //= factor
+            count += 1
+        outside *= factor ** (count // q)
+        inside *= factor ** (count % q)
+        factor += 1
+    root = _integer_root(n, q)
+    if root is not None:
+        outside *= root
+    else:
+        inside *= n
+    return outside, inside
+
+
+def _rational_power(value, exp):
+    """value**exp for a positive rational value and a non-integer rational exp"""
+    whole = math.floor(exp)
+    frac = exp - whole
+    coeff = value ** whole
+    if frac.numerator != 1:
+        root = Pow._new((Number(value), Number(frac)))
+        return root if coeff == 1 else Mul._new((Number(coeff), root))
+    # (n/d)**(1/q) = (n * d**(q-1))**(1/q) / d, then pull out any perfect q-th powers
+    q = frac.denominator
+    outside, inside = _split_power(value.numerator * value.denominator ** (q - 1), q)
+    coeff *= Fraction(outside, value.denominator)
+    if inside == 1:
+        return Number(coeff)
+    root = Pow._new((Number(inside), Number(Fraction(1, q))))
+    return root if coeff == 1 else Mul._new((Number(coeff), root))
+
+
+def _pow(base, exp):
+    if exp == 0:
+        return ONE
+    if exp == 1:
+        return base
+
+    if base.is_Number:
+        value = base.value
+        if value == 1:
+            return ONE
+        if value == 0:
+            if exp < 0:
+                raise ZeroDivisionError("division by zero")
+            return ZERO
+        if exp.denominator == 1:
+            return Number(value ** exp.numerator)
+        if value < 0:
+            # would be imaginary - never built by the trainer, so leave it alone
+            return Pow._new((base, Number(exp)))
+        return _rational_power(value, exp)
+
+    if base.is_Pow:
+        inner = base.args[1].value
+        # (x**a)**b == x**(a*b) only when b is an integer or a is a proper fraction
+        if exp.denominator == 1 or -1 < inner < 1:
+            return _pow(base.args[0], inner * exp)
+        return Pow._new((base, Number(exp)))
+
+    if base.is_Mul:
+        if exp.denominator == 1:
+            return _mul([_pow(factor, exp) for factor in base.args])
+        # positive numeric factors come out from under the root: sqrt(2*x) -> sqrt(2)*sqrt(x)
+        numeric, rest = [], []
+        for factor in base.args:
+            if factor.is_Number:
+                if factor.value < 0:
+                    rest.append(MINUS_ONE)
+                    if factor.value != -1:
+                        numeric.append(Number(-factor.value))
+                else:
+                    numeric.append(factor)
+            elif factor.is_Pow and factor.args[0].is_Number and factor.args[0].value > 0:
+                numeric.append(factor)
+            else:
+                rest.append(factor)
+        if not numeric:
+            return Pow._new((base, Number(exp)))
+        parts = [_pow(factor, exp) for factor in numeric]
+        if rest:
+            rest_expr = rest[0] if len(rest) == 1 else Mul._new(tuple(sorted(rest, key=_sort_key_of)))
+            parts.append(_pow(rest_expr, exp))
+        return _mul(parts)
+
+    return Pow._new((base, Number(exp)))
+
+
+# ----------------------------------------------------------------------
+# SymPy's ordering (needed so things print in the same order)
+# ----------------------------------------------------------------------
+
+def _sort_key_of(expr):
+    return expr.sort_key()
+
+
+def _class_key(expr):
+    if expr.is_Number:
+        return _NUMBER_CLASS
+    if expr.is_Symbol:
+        return _SYMBOL_CLASS
+    if expr.is_Add:
+        return _ADD_CLASS
+    if expr.is_Mul:
+        return _MUL_CLASS
+    return _POW_CLASS
+
+
+def _sort_key(expr):
+    if expr.is_Number:
+        return (_NUMBER_CLASS, (0, ()), (), expr.value)
+    coeff, rest = expr.as_coeff_Mul()
+    if rest.is_Pow:
+        rest, exp = rest.args
+    else:
+        exp = ONE
+    if rest.is_Atom:
+        args = (1, (str(rest),))
+    else:
+        if rest.is_Add:
+            parts = _ordered_terms(rest)
+        else:
+            parts = rest.args
+        args = (len(parts), tuple(part.sort_key() for part in parts))
+    return (_class_key(rest), args, exp.sort_key(), coeff)
+
+
+def _decompose_power(factor):
+    if factor.is_Pow:
+        base, exp = factor.args
+        if exp.value.denominator != 1:
+            base = _pow(base, Fraction(1, exp.value.denominator))
+        return base, exp.value.numerator
+    return factor, 1
+
+
+def _ordered_terms(expr):
+    """The order SymPy prints the terms of a sum in"""
+    terms = expr.args
+    # SymPy special-cases number - c*x so that it prints as "3 - x" rather than "-x + 3"
+    if len(terms) == 2:
+        number = [term for term in terms if term.is_Number]
+        other = [term for term in terms if not term.is_Number]
+        if (len(number) == 1 and other[0].is_Mul and len(other[0].args) == 2
+                and other[0].args[0].is_Number and number[0].value > 0
+                and other[0].args[0].value < 0):
+            return [number[0], other[0]]
+
+    described = []
+    gens = set()
+    for term in terms:
+        coeff, rest = term.as_coeff_Mul()
+        coeff = float(coeff)
+        powers = {}
+        if rest is not ONE:
+            for factor in (rest.args if rest.is_Mul else (rest,)):
+                if factor.is_number:
+                    coeff *= float(factor)
+                    continue
+                base, exp = _decompose_power(factor)
+                powers[base] = exp
+                gens.add(base)
+        described.append((term, coeff, powers))
+
+    gens = sorted(gens, key=_sort_key_of)
+
+    def key(item):
+        _, coeff, powers = item
+        # lex order on exponents, highest first, then by coefficient
+        return tuple(-powers.get(gen, 0) for gen in gens), coeff
+
+    return [term for term, _, _ in sorted(described, key=key)]
+
+
+# ----------------------------------------------------------------------
+# Printing, matching SymPy's str() and latex()
+# ----------------------------------------------------------------------
+
+def _precedence(expr):
+    if expr.is_Number:
+        if expr.value < 0:
+            return _PREC_ADD
+        return _PREC_ATOM if expr.value.denominator == 1 else _PREC_MUL
+    if expr.is_Symbol:
+        return _PREC_ATOM
+    if expr.is_Add:
+        return _PREC_ADD
+    if expr.is_Mul:
+        return _PREC_ADD if expr.could_extract_minus_sign() else _PREC_MUL
+    return _PREC_POW
+
+
+def _str_paren(expr, level):
+    text = _str(expr)
+    return f"({text})" if _precedence(expr) <= level else text
+
+
+def _str(expr):
+    if isinstance(expr, Eq):
+        return str(expr)
+    if expr.is_Number:
+        value = expr.value
+        return str(value.numerator) if value.denominator == 1 else f"{value.numerator}/{value.denominator}"
+    if expr.is_Symbol:
+        return expr.name
+    if expr.is_Add:
+        parts = []
+        for term in _ordered_terms(expr):
+            text = _str(term)
+            if text.startswith('-'):
+                parts.extend(['-', text[1:]])
+            else:
+                parts.extend(['+', text])
+        sign = parts.pop(0)
+        return ('' if sign == '+' else sign) + ' '.join(parts)
+    if expr.is_Mul:
+        return _str_mul(expr)
+    return _str_pow(expr)
+
+
+def _str_mul(expr):
+    prec = _precedence(expr)
+    factors = list(expr.args)
+    sign = ''
+    if factors[0].is_Number and factors[0].value < 0:
+        sign = '-'
+        factors[0] = Number(-factors[0].value)
+        if factors[0].value == 1:
+            factors.pop(0)
+
+    numer, denom = [], []
+    for factor in factors:
+        if factor.is_Pow and factor.args[1].value < 0:
+            exp = -factor.args[1].value
+            denom.append(factor.args[0] if exp == 1 else Pow._new((factor.args[0], Number(exp))))
+        elif factor.is_Number:
+            if factor.value.numerator != 1:
+                numer.append(Number(factor.value.numerator))
+            if factor.value.denominator != 1:
+                denom.append(Number(factor.value.denominator))
+        else:
+            numer.append(factor)
+    numer = numer or [ONE]
+
+    if len(numer) == 1 and sign == '-':
+        numer_str = [_str_paren(numer[0], 0.5 * (_PREC_POW + _PREC_MUL))]
+    else:
+        numer_str = [_str_paren(factor, prec) for factor in numer]
+    denom_str = [_str_paren(factor, prec) for factor in denom]
+    if not denom:
+        return sign + '*'.join(numer_str)
+    if len(denom) == 1:
+        return sign + '*'.join(numer_str) + '/' + denom_str[0]
+    return sign + '*'.join(numer_str) + '/(' + '*'.join(denom_str) + ')'
+
+
+def _str_pow(expr):
+    base, exp = expr.args
+    if exp.value == Fraction(1, 2):
+        return f"sqrt({_str(base)})"
+    if exp.value == Fraction(-1, 2):
+        return f"1/sqrt({_str(base)})"
+    if exp.value == -1:
+        return f"1/{_str_paren(base, _PREC_POW)}"
+    return f"{_str_paren(base, _PREC_POW)}**{_str_paren(exp, _PREC_POW)}"
+
+
+_NUMBER_END = re.compile(r'[0-9][} ]*$')
+_NUMBER_START = re.compile(r'(\d|\\frac{\d+}{\d+})')
+
+
+def _latex_paren(expr, level):
+    text = _latex(expr)
+    return rf"\left({text}\right)" if _precedence(expr) <= level else text
+
+
+def _latex_factors(factors):
+    tex = last = ''
+    for factor in factors:
+        term = _latex(factor)
+        if factor.is_Add:
+            term = rf"\left({term}\right)"
+        if _NUMBER_END.search(last) and _NUMBER_START.match(term):
+            tex += r" \cdot "
+        elif tex:
+            tex += ' '
+        tex += term
+        last = term
+    return tex
+
+
+def _latex(expr):
+    if isinstance(expr, Eq):
+        return f"{_latex(expr.args[0])} = {_latex(expr.args[1])}"
+    if expr.is_Number:
+        value = expr.value
+        if value.denominator == 1:
+            return str(value.numerator)
+        sign = '- ' if value < 0 else ''
+        return rf"{sign}\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+    if expr.is_Symbol:
+        return expr.name
+    if expr.is_Add:
+        tex = ''
+        for i, term in enumerate(_ordered_terms(expr)):
+            if i == 0:
+                pass
+            elif term.could_extract_minus_sign():
+                tex += ' - '
+                term = -term
+            else:
+                tex += ' + '
+            tex += _latex(term)
+        return tex
+    if expr.is_Mul:
+        return _latex_mul(expr)
+    return _latex_pow(expr)
+
+
+def _latex_mul(expr):
+    tex = ''
+    factors = list(expr.args)
+    if expr.could_extract_minus_sign():
+        tex = '- '
+        factors[0] = Number(-factors[0].value)
+        if factors[0].value == 1:
+            factors.pop(0)
+
+    numer, denom = [], []
+    for factor in factors:
+        if factor.is_Pow and factor.args[1].value < 0:
+            exp = -factor.args[1].value
+            denom.append(factor.args[0] if exp == 1 else Pow._new((factor.args[0], Number(exp))))
+        elif factor.is_Number and factor.value.denominator != 1:
+            if factor.value.numerator != 1:
+                numer.append(Number(factor.value.numerator))
+            denom.append(Number(factor.value.denominator))
+        else:
+            numer.append(factor)
+
+    if not denom:
+        return tex + _latex_factors(factors)
+    snumer = _latex_factors(sorted(numer, key=_sort_key_of)) if numer else '1'
+    sdenom = _latex_factors(sorted(denom, key=_sort_key_of))
+    return tex + rf"\frac{{{snumer}}}{{{sdenom}}}"
+
+
+def _latex_pow(expr):
+    base, exp = expr.args
+    p, q = exp.value.numerator, exp.value.denominator
+    if abs(p) == 1 and q != 1:
+        root = rf"\sqrt{{{_latex(base)}}}" if q == 2 else rf"\sqrt[{q}]{{{_latex(base)}}}"
+        return rf"\frac{{1}}{{{root}}}" if p < 0 else root
+    if p < 0:
+        return _latex_mul(Mul._new((expr,)))
+    return f"{_latex_paren(base, _PREC_POW)}^{{{_latex(exp)}}}"
+
+
+def latex(expr):
+    return _latex(expr)
+
+
+def srepr(expr):
+    """SymPy-compatible srepr, so banks written by either backend can be read by both"""
+    if isinstance(expr, Eq):
+        return f"Equality({srepr(expr.args[0])}, {srepr(expr.args[1])})"
+    if expr.is_Number:
+        value = expr.value
+        if value.denominator == 1:
+            return f"Integer({value.numerator})"
+        return f"Rational({value.numerator}, {value.denominator})"
+    if expr.is_Symbol:
+        return f"Symbol({expr.name!r})"
+    return f"{type(expr).__name__}({', '.join(srepr(arg) for arg in expr.args)})"
+
+
+# ----------------------------------------------------------------------
+# expand / powsimp
+# ----------------------------------------------------------------------
+
+def _distribute(factors):
+    terms = [ONE]
+    for factor in factors:
+        if factor.is_Add:
+            terms = [_mul([term, part]) for term in terms for part in factor.args]
+        else:
+            terms = [_mul([term, factor]) for term in terms]
+    return _add(terms)
+
+
+def _expand(expr):
+    if expr.is_Atom:
+        return expr
+    if expr.is_Add:
+        return _add([_expand(term) for term in expr.args])
+    if expr.is_Mul:
+        return _distribute([_expand(factor) for factor in expr.args])
+
+    base = _expand(expr.args[0])
+    exp = expr.args[1].value
+    if base.is_Add and exp.denominator == 1 and exp > 1:
+        return _distribute([base] * exp.numerator)
+    if base.is_Add and exp.denominator != 1 and exp > 1:
+        # (x + 1)**(3/2) -> x*sqrt(x + 1) + sqrt(x + 1)
+        whole = math.floor(exp)
+        return _distribute([_distribute([base] * whole), _pow(base, exp - whole)])
+    return _pow(base, exp)
+
+
+def expand(expr):
+    if isinstance(expr, Eq):
+        return Eq(expand(expr.args[0]), expand(expr.args[1]))
+    expr = _sympify(expr)
+    # products of expanded pieces can leave new sums behind (sqrt(x + 1)**2 -> x + 1)
+    expanded = _expand(expr)
+    while expanded != expr:
+        expr, expanded = expanded, _expand(expanded)
+    return expanded
+
+
+def _is_nonnegative(expr):
+    if expr.is_Number:
+        return expr.value >= 0
+    if expr.is_Pow:
+        return expr.args[0].is_Number and expr.args[0].value > 0
+    if expr.is_Mul:
+        return all(_is_nonnegative(factor) for factor in expr.args)
+    # symbols could be anything, so sums and powers of them are unknown too
+    return False
+
+
+def _powsimp_mul(expr):
+    # powers of a common base are merged on construction already; what's left is
+    # joining bases under the same root. SymPy only does that when at most one of
+    # them could be negative: sqrt(2)*sqrt(x + 1) -> sqrt(2*x + 2)
+    by_exp = {}
+    others = []
+    for factor in expr.args:
+        if factor.is_Pow and factor.args[1].value.denominator != 1:
+            by_exp.setdefault(factor.args[1].value, []).append(factor.args[0])
+        else:
+            others.append(factor)
+    if all(len(bases) == 1 for bases in by_exp.values()):
+        return expr
+
+    factors = others
+    for exp, bases in by_exp.items():
+        unknown = [base for base in bases if not _is_nonnegative(base)]
+        if len(unknown) <= 1:
+            factors.append(_pow(_mul(bases), exp))
+        else:
+            joined = [base for base in bases if _is_nonnegative(base)]
+            factors.extend(_pow(base, exp) for base in unknown)
+            if joined:
+                factors.append(_pow(_mul(joined), exp))
+    return _mul(factors)
+
+
+def powsimp(expr):
+    """Join bases under a common root where SymPy's powsimp would (not recursing into powers)"""
+    if isinstance(expr, Eq):
+        return Eq(powsimp(expr.args[0]), powsimp(expr.args[1]))
+    if expr.is_Add:
+        return _add([powsimp(term) for term in expr.args])
+    if expr.is_Mul:
+        return _powsimp_mul(expr)
+    return expr
+
+
+# ----------------------------------------------------------------------
+# Parsing srepr / simple expression strings
+# ----------------------------------------------------------------------
+
+_CONSTRUCTORS = {
+    'Symbol': Symbol,
+    'Integer': Integer,
+    'Rational': Rational,
+    'Add': Add,
+    'Mul': Mul,
+    'Pow': Pow,
+    'Eq': Eq,
+    'Equality': Eq,
+    'sqrt': sqrt,
+}
+
+_BINARY_OPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Pow: lambda a, b: a ** b,
+}
+
+
+def _build(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, str)):
+        return Number(node.value) if isinstance(node.value, int) else node.value
+    if isinstance(node, ast.Name):
+        return Symbol(node.id)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _build(node.operand)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](_build(node.left), _build(node.right))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in _CONSTRUCTORS and not node.keywords):
+        args = [_build(arg) for arg in node.args]
+        if node.func.id in ('Integer', 'Rational'):
+            args = [int(arg) for arg in args]
+        return _CONSTRUCTORS[node.func.id](*args)
+    raise ValueError(f"unsupported expression: {ast.dump(node)}")
+
+
+def sympify(value):
+    """Build an expression from an srepr string (or a plain one like "2*x + 3")"""
+    if isinstance(value, (Expr, Eq)):
+        return value
+    if not isinstance(value, str):
+        return _sympify(value)
+    return _build(ast.parse(value.strip(), mode='eval').body)
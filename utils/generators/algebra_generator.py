@@ -0,0 +1,136 @@
+try:
+    from .base_generator import BaseGenerator
+except ImportError:
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).parent.parent.parent))
+    from utils.generators.base_generator import BaseGenerator
+
+from utils.algebra_backend import sp
+
+DIFFICULTIES = ('easy', 'medium', 'hard', 'extra_hard')
+
+class AlgebraGenerator(BaseGenerator):
+    question_fields = ('equation', 'target_var', 'solution_steps')
+
+    def __init__(self, rng=None):
+        super().__init__(state_prefix="algebra_", rng=rng)
+
+    def generate_question(self, problem_type, difficulty):
+        """(equation, target_var, solution_steps) of a new problem; there's only one problem type"""
+        problem = self.generate_equation(difficulty)
+        return problem['equation'], problem['target_var'], problem['solution_steps']
+
+    def generate_equation(self, difficulty):
+        """Generate a random algebra equation with a pedagogically sound solution path"""
+        # Define difficulty parameters
+        if difficulty == 'easy':
+            num_steps = 2
+            operations = ['add', 'sub', 'mul', 'div']
+            max_value = 5
+        elif difficulty == 'medium':
+            num_steps = 3
+            operations = ['add', 'sub', 'mul', 'div']
+            max_value = 8
+        elif difficulty == 'hard':
+            num_steps = 3
+            operations = ['add', 'sub', 'mul', 'div', 'sqr']
+            max_value = 10
+        else:  # extra_hard
+            num_steps = 4
+            operations = ['add', 'sub', 'mul', 'div', 'sqr', 'sqrt']
+            max_value = 12
+        
+        # Choose target variable
+        variables = ['x', 'y', 'z', 'a', 'b', 'c', 'm', 'n', 'p', 'q']
+        var_target = self.rng.choice(variables)
+        var_solve = self.rng.choice([v for v in variables if v != var_target])
+        
+        # Start with the target variable
+        target_sym = sp.symbols(var_target)
+        solve_sym = sp.symbols(var_solve)
+        
+        # Begin with the simplest equation: solve_var = target_var
+        current_expr = target_sym
+        
+        # Build the solution path by applying random operations
+        solution_path = []
+        final_operations = []
+        
+        # Operation functions and their inverses
+        op_funcs = {
+            'add': (lambda x, v: x + v, 'Subtract', lambda x, v: x - v),
+            'sub': (lambda x, v: x - v, 'Add', lambda x, v: x + v),
+            'mul': (lambda x, v: x * v, 'Divide by', lambda x, v: x / v),
+            'div': (lambda x, v: x / v, 'Multiply by', lambda x, v: x * v),
+            'sqr': (lambda x, v: x ** 2, 'Take the square root', lambda x, v: sp.sqrt(x)),
+            'sqrt': (lambda x, v: sp.sqrt(x), 'Square it', lambda x, v: x ** 2),
+        }
+        
+        # Avoid consecutive inverse operations
+        inverse_pairs = {
+            'add': 'sub', 'sub': 'add',
+            'mul': 'div', 'div': 'mul',
+            'sqr': 'sqrt', 'sqrt': 'sqr'
+        }
+        
+        prev_op = None
+        
+        for _ in range(num_steps):
+            # Choose an operation (avoiding inverse of the previous one)
+            available_ops = [op for op in operations if op != inverse_pairs.get(prev_op, None)]
+            if not available_ops:
+                available_ops = operations.copy()
+            
+            op_name = self.rng.choice(available_ops)
+            prev_op = op_name
+            
+            # Choose a value for the operation
+            if op_name in ['sqr', 'sqrt']:
+                value = None
+            else:
+                # For division, avoid values that make fractions too complex
+                if op_name == 'div':
+                    value = self.rng.choice([2, 3, 4, 5])
+                else:
+                    value = self.rng.randint(2, max_value)
+            
+            # Get the forward operation function
+            op_func, inverse_name, inverse_func = op_funcs[op_name]
+            
+            # Apply the operation to our expression
+            if value is None:
+                current_expr = op_func(current_expr, None)
+            else:
+                current_expr = op_func(current_expr, value)
+            
+            # Store the inverse operation for the solution path
+            solution_path.append({
+                'operation': inverse_name,
+                'value': value
+            })
+            
+            # Store the forward operation for display
+            final_operations.append({
+                'operation': op_name,
+                'value': value
+            })
+        
+        # Create the final equation
+        final_equation = sp.Eq(solve_sym, current_expr)
+        
+        # Now create a proper solution path in reverse
+        solution_steps = []
+        for step in reversed(solution_path):
+            solution_steps.append(step)
+        
+        return {
+            'equation': final_equation,
+            'target_var': var_target,
+            'solve_var': var_solve,
+            'solution_steps': solution_steps,
+            'operations_applied': final_operations,
+            'steps_taken': [],
+            'current_state': final_equation,
+            'original_equation': final_equation,
+        }
@@ -1,9 +1,73 @@
 
+import copy
+import random
+import secrets
 import streamlit as st
 
+
+def session_seed():
+    """This session's seed: ?seed= from the URL if there is one, otherwise picked once and kept.
+
+    It's written back to the page URL (?seed=...), so any question a student reports can be
+    regenerated by opening the same link."""
+    if "rng_seed" not in st.session_state:
+        seed = st.query_params.get("seed")
+        st.session_state["rng_seed"] = int(seed) if seed and seed.isdigit() else secrets.randbits(32)
+    seed = st.session_state["rng_seed"]
+    if st.query_params.get("seed") != str(seed):
+        st.query_params["seed"] = str(seed)
+    return seed
+
+
+def session_rng(*key):
+    """This session's Random for `key` (e.g. a page prefix, problem type and difficulty).
+
+    Each key gets its own stream, seeded from session_seed() and the key, so the n-th
+    question of a kind only depends on the seed, not on what else was generated first."""
+    name = "rng:" + ":".join(str(part) for part in key)
+    if name not in st.session_state:
+        st.session_state[name] = random.Random(f"{session_seed()}:{name}")
+    return st.session_state[name]
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_generator(class_path, _generator_class):
+    # keyed on the class's import path, the class itself is passed along unhashed
+    generator = _generator_class()
+    generator.warm()
+    return generator
+
+
 class BaseGenerator:
-    def __init__(self, state_prefix):
+    # order of the values in the tuple returned by generate_question
+    question_fields = ('question', 'answer', 'unit')
+
+    @classmethod
+    def shared(cls):
+        """This generator, built once per process and shared by every session and rerun.
+
+        Pages draw through for_session() copies, so the random state stays per session
+        and the shared instance itself is never mutated."""
+        return _shared_generator(f"{cls.__module__}.{cls.__qualname__}", cls)
+
+    def warm(self):
+        """Build any lookup tables up front; runs once, when the shared instance is made"""
+
+    def __init__(self, state_prefix, rng=None):
         self.state_prefix = state_prefix
+        # every draw goes through self.rng, never the module-level random, so generators on
+        # different threads don't share state. rng may be a random.Random or a seed for one
+        self.rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+
+    def with_rng(self, rng):
+        """A copy of this generator drawing from `rng` (a random.Random or a seed)"""
+        clone = copy.copy(self)
+        clone.rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+        return clone
+
+    def for_session(self, *key):
+        """A copy drawing from this session's stream for `key` (see session_rng)"""
+        return self.with_rng(session_rng(self.state_prefix, *key))
     
     def get_difficulty_range(self, difficulty):
         if difficulty == "Easy":
@@ -43,3 +107,19 @@ class BaseGenerator:
         st.session_state[f"{self.state_prefix}user_answer2"] = None
         st.session_state[f"{self.state_prefix}submitted"] = False
 
+    def generate_question(self, problem_type, difficulty):
+        """Build one question tuple, laid out as question_fields"""
+        raise NotImplementedError
+
+    def generate_batch(self, problem_type, difficulty, n, seed=None):
+        """Generate n questions in one call, returned column-wise as {field: list of values}.
+
+        Generators whose numbers can be drawn as arrays override this (see ProjectileGenerator)."""
+        columns = {field: [] for field in self.question_fields}
+        appenders = [columns[field].append for field in self.question_fields]
+        # a seeded batch runs on its own copy, so it's the same batch whatever else is running
+        generator = self if seed is None else self.with_rng(seed)
+        for _ in range(n):
+            for append, value in zip(appenders, generator.generate_question(problem_type, difficulty)):
+                append(value)
+        return columns
@@ -1,5 +1,4 @@
 # utils/generators/collision_generator.py
-import random
 import sys
 from pathlib import Path
 
@@ -15,8 +14,10 @@ except ImportError:
 from utils.word_lists import random_noun
 
 class CollisionGenerator(BaseGenerator):
-    def __init__(self):
-        super().__init__(state_prefix="collision_")
+    question_fields = ('question', 'answer', 'unit', 'answer2', 'unit2')
+
+    def __init__(self, rng=None):
+        super().__init__(state_prefix="collision_", rng=rng)
     
     def generate_question(self, collision_type, difficulty):
         if collision_type == "Elastic Collision":
@@ -25,11 +26,11 @@ class CollisionGenerator(BaseGenerator):
             return self._generate_inelastic_collision(difficulty)
         
     def numbers(self, difficulty):
-        coin = random.randint(0,1)
-        m1 = random.randint(1,difficulty)
-        g = random.randint(2,difficulty)
-        h = random.randint(1,difficulty)
-        j = random.randint(1,difficulty)
+        coin = self.rng.randint(0,1)
+        m1 = self.rng.randint(1,difficulty)
+        g = self.rng.randint(2,difficulty)
+        h = self.rng.randint(1,difficulty)
+        j = self.rng.randint(1,difficulty)
         if coin == 1:
             g *= -1
             h *= -1
@@ -42,7 +43,7 @@ class CollisionGenerator(BaseGenerator):
         v2_p = j*(2*g + g*h - 1)
         impulse_2 = m2*(2*j*(g-1))
         impulse_1 = -1*impulse_2
-        t_val = random.randint(-2,0)
+        t_val = self.rng.randint(-2,0)
         time = 10**t_val
         Force_1 = impulse_1//time
         Force_2 = -1*Force_1
@@ -52,8 +53,8 @@ class CollisionGenerator(BaseGenerator):
     def _generate_elastic_collision(self, difficulty):
         range = self.get_difficulty_range(difficulty)//2
         m1, v1, m2, v2, v1_p, v2_p, _, impulse_1, impulse_2, Force_1, Force_2, time = self.numbers(range)
-        object1 = random_noun()
-        object2 = random_noun()
+        object1 = random_noun(self.rng)
+        object2 = random_noun(self.rng)
         if v2 < 0:
             verb = "collides head on into"
         else:
@@ -83,8 +84,8 @@ class CollisionGenerator(BaseGenerator):
     def _generate_inelastic_collision(self, difficulty):
         range = self.get_difficulty_range(difficulty)
         m1, v1, m2, v2, _, _, v3, impulse_1, impulse_2, Force_1, Force_2, time = self.numbers(range)
-        object1 = random_noun()
-        object2 = random_noun()
+        object1 = random_noun(self.rng)
+        object2 = random_noun(self.rng)
         if v2 < 0:
             verb = "collides head on into"
         else:
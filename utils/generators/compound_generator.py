@@ -0,0 +1,255 @@
+# utils/generators/compound_generator.py
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+from itertools import permutations
+
+try:
+    from .base_generator import BaseGenerator
+except ImportError:
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).parent.parent.parent))
+    from utils.generators.base_generator import BaseGenerator
+
+from utils.periodic_table import (element_dict, metals, nonmetals, covalent, multi_charge_metals,
+                                  prefixes, oxygen_prefixes, roman_numerals, polyatomic_ions)
+
+CATEGORIES = ('ionic', 'covalent', 'polyatomic')
+MAX_COVALENT_SUBSCRIPT = 4  # the quiz only asks about subscripts 1-4
+
+Compound = namedtuple('Compound', ['formula', 'name', 'category'])
+
+# classical (-ous/-ic) names, keyed by the normalized Stock name they stand for
+CLASSICAL_NAMES = {
+    'iron(ii)': 'ferrous', 'iron(iii)': 'ferric',
+    'copper(i)': 'cuprous', 'copper(ii)': 'cupric',
+    'tin(ii)': 'stannous', 'tin(iv)': 'stannic',
+    'lead(ii)': 'plumbous', 'lead(iv)': 'plumbic',
+    'mercury(i)': 'mercurous', 'mercury(ii)': 'mercuric',
+    'cobalt(ii)': 'cobaltous', 'cobalt(iii)': 'cobaltic',
+    'chromium(ii)': 'chromous', 'chromium(iii)': 'chromic',
+    'gold(i)': 'aurous', 'gold(iii)': 'auric',
+    'thallium(i)': 'thallous', 'thallium(iii)': 'thallic',
+}
+
+# (as written here, also accepted) pairs, applied to normalized names
+ALTERNATE_SPELLINGS = [
+    ('bicarbonate', 'hydrogencarbonate'),
+    ('bisulfate', 'hydrogensulfate'),
+    ('sulf', 'sulph'),
+    ('cesium', 'caesium'),
+    ('antimide', 'antimonide'),
+    ('bismide', 'bismuthide'),
+] + [
+    # "tetroxide" is the usual spelling, but "tetraoxide" isn't wrong
+    (oxygen_prefixes[n] + 'ox', prefixes[n] + 'ox')
+    for n in prefixes if oxygen_prefixes[n] != prefixes[n]
+]
+
+
+# --- building one compound (shared by the index and the formula explorer) ---
+
+def order_covalent_elements(e1, s1, e2, s2):
+    """Helper function to order covalent elements correctly"""
+    group1, group2 = element_dict[e1].group, element_dict[e2].group
+    if group1 < group2:
+        return e1, s1, e2, s2
+    elif group1 > group2:
+        return e2, s2, e1, s1
+    elif element_dict[e1].period > element_dict[e2].period:
+        return e1, s1, e2, s2
+    else:
+        return e2, s2, e1, s1
+
+def construct_formula(term1, sub1, term2, sub2):
+    sub1string = '_'+str(sub1) if sub1>1 else ''
+    sub2string = '_'+str(sub2) if sub2>1 else ''
+    if len(term1) == 2:
+        term1string = f"{{{term1}}}"
+    else:
+        term1string = term1
+    if len(term2) == 2:
+        term2string = f"{{{term2}}}"
+    else:
+        term2string = term2
+    if sub1string != '' and sub2string != '':
+        formula = f"\\text{{{term1string}}}{sub1string} \\, \\text{{{term2string}}}{sub2string}"
+    elif sub1string != '':
+        formula = f"\\text{{{term1string}}}{sub1string} \\, \\text{{{term2string}}}"
+    elif sub2string != '':
+        formula = f"\\text{{{term1string}}} \\, \\text{{{term2string}}}{sub2string}"
+    else:
+        formula = f"\\text{{{term1string}}} \\, \\text{{{term2string}}}"
+    return formula
+
+def formula_text(formula):
+    """Plain text for one of our LaTeX formulas, e.g. "Al2(SO4)3", for worksheets and CSVs"""
+    text = formula.replace(r"\left(", "(").replace(r"\right)", ")").replace(r"\,", "").replace(r"\text", "")
+    return re.sub(r"[{}_\s]", "", text)
+
+def make_covalent_name(element_1: str, subscript_1: int, element_2: str, subscript_2: int):
+    if subscript_1 == 1:
+        term1string = element_dict[element_1].name.capitalize()
+    elif element_1 == 'O':
+        term1string = oxygen_prefixes[subscript_1].capitalize() + element_dict[element_1].name.lower()
+    else:
+        term1string = prefixes[subscript_1].capitalize() + element_dict[element_1].name.lower()
+
+    if element_2 == 'O':
+        term2string = oxygen_prefixes[subscript_2].capitalize() + element_dict[element_2].anion.lower()
+    else:
+        term2string = prefixes[subscript_2].capitalize() + element_dict[element_2].anion.lower()
+    name = f"{term1string} {term2string}"
+    return name
+
+
+def _metal_name(metal, charge):
+    # Roman numeral only for metals that have more than one charge
+    roman = roman_numerals[charge] if metal in multi_charge_metals else ''
+    return f"{element_dict[metal].name}{roman}"
+
+def _poly_string(poly_ion, poly_sub):
+    poly_formula = polyatomic_ions[poly_ion].formula
+    if poly_sub > 1:
+        return r"\left(" + poly_formula + r"\right)_" + str(poly_sub)
+    return poly_formula
+
+def _element_string(element, sub):
+    if sub > 1:
+        return f"\\text{{{element}}}_{{{sub}}}"
+    return f"\\text{{{element}}}"
+
+
+def covalent_compound(element_1, subscript_1, element_2, subscript_2):
+    """(formula, name), with the two elements put in naming order first"""
+    term1, sub1, term2, sub2 = order_covalent_elements(element_1, subscript_1, element_2, subscript_2)
+    return construct_formula(term1, sub1, term2, sub2), make_covalent_name(term1, sub1, term2, sub2)
+
+def ionic_compound(metal, metal_charge, nonmetal):
+    """(formula, name) for a metal with the given charge and a monatomic anion"""
+    nonmetal_charge = element_dict[nonmetal].charges[0]
+    m_sub = abs(nonmetal_charge) // math.gcd(metal_charge, abs(nonmetal_charge))
+    nm_sub = metal_charge // math.gcd(metal_charge, abs(nonmetal_charge))
+    formula = construct_formula(metal, m_sub, nonmetal, nm_sub)
+    name = f"{_metal_name(metal, metal_charge)} {element_dict[nonmetal].anion}".capitalize()
+    return formula, name
+
+def polyatomic_compound(poly_ion, paired_ion, paired_charge):
+    """(formula, name) for a polyatomic ion paired with a metal, or ammonium with a nonmetal"""
+    poly_charge = polyatomic_ions[poly_ion].charges[0]
+    divisor = math.gcd(poly_charge, abs(paired_charge))
+    poly_sub = abs(paired_charge) // divisor
+    paired_sub = abs(poly_charge) // divisor
+
+    # ammonium goes first, otherwise the metal goes first
+    if poly_ion == 'ammonium':
+        formula = f"{_poly_string(poly_ion, poly_sub)} \\, {_element_string(paired_ion, paired_sub)}"
+        name = f"{poly_ion} {element_dict[paired_ion].anion}"
+    else:
+        formula = f"{_element_string(paired_ion, paired_sub)} \\, {_poly_string(poly_ion, poly_sub)}"
+        name = f"{_metal_name(paired_ion, paired_charge)} {poly_ion}"
+    return formula, name.capitalize()
+
+
+# --- names as students type them ---
+
+def normalize_name(name):
+    """Case, spaces and hyphens don't matter when comparing names"""
+    return name.strip().lower().replace(' ', '').replace('-', '')
+
+def alternate_names(compound):
+    """Every normalized name accepted for `compound`, its own name first"""
+    names = [normalize_name(compound.name)]
+    stock = compound.name.split(' ')[0].lower()
+    if stock in CLASSICAL_NAMES:
+        names.append(CLASSICAL_NAMES[stock] + names[0][len(stock):])
+    if compound.category == 'covalent' and not compound.name.startswith(tuple(p.capitalize() for p in prefixes.values())):
+        # "monocarbon monoxide" is redundant but not wrong
+        names.append('mono' + names[0])
+    for written, accepted in ALTERNATE_SPELLINGS:
+        names.extend([name.replace(written, accepted) for name in names if written in name])
+    return names
+
+
+# --- every compound the quiz can ask about ---
+
+def _enumerate_compounds():
+    # sorted, never set order, so the same seed picks the same compound in every process
+    for metal in sorted(metals):
+        for charge in element_dict[metal].charges:
+            for nonmetal in sorted(nonmetals):
+                yield Compound(*ionic_compound(metal, charge, nonmetal), 'ionic')
+
+    subscripts = range(1, MAX_COVALENT_SUBSCRIPT + 1)
+    for e1, e2 in permutations(sorted(covalent), 2):
+        for s1 in subscripts:
+            for s2 in subscripts:
+                divisor = math.gcd(s1, s2)
+                yield Compound(*covalent_compound(e1, s1 // divisor, e2, s2 // divisor), 'covalent')
+
+    for poly_ion in polyatomic_ions:
+        paired = sorted(nonmetals) if poly_ion == 'ammonium' else sorted(metals)
+        for paired_ion in paired:
+            for charge in element_dict[paired_ion].charges:
+                yield Compound(*polyatomic_compound(poly_ion, paired_ion, charge), 'polyatomic')
+
+
+class CompoundIndex:
+    """Every distinct compound, grouped by category so picking one is a single array lookup,
+    and keyed by every accepted (normalized) name so looking up a typed name is one dict lookup"""
+
+    def __init__(self, compounds):
+        seen = set()
+        unique = []
+        for compound in compounds:
+            # e.g. C2O2 reduces to CO, the same compound as C1O1
+            if compound.formula not in seen:
+                seen.add(compound.formula)
+                unique.append(compound)
+        self.compounds = tuple(unique)
+        self.by_category = {category: tuple(c for c in self.compounds if c.category == category)
+                            for category in CATEGORIES}
+
+        # proper names first, so an alternate spelling can never shadow another compound's name
+        self.by_name = {normalize_name(c.name): c for c in self.compounds}
+        for compound in self.compounds:
+            for name in alternate_names(compound)[1:]:
+                self.by_name.setdefault(name, compound)
+
+    def __len__(self):
+        return len(self.compounds)
+
+    def sample(self, category, rng):
+        return rng.choice(self.by_category[category])
+
+    def lookup(self, name):
+        """The compound `name` refers to, in any accepted spelling, or None"""
+        return self.by_name.get(normalize_name(name))
+
+
+@lru_cache(maxsize=None)
+def compound_index():
+    """The process-wide index, built on first use"""
+    return CompoundIndex(_enumerate_compounds())
+
+
+class CompoundGenerator(BaseGenerator):
+    question_fields = ('formula', 'name')
+
+    def __init__(self, rng=None):
+        super().__init__(state_prefix="compounds_", rng=rng)
+
+    def warm(self):
+        compound_index()
+
+    def generate_question(self, category, difficulty=None):
+        """(formula, name) of a random compound in `category`; there are no difficulties (yet)"""
+        compound = compound_index().sample(category, self.rng)
+        return compound.formula, compound.name
+
+    def generate_compound(self, include_polyatomic):
+        """Pick a category first, like the quiz always has, then a compound from it"""
+        categories = CATEGORIES if include_polyatomic else CATEGORIES[:2]
+        return self.generate_question(self.rng.choice(categories))
@@ -1,4 +1,3 @@
-from random import randint as ri
 import sys
 from pathlib import Path
 
@@ -14,8 +13,8 @@ except ImportError:
 from utils.word_lists import random_noun
 
 class EnergyGenerator(BaseGenerator):
-    def __init__(self):
-        super().__init__(state_prefix="energy_")
+    def __init__(self, rng=None):
+        super().__init__(state_prefix="energy_", rng=rng)
 
     def get_difficulty_range(self, difficulty):
         if difficulty == "Easy":
@@ -24,11 +23,28 @@ class EnergyGenerator(BaseGenerator):
             return 20
         return 10
 
+    def generate_question(self, problem_type, difficulty):
+        if problem_type == "Elastic Potential Energy":
+            return self.elastic_problem(difficulty)
+        elif problem_type == "Kinetic Energy":
+            return self.kinetic_problem(difficulty)
+        elif problem_type == "Gravitational Potential Energy":
+            return self.gravitational_problem(difficulty)
+        elif problem_type == "Work":
+            return self.work_problem(difficulty)
+        elif problem_type == "Elastic <--> Kinetic":
+            return self.elastic_kinetic_problem(difficulty)
+        elif problem_type == "Gravitational <--> Kinetic":
+            return self.kinetic_gravitational_problem(difficulty)
+        elif problem_type == "Gravitational <--> Elastic":
+            return self.elastic_gravitational_problem(difficulty)
+        raise ValueError(f"Unknown energy problem type: {problem_type}")
+
     def kinetic_energy(self,difficulty):
         upper = self.get_difficulty_range(difficulty)
-        mass = ri(1,upper)
-        velocity = ri(1,upper)
-        flip = ri(0,1)
+        mass = self.rng.randint(1,upper)
+        velocity = self.rng.randint(1,upper)
+        flip = self.rng.randint(0,1)
         if flip == 0:
             mass*=2
         else:
@@ -37,15 +53,15 @@ class EnergyGenerator(BaseGenerator):
 
     def gravitational_potential_energy(self,difficulty):
         upper = self.get_difficulty_range(difficulty)
-        mass = ri(1,upper)
-        height = ri(1,upper)
+        mass = self.rng.randint(1,upper)
+        height = self.rng.randint(1,upper)
         return mass, height, mass*10*height
 
     def elastic_potential_energy(self,difficulty):
         upper = self.get_difficulty_range(difficulty)
-        spring_constant = ri(1,upper)
-        compression = ri(1,upper)
-        flip = ri(0,1)
+        spring_constant = self.rng.randint(1,upper)
+        compression = self.rng.randint(1,upper)
+        flip = self.rng.randint(0,1)
         if flip == 0:
             spring_constant*=2
         else:
@@ -54,14 +70,14 @@ class EnergyGenerator(BaseGenerator):
 
     def work(self,difficulty):
         upper = self.get_difficulty_range(difficulty)
-        force = ri(1,upper)
-        distance = ri(1,upper)
+        force = self.rng.randint(1,upper)
+        distance = self.rng.randint(1,upper)
         return force, distance, force*distance
 
     def elastic_problem(self,difficulty):
         spring_constant, compression, elastic_e = self.elastic_potential_energy(difficulty)
-        q_type = ri(0,2)
-        dirn = ri(0,1)
+        q_type = self.rng.randint(0,2)
+        dirn = self.rng.randint(0,1)
         dirn_string = "compressed" if dirn == 0 else "stretched"
         {}
         if q_type == 0:
@@ -84,8 +100,8 @@ class EnergyGenerator(BaseGenerator):
     
     def kinetic_problem(self,difficulty):
         mass, velocity, kinetic_e = self.kinetic_energy(difficulty)
-        q_type = ri(0,2)
-        noun = random_noun()
+        q_type = self.rng.randint(0,2)
+        noun = random_noun(self.rng)
         if q_type == 0:
             question = f"""How much kinetic energy does a {mass} kg {noun} moving at {velocity} m/s have?"""
             answer = kinetic_e
@@ -103,8 +119,8 @@ class EnergyGenerator(BaseGenerator):
     
     def gravitational_problem(self,difficulty):
         mass, height, gravit_e = self.gravitational_potential_energy(difficulty)
-        q_type = ri(0,2)
-        noun = random_noun()
+        q_type = self.rng.randint(0,2)
+        noun = random_noun(self.rng)
         if q_type == 0:
             question = f"""How much gravitational potential energy does a {mass} kg {noun} 
             held {height} meters above the ground have?"""
@@ -125,8 +141,8 @@ class EnergyGenerator(BaseGenerator):
     
     def work_problem(self,difficulty):
         force, distance, work = self.work(difficulty)
-        q_type = ri(0,2)
-        noun = random_noun()
+        q_type = self.rng.randint(0,2)
+        noun = random_noun(self.rng)
         if q_type == 0:
             question = f"""A {noun} is moved {distance} meters by a {force} Newton force. How much work was done?"""
             answer = work
@@ -147,8 +163,8 @@ class EnergyGenerator(BaseGenerator):
     def kinetic_gravitational_problem(self,difficulty):
         mass, velocity, _ = self.kinetic_energy(difficulty)
         height = velocity**2 / 20
-        q_type = ri(0,1)
-        noun = random_noun()
+        q_type = self.rng.randint(0,1)
+        noun = random_noun(self.rng)
         if q_type == 0:
             question = f"""A {mass} kg {noun} is dropped from a height of {height:.2f} meters.
             How fast is it moving when it hits the ground?"""
@@ -165,11 +181,11 @@ class EnergyGenerator(BaseGenerator):
     def elastic_gravitational_problem(self, difficulty):
         spring_constant, compression, elastic_e = self.elastic_potential_energy(difficulty)
         upper = self.get_difficulty_range(difficulty)
-        mass = ri(1,upper)
+        mass = self.rng.randint(1,upper)
         height = elastic_e / 20*mass
 
-        q_type = ri(0,3)
-        noun = random_noun()
+        q_type = self.rng.randint(0,3)
+        noun = random_noun(self.rng)
         if q_type == 0:
             # find k
             question = f"""A {mass} kg {noun} is dropped from a height of {height:.2f} meters.
@@ -200,11 +216,11 @@ class EnergyGenerator(BaseGenerator):
     def elastic_kinetic_problem(self, difficulty):
             spring_constant, compression, _ = self.elastic_potential_energy(difficulty)
             upper = self.get_difficulty_range(difficulty)
-            mass = ri(1,upper)
+            mass = self.rng.randint(1,upper)
             velocity = compression  * (spring_constant / mass )**(1/2)
             
-            q_type = ri(0,3)
-            noun = random_noun()
+            q_type = self.rng.randint(0,3)
+            noun = random_noun(self.rng)
             if q_type == 0:
                 # find k
                 question = f"""A {mass} kg {noun} strikes a spring while moving as {velocity:.2f} m/s. 
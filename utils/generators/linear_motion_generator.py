@@ -1,4 +1,3 @@
-import random
 import sys
 from pathlib import Path
 
@@ -13,9 +12,28 @@ except ImportError:
 
 from utils.word_lists import random_noun
 
+# (a, x) factor pairs of a_x = 2*m^2*n^2 for every reachable (m, n),
+# built once per difficulty and shared by every generator instance
+_FACTOR_PAIR_TABLES = {}
+
+
+def divisor_pairs(value):
+    """Every (i, value//i) with i >= 2 dividing value, smallest i first"""
+    small = []
+    large = []
+    i = 1
+    while i * i <= value:
+        if value % i == 0:
+            small.append(i)
+            if i != value // i:
+                large.append(value // i)
+        i += 1
+    return tuple((d, value // d) for d in small + large[::-1] if d >= 2)
+
+
 class LinearMotionGenerator(BaseGenerator):
-    def __init__(self):
-        super().__init__(state_prefix="linear_")
+    def __init__(self, rng=None):
+        super().__init__(state_prefix="linear_", rng=rng)
 
     def get_difficulty_range(self, difficulty):
         if difficulty == "Easy":
@@ -24,6 +42,26 @@ class LinearMotionGenerator(BaseGenerator):
             return 20
         return 10
 
+    def warm(self):
+        for difficulty in ("Easy", "Medium", "Hard"):
+            self.factor_pair_table(difficulty)
+
+    def factor_pair_table(self, difficulty):
+        """(m, n) -> tuple of (a, x) pairs with a*x = 2*m^2*n^2, same order as plain trial division"""
+        table = _FACTOR_PAIR_TABLES.get(difficulty)
+        if table is None:
+            max_val = self.get_difficulty_range(difficulty)
+            table = {}
+            for m in range(3, max_val + 1):
+                if difficulty == "Hard":
+                    n_values = range(1, m)
+                else:
+                    n_values = [m]
+                for n in n_values:
+                    table[(m, n)] = divisor_pairs(2 * m**2 * n**2)
+            _FACTOR_PAIR_TABLES[difficulty] = table
+        return table
+
     def no_time_eq_nums(self, difficulty): # v_f,v_i,a,x 
         max_val = self.get_difficulty_range(difficulty)
 
@@ -31,42 +69,38 @@ class LinearMotionGenerator(BaseGenerator):
         changing direction is not worth scrutinizing over,
         (at least for initial launch) 
         """
-        m = random.randint(3,max_val)
+        m = self.rng.randint(3,max_val)
         if difficulty in ["Easy", "Medium"]: # v_i = 0
             n = m
             "this covers starting or ending at zero"
             """stopping (or slowing) can be handled at 
             word problem level as swapping vf, vi, a*= -1"""
         elif difficulty == "Hard":
-            n = random.randint(1,m-1)
+            n = self.rng.randint(1,m-1)
         v_i = m**2 - n**2
         v_f = m**2 + n**2
-        a_x = 2* m**2 * n**2
-        temp_list = []
-        for i in range(2,a_x + 1):
-            if a_x % i == 0:
-                temp_list.append((i,a_x//i))
-        list_choice = random.randint(0,len(temp_list)-1)
-        a = temp_list[list_choice][0]
-        x = temp_list[list_choice][1]
+        # a*x = 2* m**2 * n**2, pick one of its precomputed factor pairs
+        pairs = self.factor_pair_table(difficulty)[(m, n)]
+        list_choice = self.rng.randint(0,len(pairs)-1)
+        a, x = pairs[list_choice]
         return v_f,v_i,a,x
     
     def no_dist_eq_nums(self,difficulty):
         max_val = self.get_difficulty_range(difficulty)
-        t = random.randint(2,max_val)
+        t = self.rng.randint(2,max_val)
         if difficulty == "Easy":
             """easy means no initial velocity
             (or final in case of swap)"""
             v_i = 0
-            a = random.randint(1,max_val)
+            a = self.rng.randint(1,max_val)
         elif difficulty == "Medium":
             """in medium, non-zero velocities, but same dirn"""
-            v_i = random.randint(1,max_val)
-            a = random.randint(1,max_val)
+            v_i = self.rng.randint(1,max_val)
+            a = self.rng.randint(1,max_val)
         else: # Hard"
             """in HARD, deliberately switching direction"""
-            v_i = random.randint(1,max_val)
-            a = -1*random.randint((v_i//t)+1,(3*(v_i//t +2)))
+            v_i = self.rng.randint(1,max_val)
+            a = -1*self.rng.randint((v_i//t)+1,(3*(v_i//t +2)))
             # different range of a ensures a*t is larger than v_i
             # but not unreasonably large once multiplied by t
             # somewhat balanced final velocity
@@ -82,30 +116,30 @@ class LinearMotionGenerator(BaseGenerator):
             "so clearly, for easy, one of the velocities should be zero"
             "and the other should be positive"
             v_i = 0
-            v_f = random.randint(1,max_val)
+            v_f = self.rng.randint(1,max_val)
         elif difficulty == "Medium":
             "maybe both non-zero, but positive? no negatives here, no reason"
-            v_i = random.randint(1,max_val)
-            v_f = random.randint(v_i+1,v_i+max_val)
+            v_i = self.rng.randint(1,max_val)
+            v_f = self.rng.randint(v_i+1,v_i+max_val)
         else: # hard
             "change in direction, default is pos -> neg, can be swapped"
-            v_i = random.randint(3,max_val)
+            v_i = self.rng.randint(3,max_val)
             "need to make sure NOT equal and opposite"
-            coin = random.randint(0,1)
+            coin = self.rng.randint(0,1)
             if coin == 0:
-                v_f = -1*random.randint(1,v_i-1)
+                v_f = -1*self.rng.randint(1,v_i-1)
             else:
-                v_f = -1*random.randint(v_i+1,v_i+max_val)
+                v_f = -1*self.rng.randint(v_i+1,v_i+max_val)
         if (v_f + v_i)%2 == 0:
-            t = random.randint(2,max_val)
+            t = self.rng.randint(2,max_val)
         else: # odd sum, needs factor of 2
-            t = 2 * random.randint(1,max_val//2)
+            t = 2 * self.rng.randint(1,max_val//2)
         x = (v_f + v_i)*t//2
         return x, v_f,v_i,t
     
     def no_vf_eq_nums(self,difficulty):
         max_val = self.get_difficulty_range(difficulty)
-        t = random.randint(2,max_val)
+        t = self.rng.randint(2,max_val)
         "easy: v_i = 0, a > 0"
         if t%2 == 0:
             a_mult = 1
@@ -113,17 +147,17 @@ class LinearMotionGenerator(BaseGenerator):
             a_mult = 2
         if difficulty == "Easy":
             v_i = 0
-            a = random.randint(1,max_val)
+            a = self.rng.randint(1,max_val)
         elif difficulty == "Medium":
             "non-zero vi but still all positive"
-            v_i = random.randint(1,max_val)
-            a = random.randint(1,max_val)
+            v_i = self.rng.randint(1,max_val)
+            a = self.rng.randint(1,max_val)
         else: # hard
             "mis-matched velocity and acceleration"
             "slowed, but not reversed hmmmm"
             "2vi/t > a"
-            v_i = random.randint(1,max_val)
-            a = -1*random.randint(1,(2*v_i//t)+2)
+            v_i = self.rng.randint(1,max_val)
+            a = -1*self.rng.randint(1,(2*v_i//t)+2)
         a*=a_mult # ensures divisibility if t is odd
         v_i*=a_mult # ensures directionality is preserved
         x = v_i*t + 0.5*a*t**2
@@ -135,9 +169,9 @@ class LinearMotionGenerator(BaseGenerator):
 
     def no_time_question(self, difficulty):
         """has acceleration problems, needs x, vf, vi"""
-        noun = random_noun()
-        coin = random.randint(0,1)  # determines speeding up or slowing down
-        var_dice = random.randint(0, 3)  # roll for variable to solve for
+        noun = random_noun(self.rng)
+        coin = self.rng.randint(0,1)  # determines speeding up or slowing down
+        var_dice = self.rng.randint(0, 3)  # roll for variable to solve for
         v_f, v_i, a, x = self.no_time_eq_nums(difficulty)
         if coin == 0:
             verb = "speeds up"
@@ -217,9 +251,9 @@ class LinearMotionGenerator(BaseGenerator):
     def no_dist_question(self, difficulty):
         """has a, needs t, vf, vi"""
         v_f, v_i, a, t = self.no_dist_eq_nums(difficulty)
-        noun = random_noun()
-        coin = random.randint(0, 1)  # determines speeding up or slowing down
-        var_dice = random.randint(0, 3)  # roll for variable to solve for
+        noun = random_noun(self.rng)
+        coin = self.rng.randint(0, 1)  # determines speeding up or slowing down
+        var_dice = self.rng.randint(0, 3)  # roll for variable to solve for
         if coin == 0:
             verb = "speeds up"
         else:
@@ -309,9 +343,9 @@ class LinearMotionGenerator(BaseGenerator):
     def no_acc_question(self,difficulty):
         "has t,x, needs vf, vi"
         x, v_f,v_i,t = self.no_acc_eq_nums(difficulty)
-        noun = random_noun()
-        coin = random.randint(0,1)
-        var_dice = random.randint(0,1)
+        noun = random_noun(self.rng)
+        coin = self.rng.randint(0,1)
+        var_dice = self.rng.randint(0,1)
         if difficulty == "Easy":
             "so clearly, for easy, one of the velocities should be zero"
             "and the other should be positive. default is speeding up"
@@ -426,10 +460,10 @@ class LinearMotionGenerator(BaseGenerator):
     def no_vf_question(self,difficulty):
         "has x, needs a, vi, t -> (for easy, hard only)"
         x, v_i,t,a = self.no_vf_eq_nums(difficulty)
-        noun = random_noun()
+        noun = random_noun(self.rng)
         if difficulty == "Easy":
             "vi = 0, find only x a t"
-            var_dice = random.randint(0,2)
+            var_dice = self.rng.randint(0,2)
             if var_dice == 0: # x
                 question = f"""A {noun}, initially at rest, accelerates at a rate of {a} m/s² for {t} seconds.
                 How far does it go during this time?"""
@@ -447,7 +481,7 @@ class LinearMotionGenerator(BaseGenerator):
                 How big was the acceleration?"""
         elif difficulty == "Medium":
             "non-zero vi but still all positive. find x , vi, a (NOT t)"
-            var_dice = random.randint(0,2)
+            var_dice = self.rng.randint(0,2)
             if var_dice == 0: # x
                 question = f"""A {noun}, initially moving at {v_i} m/s, accelerates at a rate of {a} m/s² for {t} seconds.
                 How far does it go during this time?"""
@@ -466,12 +500,12 @@ class LinearMotionGenerator(BaseGenerator):
         else: # hard
             "mis-matched velocity and acceleration, sometimes?? somehow re-loop in medium?"
             "one in three chance, maybe"
-            medium_chance = random.randint(0,2)
+            medium_chance = self.rng.randint(0,2)
             if medium_chance == 0:
                 question, answer, unit = self.no_vf_question(difficulty)
             else:
                 "find all four"
-                var_dice = random.randint(0,3)
+                var_dice = self.rng.randint(0,3)
                 if var_dice == 0: # x
                     question = f"""A {noun} is initially moving at {v_i} m/s to the right, 
                     but is slowed by an acceleration of {-1*a} m/s² for {t} seconds.
@@ -498,8 +532,20 @@ class LinearMotionGenerator(BaseGenerator):
 
         return question, answer, unit
     
+    def generate_question(self, problem_type, difficulty):
+        if problem_type == "No Time":
+            return self.no_time_question(difficulty)
+        elif problem_type == "No Distance":
+            return self.no_dist_question(difficulty)
+        elif problem_type == "No Acceleration":
+            return self.no_acc_question(difficulty)
+        elif problem_type == "No Final Velocity":
+            return self.no_vf_question(difficulty)
+        else:  # Mixed
+            return self.mixed_question(difficulty)
+
     def mixed_question(self,difficulty):
-        dice = random.randint(0,3)
+        dice = self.rng.randint(0,3)
         if dice == 0:
             question, answer, unit = self.no_time_question(difficulty)
         elif dice == 1:
@@ -508,7 +554,7 @@ class LinearMotionGenerator(BaseGenerator):
             question, answer, unit = self.no_acc_question(difficulty)
         else:
             if difficulty == "Hard":
-                coin = random.randint(0,1)
+                coin = self.rng.randint(0,1)
                 if coin == 0:
                     question, answer, unit = self.no_vf_question("Medium")
                 else:
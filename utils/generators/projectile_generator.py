@@ -1,6 +1,5 @@
 # utils/generators/projectile_generator.py
 import math
-import random
 import sys
 from pathlib import Path
 
@@ -14,29 +13,63 @@ except ImportError:
 
 #from base_generator import BaseGenerator
 from utils.word_lists import random_noun, random_proj_verb # does not need 
+from utils.lazy_imports import lazy_import
+
+# only the batch helpers need numpy, so don't pay for it on import
+np = lazy_import("numpy")
+
+
+# m/n tables keyed by max_val, computed once per process
+_M_N_TABLES = {}
+_M_N_ARRAYS = {}
+
+
+def _build_m_n_table(max_val):
+    m = 5
+    n = 1
+    m_n_list = []
+    while m <= max_val:
+        if math.remainder(m,5) == 0 and n < m:
+            m_n_list.append((m,n))
+            n+=1
+        elif n == m or math.remainder(m,5) != 0:
+            m+=1
+            if math.remainder(m,5) == 0:
+                n = 1
+                m_n_list.append((m,n))
+                n+=1
+            else:
+                m_n_list.append((m,n))
+    return tuple(m_n_list)
 
 
 class ProjectileGenerator(BaseGenerator):
-    def __init__(self):
-        super().__init__(state_prefix="proj_")
+    question_fields = ('question', 'answer', 'answer2', 'unit', 'unit2')
+
+    def __init__(self, rng=None):
+        super().__init__(state_prefix="proj_", rng=rng)
         
+    def warm(self):
+        # only the m/n rows, the NumPy arrays are left for the batch methods to build
+        for difficulty in ("Easy", "Medium", "Hard"):
+            self.m_n_array(self.get_difficulty_range(difficulty))
+
     def m_n_array(self, max_val):
-        m = 5
-        n = 1
-        m_n_list = []
-        while m <= max_val:
-            if math.remainder(m,5) == 0 and n < m:
-                m_n_list.append([m,n])
-                n+=1
-            elif n == m or math.remainder(m,5) != 0:
-                m+=1
-                if math.remainder(m,5) == 0:
-                    n = 1
-                    m_n_list.append([m,n])
-                    n+=1
-                else:
-                    m_n_list.append([m,n])
-        return m_n_list
+        """(m, n) rows for max_val, built on first use and shared by every instance"""
+        table = _M_N_TABLES.get(max_val)
+        if table is None:
+            table = _build_m_n_table(max_val)
+            _M_N_TABLES[max_val] = table
+        return table
+
+    def m_n_table_array(self, max_val):
+        """m_n_array as a read-only (rows, 2) NumPy array, for the batch methods"""
+        table = _M_N_ARRAYS.get(max_val)
+        if table is None:
+            table = np.array(self.m_n_array(max_val))
+            table.flags.writeable = False
+            _M_N_ARRAYS[max_val] = table
+        return table
 
     def get_difficulty_range(self, difficulty):
         if difficulty == "Easy":
@@ -47,7 +80,7 @@ class ProjectileGenerator(BaseGenerator):
 
     def calculate_type1_values(self, difficulty):
         m_n_list = self.m_n_array(self.get_difficulty_range(difficulty))
-        row_choice = random.randint(0, len(m_n_list)-1)
+        row_choice = self.rng.randint(0, len(m_n_list)-1)
         m = m_n_list[row_choice][0]
         n = m_n_list[row_choice][1]
 
@@ -61,7 +94,7 @@ class ProjectileGenerator(BaseGenerator):
 
     def calculate_type2_values(self, difficulty):
         m_n_list = self.m_n_array(self.get_difficulty_range(difficulty))
-        row_choice = random.randint(0, len(m_n_list)-1)
+        row_choice = self.rng.randint(0, len(m_n_list)-1)
         m = m_n_list[row_choice][0]
         n = m_n_list[row_choice][1]
 
@@ -74,8 +107,8 @@ class ProjectileGenerator(BaseGenerator):
         return v_r, theta, d_x, d_y
     
     def calculate_type3_low_high_values(self,difficulty):
-        t_1 = random.randint(1,self.get_difficulty_range(difficulty))
-        n = random.randint(1,self.get_difficulty_range(difficulty))
+        t_1 = self.rng.randint(1,self.get_difficulty_range(difficulty))
+        n = self.rng.randint(1,self.get_difficulty_range(difficulty))
         m = 2*n - 1
         t_2 = t_1 + 5*m
         v_y_i = 5*(2*t_1 + t_2)
@@ -85,7 +118,7 @@ class ProjectileGenerator(BaseGenerator):
         d_y = 5*t_1*t_2
         
         if difficulty == "Hard":
-            t_x = random.randint(t_1,t_2) # time to base of cliff, must be after reaching height first time but before second time
+            t_x = self.rng.randint(t_1,t_2) # time to base of cliff, must be after reaching height first time but before second time
         else: # easy, no setback
             t_x = t_2 #as close as possible to not landing on cliff
         
@@ -99,10 +132,10 @@ class ProjectileGenerator(BaseGenerator):
 
     def calculate_type3_high_low_values(self,difficulty):
         m_n_list = self.m_n_array(self.get_difficulty_range(difficulty))
-        row_choice = random.randint(0, len(m_n_list)-1)
+        row_choice = self.rng.randint(0, len(m_n_list)-1)
         m = m_n_list[row_choice][0]
         n = m_n_list[row_choice][1]
-        c = random.randint(1,self.get_difficulty_range(difficulty))
+        c = self.rng.randint(1,self.get_difficulty_range(difficulty))
 
         v_x = m**2 - n**2
         v_y_i = 2*m*n
@@ -112,7 +145,7 @@ class ProjectileGenerator(BaseGenerator):
         t = 0.2*v_y_i + c # total time
         t_level = int(v_y_i/5) #time to return to starting height
         if difficulty == "Hard":
-            t_x = random.randint(0,t_level) # time for distance from edge of cliff the object is launched, must be before returning to level
+            t_x = self.rng.randint(0,t_level) # time for distance from edge of cliff the object is launched, must be before returning to level
             x_back = v_x*t_x # distance from the edge the the object is launched
         else: # easy, no setback
             t_x = 0
@@ -128,6 +161,65 @@ class ProjectileGenerator(BaseGenerator):
 
 
 
+    def calculate_type3_low_high_batch(self, difficulty, size, rng=None):
+        """Array version of calculate_type3_low_high_values: same formulas, one entry per problem.
+        Returns the same 13 values, each as a length-`size` NumPy array."""
+        rng = np.random.default_rng(self.rng.getrandbits(64)) if rng is None else rng
+        max_val = self.get_difficulty_range(difficulty)
+        t_1 = rng.integers(1, max_val, size, endpoint=True)
+        n = rng.integers(1, max_val, size, endpoint=True)
+        m = 2*n - 1
+        t_2 = t_1 + 5*m
+        v_y_i = 5*(2*t_1 + t_2)
+        v_x = 2*(t_1*t_2 + 25*(n-1))
+        v_r = v_x + 25
+        theta_i = np.round(np.degrees(np.arctan(v_y_i / v_x)), 4)
+        d_y = 5*t_1*t_2
+
+        if difficulty == "Hard":
+            t_x = rng.integers(t_1, t_2, endpoint=True)
+        else: # easy, no setback
+            t_x = t_2.copy()
+
+        d_x = v_x*t_x
+        x_back = v_x*(t_2 - t_x)
+        v_y_f = 5*(2*t_1 - t_2)
+        theta_f = np.abs(np.round(np.degrees(np.arctan(v_y_f / v_x)), 4))
+        v_f = np.round((v_x**2 + v_y_f**2)**0.5, 4)
+        return t_1, t_2, v_x, v_y_i, v_r, theta_i, d_y, t_x, d_x, x_back, v_y_f, v_f, theta_f
+
+    def calculate_type3_high_low_batch(self, difficulty, size, rng=None):
+        """Array version of calculate_type3_high_low_values: same formulas, one entry per problem.
+        Returns the same 13 values, each as a length-`size` NumPy array."""
+        rng = np.random.default_rng(self.rng.getrandbits(64)) if rng is None else rng
+        max_val = self.get_difficulty_range(difficulty)
+        m_n = self.m_n_table_array(max_val)
+        rows = m_n[rng.integers(0, len(m_n), size)]
+        m = rows[:, 0]
+        n = rows[:, 1]
+        c = rng.integers(1, max_val, size, endpoint=True)
+
+        v_x = m**2 - n**2
+        v_y_i = 2*m*n
+        v_r = m**2 + n**2
+        theta_i = np.round(np.degrees(np.arctan(v_y_i / v_x)), 4)
+        d_y = c*(v_y_i + 5*c)
+        t = 0.2*v_y_i + c # total time
+        t_level = (v_y_i/5).astype(int) # time to return to starting height
+        if difficulty == "Hard":
+            t_x = rng.integers(0, t_level, endpoint=True)
+            x_back = v_x*t_x
+        else: # easy, no setback
+            t_x = np.zeros(size, dtype=int)
+            x_back = np.zeros(size, dtype=int)
+
+        d_x = v_x*(t-t_x)
+        v_y_f = v_y_i - 10*t
+        theta_f = np.abs(np.round(np.degrees(np.arctan(v_y_f / v_x)), 4))
+        v_f = np.round((v_x**2 + v_y_f**2)**0.5, 5)
+        return t, t_level, v_x, v_y_i, v_r, theta_i, d_y, t_x, d_x, x_back, v_y_f, v_f, theta_f
+
+
     def generate_question(self, problem_type, difficulty):
         if problem_type == "Type 1":
             return self._generate_type1_question(difficulty)
@@ -139,11 +231,11 @@ class ProjectileGenerator(BaseGenerator):
 
     def _generate_type1_question(self, difficulty):
         v_x, v_r, theta, d_x, d_y = self.calculate_type1_values(difficulty)
-        object_name = random_noun()
-        verb = random_proj_verb()
+        object_name = random_noun(self.rng)
+        verb = random_proj_verb(self.rng)
         
         if difficulty == "Easy":
-            choice = random.randint(1,3)
+            choice = self.rng.randint(1,3)
             answer2 = 0
             unit2 = ""
             if choice == 1:
@@ -159,7 +251,7 @@ class ProjectileGenerator(BaseGenerator):
                 answer = v_x
                 unit = "Initial Velocity (m/s)"
         else:  # Hard
-            choice = random.randint(1,3)
+            choice = self.rng.randint(1,3)
             if choice == 1:
                 question = f"If a {object_name} was {verb} horizontally off of a cliff and lands at {v_r:.2f} m/s at a {theta:.2f} degree angle, how fast was it {verb}, and from how high?"
                 answer = v_x
@@ -183,8 +275,8 @@ class ProjectileGenerator(BaseGenerator):
 
     def _generate_type2_question(self, difficulty):
         v_r, theta, d_x, d_y = self.calculate_type2_values(difficulty)
-        object_name = random_noun()
-        verb = random_proj_verb()
+        object_name = random_noun(self.rng)
+        verb = random_proj_verb(self.rng)
         
         if difficulty == "Easy":
             question = f"If a {object_name} is {verb} at {v_r:.2f} m/s at an angle of {theta:.2f} degrees, how far away does it land, and what is its maximum height?"
@@ -193,7 +285,7 @@ class ProjectileGenerator(BaseGenerator):
             answer2 = d_y
             unit2 = "Maximum Height (m)"
         else:  # Hard
-            choice = random.randint(1,3)
+            choice = self.rng.randint(1,3)
             if choice == 1:
                 question = f"A {verb} {object_name} reaches a maximum height of {d_y:.2f} m and lands {d_x:.2f} m away from where it started. What speed and angle was it launched at?"
                 answer = v_r
@@ -215,16 +307,46 @@ class ProjectileGenerator(BaseGenerator):
         
         return question, answer, answer2, unit, unit2
 
+    def generate_batch(self, problem_type, difficulty, n, seed=None):
+        """generate_batch, with the Type 3 numbers drawn as arrays by the calculate_type3_*_batch methods"""
+        if problem_type != "Type 3":
+            return super().generate_batch(problem_type, difficulty, n, seed)
+        generator = self if seed is None else self.with_rng(seed)
+        rng = generator.rng
+        # noun, verb and direction per question, as _generate_type3_question draws them
+        picks = [(random_noun(rng), random_proj_verb(rng), rng.randint(1,2)) for _ in range(n)]
+        high_low = sum(1 for _, _, direction_choice in picks if direction_choice == 1)
+        # .tolist() gives back Python ints and floats, so the text and answers match the scalar methods'
+        values = {
+            1: zip(*(column.tolist() for column in generator.calculate_type3_high_low_batch(difficulty, high_low))),
+            2: zip(*(column.tolist() for column in generator.calculate_type3_low_high_batch(difficulty, n - high_low))),
+        }
+        columns = {field: [] for field in self.question_fields}
+        appenders = [columns[field].append for field in self.question_fields]
+        for object_name, verb, direction_choice in picks:
+            question = generator._type3_question(difficulty, object_name, verb, direction_choice,
+                                                 next(values[direction_choice]))
+            for append, value in zip(appenders, question):
+                append(value)
+        return columns
+
     def _generate_type3_question(self, difficulty):
 
-        object_name = random_noun()
-        verb = random_proj_verb()
+        object_name = random_noun(self.rng)
+        verb = random_proj_verb(self.rng)
+
+        direction_choice = self.rng.randint(1,2)
+        if direction_choice == 1: # high to low
+            values = self.calculate_type3_high_low_values(difficulty)
+        else: # low to high
+            values = self.calculate_type3_low_high_values(difficulty)
+        return self._type3_question(difficulty, object_name, verb, direction_choice, values)
 
-        direction_choice = random.randint(1,2)
+    def _type3_question(self, difficulty, object_name, verb, direction_choice, values):
         if direction_choice == 1: # high to low
-            t, t_level, v_x, v_y_i, v_r, theta_i, d_y, t_x, d_x, x_back, v_y_f, v_f, theta_f = self.calculate_type3_high_low_values(difficulty)
+            t, t_level, v_x, v_y_i, v_r, theta_i, d_y, t_x, d_x, x_back, v_y_f, v_f, theta_f = values
             if difficulty == "Easy": # no setback from cliff edge
-                choice = 1 #random.randint(1,3) # room for more variations
+                choice = 1 #self.rng.randint(1,3) # room for more variations
                 if choice == 1:
                     question = f"""A {object_name} is {verb} off a {d_y} m high cliff at a {theta_i} degree angle 
                     at {v_r} m/s. How far away from the base of the cliff does this {object_name} land, 
@@ -234,22 +356,22 @@ class ProjectileGenerator(BaseGenerator):
                     answer2 = v_f
                     unit2 = "Final (Impact) Velocity (m/s)"
             else: # hard: setback, add more options later
-                choice = 1 #random.randint(1,3) # room for more variations
+                choice = 1 #self.rng.randint(1,3) # room for more variations
                 if choice == 1:
                     question = f"""A {object_name} is {verb} off a {d_y} m high cliff at {v_r} m/s at a {theta_i} 
                     degree angle. It lands {d_x} m away from the base of the cliff. 
                     How far back from the cliff's edge was it {verb}, 
                     and at what time after it was launched was it again at the height of the cliff?"""
-                    answer = {x_back}
+                    answer = x_back
                     unit = "Launch-to-cliff Distance (m)"
                     answer2 = t_level
                     unit2 = "Time to return to same Height (s)"
 
         else: # low to high
-            t_1, t_2, v_x, v_y_i, v_r, theta_i, d_y, t_x, d_x, x_back, v_y_f, v_f, theta_f = self.calculate_type3_low_high_values(difficulty)
+            t_1, t_2, v_x, v_y_i, v_r, theta_i, d_y, t_x, d_x, x_back, v_y_f, v_f, theta_f = values
             #thing lands near edge of cliff, minimum inroad
             if difficulty == "Easy":
-                choice = random.randint(1,2) # room for more variations
+                choice = self.rng.randint(1,2) # room for more variations
                 if choice == 1: # give height velocity and angle, ask for distance and final angle
                     question = f"""A group of people are trying to get a {object_name} to land 
                     on top a {d_y} m high cliff. They {verb} it at {v_r} m/s at a {theta_i} degree angle. It 
@@ -269,7 +391,7 @@ class ProjectileGenerator(BaseGenerator):
                     answer2 = v_f
                     unit2 = "Landing Velocity (m/s)"
             else: # hard, setback, doesn't land on edge
-                choice = 1 #random.randint(1,2) # more room for variations
+                choice = 1 #self.rng.randint(1,2) # more room for variations
                 if choice == 1: # gives t_1 height and v_r to find angle, dist from edge to find dist from base
                     question = f"""A {object_name} is {verb} to get it on top of a {d_y} m cliff. 
                     It was initially {verb} at {v_r} m/s, and first reaches the cliff height after {t_1} seconds.
@@ -0,0 +1,158 @@
+"""Position-time and velocity-time graphs for the graphing practice.
+
+A graph is a GraphSpec: its kind, graph type, curve coefficients and style, a few small
+values that are all a session keeps. The PNG for a spec is drawn on demand and cached
+for the whole process, and there are only four shapes per kind of graph, so each one is
+drawn once and handed out as the same bytes to every session after that. Figures are
+built with matplotlib.figure.Figure rather than pyplot, so nothing is left registered
+with pyplot and no figure outlives its render.
+
+warm_cache() draws every graph once; the app calls it once per process when the Match
+Graphs screen is first opened, so after that a screen of several graphs costs no renders.
+"""
+import io
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+mpl_figure = lazy_import("matplotlib.figure")
+mpl_style = lazy_import("matplotlib.style")
+
+# Use a dark background for matplotlib so it fits a "dark mode" style
+DEFAULT_STYLE = "dark_background"
+
+# kind -> how the graph is drawn, plus its shapes:
+#   graph_type -> (curve coefficients (a, b, c) for a*t^2 + b*t + c, correct direction, correct motion state)
+GRAPH_KINDS = {
+    "position": {
+        "title": "Position-Time Graph",
+        "ylabel": "Position (m)",
+        "color": "cyan",
+        "variants": {
+            "linear_positive": ((0, 2, 1), "Forward", "Constant Velocity"),         # slope > 0, constant velocity
+            "linear_negative": ((0, -1.5, 5), "Backward", "Constant Velocity"),     # slope < 0, constant velocity
+            "acceleration_positive": ((1, 0, 0), "Forward", "Accelerating (positive)"),  # slope increasing over time
+            "acceleration_negative": ((-0.5, 0, 5), "Backward", "Accelerating (negative)"),
+        },
+    },
+    "velocity": {
+        "title": "Velocity-Time Graph",
+        "ylabel": "Velocity (m/s)",
+        "color": "orange",
+        "variants": {
+            "constant_positive": ((0, 0, 2), "Forward", "Constant Velocity"),      # constant velocity > 0
+            "constant_negative": ((0, 0, -1.5), "Backward", "Constant Velocity"),  # constant velocity < 0
+            "increasing_positive": ((0, 1, 0), "Forward", "Accelerating (positive)"),                # starts at 0, increasing
+            "decreasing_negative": ((0, -0.5, -1), "Backward", "Accelerating (negative)"),    # negative, becoming more negative
+        },
+    },
+}
+
+RENDER_CACHE_SIZE = 64  # far more than the 8 graphs there are, but keeps odd specs from piling up
+
+# everything needed to draw one graph; plain strings and numbers, so it's cheap to keep in session state
+GraphSpec = namedtuple('GraphSpec', ['kind', 'graph_type', 'coefficients', 'style'])
+
+# matplotlib isn't thread-safe and every session runs on its own thread
+_render_lock = threading.Lock()
+
+# spec -> PNG bytes, least recently used first; shared by every session
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def graph_types(kind):
+    """The graph types available for `kind` ("position" or "velocity")"""
+    return list(GRAPH_KINDS[kind]["variants"])
+
+
+def graph_answers(kind, graph_type):
+    """(direction, motion_state) a student should read off this graph"""
+    _, direction, motion_state = GRAPH_KINDS[kind]["variants"][graph_type]
+    return direction, motion_state
+
+
+def graph_spec(kind, graph_type, style=DEFAULT_STYLE):
+    coefficients, _, _ = GRAPH_KINDS[kind]["variants"][graph_type]
+    return GraphSpec(kind, graph_type, coefficients, style)
+
+
+def random_graph(kind, rng):
+    """Spec for a graph of a random type of `kind`, drawn from `rng` (e.g. a session_rng)"""
+    return graph_spec(kind, rng.choice(graph_types(kind)))
+
+
+def spec_answers(spec):
+    """(direction, motion_state) for the graph `spec` draws"""
+    return graph_answers(spec.kind, spec.graph_type)
+
+
+def render_graph(kind, graph_type, style=DEFAULT_STYLE):
+    """PNG bytes for one graph; drawn on the first call, cached for the process after that"""
+    return render(graph_spec(kind, graph_type, style))
+
+
+def _cached(spec):
+    with _cache_lock:
+        png = _cache.get(spec)
+        if png is not None:
+            _cache.move_to_end(spec)
+        return png
+
+
+def _store(spec, png):
+    with _cache_lock:
+        _cache[spec] = png
+        _cache.move_to_end(spec)
+        while len(_cache) > RENDER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def render(spec):
+    """PNG bytes for `spec`, shared by every session that shows the same graph"""
+    png = _cached(spec)
+    if png is None:
+        with _render_lock:
+            png = _draw(spec)
+        _store(spec, png)
+    return png
+
+
+def render_many(specs):
+    """PNG bytes for each of `specs`, e.g. every graph on the match screen"""
+    return [render(spec) for spec in specs]
+
+
+def _draw(spec):
+    """Actually draw `spec`; callers hold _render_lock"""
+    kind = GRAPH_KINDS[spec.kind]
+    with mpl_style.context(spec.style):
+        fig = mpl_figure.Figure(figsize=(3, 2))  # Smaller figure size
+        ax = fig.subplots()
+        t = np.linspace(0, 5, 100)
+
+        ax.plot(t, np.polyval(spec.coefficients, t), color=kind["color"])
+        ax.set_xlabel("Time (s)", color="white")
+        ax.set_ylabel(kind["ylabel"], color="white")
+        ax.set_title(kind["title"], color="white")
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white')
+
+        fig.tight_layout()
+
+        # same output settings st.pyplot uses, so the graphs look as they did before
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def warm_cache(style=DEFAULT_STYLE):
+    """Render every graph up front, e.g. before the first student asks for one"""
+    for kind in GRAPH_KINDS:
+        for graph_type in graph_types(kind):
+            render(graph_spec(kind, graph_type, style))
@@ -0,0 +1,160 @@
+"""Deferred imports for the heavy libraries (sympy, numpy, pandas, matplotlib).
+
+Pages and helpers do
+
+    from utils.lazy_imports import lazy_import
+    np = lazy_import("numpy")
+
+at the top, and numpy is only imported the first time something reads an attribute
+off `np`. How long each of those first imports took is kept in import_times().
+
+Run this file to get an import-time budget report: it cold-starts each page in a
+fresh interpreter (via streamlit's AppTest) and lists how long the first render
+took and which heavy libraries it ended up loading.
+
+    python utils/lazy_imports.py                 # every page
+    python utils/lazy_imports.py Home.py --budget 0.5
+"""
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+HEAVY_MODULES = ('sympy', 'numpy', 'pandas', 'matplotlib', 'pyarrow')
+DEFAULT_BUDGET = 1.0  # seconds for a page's first render, streamlit itself not included
+
+_import_times = {}
+_proxies = {}
+_lock = threading.RLock()
+
+
+class LazyModule:
+    """Stands in for a module until an attribute is first read from it"""
+
+    def __init__(self, name):
+        object.__setattr__(self, '_lazy_name', name)
+        object.__setattr__(self, '_lazy_module', None)
+
+    def _load(self):
+        module = self._lazy_module
+        if module is not None:
+            return module
+        with _lock:
+            if self._lazy_module is None:
+                name = self._lazy_name
+                already_loaded = name in sys.modules
+                start = time.perf_counter()
+                module = importlib.import_module(name)
+                if not already_loaded:
+                    _import_times[name] = time.perf_counter() - start
+                # after this, attribute reads are plain dict hits instead of __getattr__ calls
+                self.__dict__.update(module.__dict__)
+                object.__setattr__(self, '_lazy_module', module)
+            return self._lazy_module
+
+    def __getattr__(self, attr):
+        # only reached for names not copied over yet, e.g. submodules imported later
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+        self.__dict__[attr] = value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        if self._lazy_module is None:
+            return f"<lazy module '{self._lazy_name}' (not loaded)>"
+        return repr(self._lazy_module)
+
+
+def lazy_import(name):
+    """A shared LazyModule for `name` (e.g. "sympy", "matplotlib.pyplot")"""
+    with _lock:
+        if name not in _proxies:
+            _proxies[name] = LazyModule(name)
+        return _proxies[name]
+
+
+def is_loaded(name):
+    return name in sys.modules
+
+
+def import_times():
+    """{module name: seconds} for each lazy module this process has actually imported"""
+    with _lock:
+        return dict(_import_times)
+
+
+# ----------------------------------------------------------------------
+# Budget report
+# ----------------------------------------------------------------------
+
+ROOT = Path(__file__).parent.parent
+
+# runs in a fresh interpreter per page so every page gets a genuinely cold start
+_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+at = AppTest.from_file({page!r}, default_timeout=120).run()
+elapsed = time.perf_counter() - start
+lazy = sys.modules.get('utils.lazy_imports')
+print(json.dumps({{
+    'seconds': elapsed,
+    'errors': len(at.exception),
+    'heavy': [m for m in {heavy!r} if m in sys.modules],
+    'lazy_times': lazy.import_times() if lazy else {{}},
+}}))
+"""
+
+
+def default_pages():
+    return [ROOT / 'Home.py'] + sorted((ROOT / 'pages').glob('*.py'))
+
+
+def probe_page(page):
+    """Cold-start one page in a subprocess and return what it loaded and how long it took"""
+    code = _PROBE.format(root=str(ROOT), page=str(page), heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} failed to start:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def budget_report(pages=None, budget=DEFAULT_BUDGET):
+    """Print one line per page; returns True if every page came in under budget"""
+    pages = [Path(page) for page in pages] if pages else default_pages()
+    all_ok = True
+    print(f"{'page':40} {'first render':>12}  heavy imports")
+    for page in pages:
+        stats = probe_page(page)
+        ok = stats['seconds'] <= budget and not stats['errors']
+        all_ok = all_ok and ok
+        heavy = ', '.join(stats['heavy']) or '-'
+        lazy = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in stats['lazy_times'].items())
+        flag = '' if ok else '  OVER BUDGET' if not stats['errors'] else '  ERRORS'
+        print(f"{page.name:40} {stats['seconds']:>11.2f}s  {heavy}{flag}")
+        if lazy:
+            print(f"{'':40} {'':>12}  lazily imported: {lazy}")
+    return all_ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import budget for each page")
+    parser.add_argument('pages', nargs='*', help="page files (default: Home.py and pages/*.py)")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help="seconds allowed for a page's first render (default: %(default)s)")
+    args = parser.parse_args(argv)
+    sys.exit(0 if budget_report(args.pages, args.budget) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""The "Your Performance" table on the practice pages.
+
+Counts are kept per (problem type, difficulty), and each row of the table is kept
+already formatted. Recording an attempt reformats just that row, and the table's
+markdown is only put back together the first time it's shown after an attempt, so
+reruns in between (typing an answer, switching tabs) reuse the same string. Nothing
+here needs pandas.
+"""
+
+EMPTY_CELL = "0/0 (0.0%)"
+
+
+def format_cell(attempts, correct):
+    """e.g. "3/4 (75.0%)" """
+    if attempts > 0:
+        return f"{correct}/{attempts} ({correct / attempts * 100:.1f}%)"
+    return EMPTY_CELL
+
+
+class PerformanceTable:
+    """Attempts and correct answers for one page, laid out problem type x difficulty"""
+
+    def __init__(self, problem_types, difficulties):
+        # rows sorted by problem type, the same order the old pivoted DataFrame showed them in
+        self.problem_types = sorted(problem_types)
+        self.difficulties = list(difficulties)
+        self.counts = {p_type: {diff: {'attempts': 0, 'correct': 0} for diff in self.difficulties}
+                       for p_type in self.problem_types}
+        self._rows = {p_type: self._format_row(p_type) for p_type in self.problem_types}
+        self._markdown = None
+
+    def __contains__(self, problem_type):
+        return problem_type in self.counts
+
+    def __getitem__(self, problem_type):
+        return self.counts[problem_type]
+
+    def items(self):
+        return self.counts.items()
+
+    def _format_row(self, problem_type):
+        cells = [format_cell(**self.counts[problem_type][diff]) for diff in self.difficulties]
+        return f"| {problem_type} | " + " | ".join(cells) + " |"
+
+    def set_counts(self, problem_type, difficulty, attempts, correct):
+        """Overwrite one cell, e.g. with counts restored from the attempt store"""
+        stats = self.counts.get(problem_type, {}).get(difficulty)
+        if stats is None:
+            return
+        stats['attempts'] = attempts
+        stats['correct'] = correct
+        self._rows[problem_type] = self._format_row(problem_type)
+        self._markdown = None
+
+    def record(self, problem_type, difficulty, is_correct):
+        """Count one answered question"""
+        stats = self.counts[problem_type][difficulty]
+        stats['attempts'] += 1
+        if is_correct:
+            stats['correct'] += 1
+        self._rows[problem_type] = self._format_row(problem_type)
+        self._markdown = None
+
+    def to_markdown(self):
+        """The table as markdown, rebuilt only after the counts have changed"""
+        if self._markdown is None:
+            header = "| Problem Type | " + " | ".join(self.difficulties) + " |"
+            divider = "|---" * (len(self.difficulties) + 1) + "|"
+            self._markdown = "\n".join([header, divider] + [self._rows[p_type] for p_type in self.problem_types])
+        return self._markdown
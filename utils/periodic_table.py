@@ -0,0 +1,165 @@
+"""Element and polyatomic ion data for the compound pages.
+
+Loaded once per process and shared by both compound pages and the compound index
+(utils/generators/compound_generator.py). Elements and ions are small namedtuple records,
+and the category sets and selectbox option lists are built here once, so a page rerun
+doesn't sort or filter anything.
+"""
+from collections import namedtuple
+
+Element = namedtuple('Element', ['symbol', 'name', 'period', 'group', 'charges', 'anion'])
+PolyatomicIon = namedtuple('PolyatomicIon', ['name', 'charges', 'formula'])
+
+element_dict = {e.symbol: e for e in [
+    #"Period 1"
+    Element('H', 'Hydrogen', 1, 1, (1,), 'hydride'),
+    
+    #"Period 2"
+    Element('Li', 'Lithium', 2, 1, (1,), None),
+    Element('Be', 'Beryllium', 2, 2, (2,), None),
+    Element('B', 'Boron', 2, 13, (-3,), 'boride'),
+    Element('C', 'Carbon', 2, 14, (-4,), 'carbide'),
+    Element('N', 'Nitrogen', 2, 15, (-3,), 'nitride'),
+    Element('O', 'Oxygen', 2, 16, (-2,), 'oxide'),
+    Element('F', 'Fluorine', 2, 17, (-1,), 'fluoride'),
+
+    #"Period 3"
+    Element('Na', 'Sodium', 3, 1, (1,), None),
+    Element('Mg', 'Magnesium', 3, 2, (2,), None),
+    Element('Al', 'Aluminum', 3, 13, (3,), 'aluminide'),
+    Element('Si', 'Silicon', 3, 14, (-4,), 'silicide'),
+    Element('P', 'Phosphorus', 3, 15, (-3,), 'phosphide'),
+    Element('S', 'Sulfur', 3, 16, (-2,), 'sulfide'),
+    Element('Cl', 'Chlorine', 3, 17, (-1,), 'chloride'),
+
+    #"Period 4"
+    Element('K', 'Potassium', 4, 1, (1,), None),
+    Element('Ca', 'Calcium', 4, 2, (2,), None),
+    #transition metal block 1 start
+    Element('Sc', 'Scandium', 4, 3, (3,), None),
+    Element('Ti', 'Titanium', 4, 4, (4, 3), None),
+    Element('V', 'Vanadium', 4, 5, (5, 4, 3, 2), None),
+    Element('Cr', 'Chromium', 4, 6, (6, 3, 2), None),
+    Element('Mn', 'Manganese', 4, 7, (7, 4, 2), None),
+    Element('Fe', 'Iron', 4, 8, (3, 2), None),
+    Element('Co', 'Cobalt', 4, 9, (3, 2), None),
+    Element('Ni', 'Nickel', 4, 10, (2,), None),
+    Element('Cu', 'Copper', 4, 11, (2, 1), None),
+    Element('Zn', 'Zinc', 4, 12, (2,), None),
+    #transition metal block 1 end
+    Element('Ga', 'Gallium', 4, 13, (3,), None),
+    Element('Ge', 'Germanium', 4, 14, (4,), None),
+    Element('As', 'Arsenic', 4, 15, (-3,), 'arsenide'),
+    Element('Se', 'Selenium', 4, 16, (-2,), 'selenide'),
+    Element('Br', 'Bromine', 4, 17, (-1,), 'bromide'),
+
+    #"Period 5"
+    Element('Rb', 'Rubidium', 5, 1, (1,), None),
+    Element('St', 'Strontium', 5, 2, (2,), None),
+     #transition metal block 2 start
+    Element('Y', 'Yttrium', 5, 3, (3,), None),
+    Element('Zr', 'Zirconium', 5, 4, (4,), None),
+    Element('Nb', 'Niobium', 5, 5, (5, 3), None),
+    Element('Mo', 'Molybdenum', 5, 6, (6, 3), None),
+    Element('Tc', 'Technetium', 5, 7, (6,), None),
+    Element('Ru', 'Ruthenium', 5, 8, (8, 4, 3), None),
+    Element('Rh', 'Rhodium', 5, 9, (4,), None),
+    Element('Pd', 'Palladium', 5, 10, (4, 2), None),
+    Element('Ag', 'Silver', 5, 11, (1,), None),
+    Element('Cd', 'Cadmium', 5, 12, (2,), None),
+    #transition metal block 2 end
+    Element('In', 'Indium', 5, 13, (3,), None),
+    Element('Sn', 'Tin', 5, 14, (4, 2), None),
+    Element('Sb', 'Antimony', 5, 15, (-3,), 'antimide'),
+    Element('Te', 'Tellurium', 5, 16, (-2,), 'telluride'),
+    Element('I', 'Iodine', 5, 17, (-1,), 'iodide'),
+
+    #"Period 6"
+    Element('Cs', 'Cesium', 6, 1, (1,), None),
+    Element('Ba', 'Barium', 6, 2, (2,), None),
+    #transition metal block 3 start (we are skipping Lanthanides and Actinides, yeah?)
+    Element('Hf', 'Hafnium', 6, 4, (4,), None),
+    Element('Ta', 'Tantalum', 6, 5, (5,), None),
+    Element('W', 'Tungsten', 6, 6, (6,), None),
+    Element('Re', 'Rhenium', 6, 7, (7, 6, 4, 2), None),
+    Element('Os', 'Osmium', 6, 8, (6, 4, 3), None),
+    Element('Ir', 'Iridium', 6, 9, (6, 4, 3), None),
+    Element('Pt', 'Platinum', 6, 10, (6, 4, 2), None),
+    Element('Au', 'Gold', 6, 11, (3, 2, 1), None),
+    Element('Hg', 'Mercury', 6, 12, (2, 1), None),
+    #transition metal block 3 end
+    Element('Tl', 'Thallium', 6, 13, (3, 1), None),
+    Element('Pb', 'Lead', 6, 14, (4, 2), None),
+    Element('Bi', 'Bismuth', 6, 15, (-3,), 'bismide'),
+    Element('Po', 'Polonium', 6, 16, (-2,), 'polonide'),
+    Element('At', 'Astatine', 6, 17, (-1,), 'astatide'),
+]}
+
+metals = frozenset({'Zn', 'Rh', 'Tc', 'Na', 'Ru', 'Mo', 'Ge', 'Sn', 
+          'Ca', 'Cu', 'Y', 'Nb', 'Pd', 'Ag', 'In', 'Pt', 
+          'W', 'Pb', 'Rb', 'V', 'Fe', 'Cd', 'Cs', 'Hg', 
+          'Tl', 'Mn', 'Os', 'St', 'Ir', 'Ta', 'Sc', 'Ba', 
+          'Hf', 'Ga', 'Mg', 'Co', 'Ni', 'Ti', 'Li', 'Cr', 
+          'Au', 'K', 'Be', 'Zr', 'Re'})
+
+nonmetals = frozenset({'Br', 'Al', 'Te', 'F', 'Sb', 'Bi', 'N', 'At', 
+             'B', 'Po', 'Se', 'Cl', 'I', 'Si', 'S', 'O', 
+             'H', 'C', 'P', 'As'})
+
+covalent = frozenset({'H','C','N','B','O','S','Cl','F','P','Se','Br','I'})
+
+prefixes = {
+    1: 'mono', 2: 'di', 3: 'tri', 4: 'tetra', 5: 'penta',
+    6: 'hexa', 7: 'hepta', 8: 'octa', 9: 'nona', 10: 'deca'
+}
+
+oxygen_prefixes = {
+    1: 'mon', 2: 'di', 3: 'tri', 4: 'tetr', 5: 'pent',
+    6: 'hex', 7: 'hept', 8: 'oct', 9: 'non', 10: 'dec'
+}
+
+roman_numerals = {1: '(I)', 2: '(II)', 3: '(III)', 4: '(IV)', 5: '(V)', 6: '(VI)', 7: '(VII)', 8: '(VIII)', 9: '(IX)', 10: '(X)'}
+
+polyatomic_ions = {ion.name: ion for ion in [
+    PolyatomicIon('ammonium', (1,), r"\text{N} \, \text{H}_4"),
+    PolyatomicIon('acetate', (-1,), r"\text{C}_2 \, \text{H}_3 \, \text{O}_2"),
+    PolyatomicIon('bicarbonate', (-1,), r"\text{H} \, \text{C} \, \text{O}_3"),
+    PolyatomicIon('bisulfate', (-1,), r"\text{H} \, \text{S} \, \text{O}_4"),
+    PolyatomicIon('chlorate', (-1,), r"\text{Cl} \, \text{O}_2"),
+    PolyatomicIon('citrate', (-1,), r"\text{H}_2 \, \text{C}_6 \, \text{H}_5 \, \text{O}_7"),
+    PolyatomicIon('cyanide', (-1,), r"\text{C} \, \text{N}"),
+    PolyatomicIon('hydroxide', (-1,), r"\text{O} \, \text{H}"),
+    PolyatomicIon('nitrate', (-1,), r"\text{N} \, \text{O}_3"),
+    PolyatomicIon('nitrite', (-1,), r"\text{N} \, \text{O}_2"),
+    PolyatomicIon('perchlorate', (-1,), r"\text{Cl} \, \text{O}_4"),
+    PolyatomicIon('permanganate', (-1,), r"\text{Mn} \, \text{O}_4"),
+    PolyatomicIon('thiocyanate', (-1,), r"\text{S} \, \text{C} \, \text{N}"),
+    PolyatomicIon('carbonate', (-2,), r"\text{C} \, \text{O}_3"),
+    PolyatomicIon('chromate', (-2,), r"\text{Cr} \, \text{O}_4"),
+    PolyatomicIon('dichromate', (-2,), r"\text{Cr}_2 \, \text{O}_7"),
+    PolyatomicIon('sulfate', (-2,), r"\text{S} \, \text{O}_4"),
+    PolyatomicIon('sulfite', (-2,), r"\text{S} \, \text{O}_3"),
+    PolyatomicIon('borate', (-3,), r"\text{B} \, \text{O}_3"),
+    PolyatomicIon('phosphate', (-3,), r"\text{P} \, \text{O}_4"),
+]}
+
+# --- derived sets ---
+
+# nonmetals that form a monatomic anion (the only ones that can be named "-ide")
+anion_formers = frozenset(e for e in nonmetals if element_dict[e].anion is not None)
+# metals whose name needs a Roman numeral
+multi_charge_metals = frozenset(e for e in metals if len(element_dict[e].charges) > 1)
+
+
+# --- selectbox options for the formula explorer, sorted by element name ---
+
+def _by_name(symbols):
+    return tuple(sorted(symbols, key=lambda e: element_dict[e].name))
+
+covalent_options = _by_name(covalent)
+# the second covalent element can be anything but the first
+covalent_partner_options = {e: tuple(o for o in covalent_options if o != e) for e in covalent}
+metal_options = _by_name(metals)
+anion_options = _by_name(anion_formers)
+metal_charge_options = {e: tuple(sorted(element_dict[e].charges)) for e in metals}
+polyatomic_anion_options = tuple(sorted(name for name in polyatomic_ions if name != 'ammonium'))
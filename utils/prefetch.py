@@ -0,0 +1,88 @@
+"""Background question prefetching for the practice pages.
+
+Each session keeps a small queue of ready-made questions per (problem type, difficulty),
+refilled by a process-wide thread pool, so "New Question" only has to pop one.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+PREFETCH_SIZE = 3
+
+logger = logging.getLogger(__name__)
+
+# shared by every session in the process
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="question_prefetch")
+
+
+class QuestionQueue:
+    """Bounded queue of ready questions for one session and one key"""
+
+    def __init__(self, maxsize=PREFETCH_SIZE):
+        self.questions = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._refilling = False
+        # held around each generate_fn call and the put that follows it, so a session's
+        # random stream is drawn from one thread at a time, in the order questions are served
+        self._generating = threading.Lock()
+
+    def refill(self, generate_fn):
+        """Top the queue up in the background, unless a refill is already running"""
+        with self._lock:
+            if self._refilling or self.questions.full():
+                return
+            self._refilling = True
+        _executor.submit(self._fill, generate_fn)
+
+    def _fill(self, generate_fn):
+        # runs on a pool thread: generate_fn must not touch st.session_state
+        try:
+            while not self.questions.full():
+                with self._generating:
+                    self.questions.put_nowait(generate_fn())
+        except queue.Full:
+            pass
+        except Exception:
+            # nobody reads the pool's futures, so log it here; pop() still generates inline
+            logger.exception("couldn't prefetch a question, stopping this refill")
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def pop(self, generate_fn):
+        """Take a ready question, generating one inline only if the queue is still empty"""
+        try:
+            question = self.questions.get_nowait()
+        except queue.Empty:
+            # a refill may be partway through a question: wait for it rather than draw alongside it
+            with self._generating:
+                try:
+                    question = self.questions.get_nowait()
+                except queue.Empty:
+                    question = generate_fn()
+        self.refill(generate_fn)
+        return question
+
+
+def get_queue(prefix, key):
+    """This session's queue for `key`, created on first use"""
+    if f"{prefix}_prefetch" not in st.session_state:
+        st.session_state[f"{prefix}_prefetch"] = {}
+    queues = st.session_state[f"{prefix}_prefetch"]
+    if key not in queues:
+        queues[key] = QuestionQueue()
+    return queues[key]
+
+
+def next_question(prefix, key, generate_fn):
+    """Next question for `key` (e.g. (problem_type, difficulty)) in this session.
+    generate_fn takes no arguments and builds one question."""
+    return get_queue(prefix, key).pop(generate_fn)
+
+
+def warm(prefix, key, generate_fn):
+    """Start filling the queue for `key` without taking anything from it"""
+    get_queue(prefix, key).refill(generate_fn)
@@ -0,0 +1,151 @@
+"""Opt-in timings of where a page's reruns spend their time.
+
+Off unless the app is started with RERUN_TIMINGS=1, and when it's off every helper here
+hands back the undecorated function (or an empty context manager), so pages pay nothing.
+When on, each page times its phases:
+
+    timer = rerun_timings.PageTimer("Energy")
+
+    @timer.timed("generate")
+    def generate_question(...): ...
+
+    with timer.phase("render"):
+        st.latex(...)
+
+and every duration goes into a per-(page, phase) histogram shared by the whole process.
+The histograms are shown on the hidden diagnostics page (/diagnostics) and can be dumped
+as a flat, sorted TSV to diff between deployments: from that page, with dump(path), or
+automatically at exit with RERUN_TIMINGS_FILE=path.
+"""
+import atexit
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get("RERUN_TIMINGS", "") not in ("", "0")
+DUMP_PATH = os.environ.get("RERUN_TIMINGS_FILE")
+
+# histogram bucket upper bounds in milliseconds, the last bucket catches everything slower
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+
+class Histogram:
+    """Counts of durations per bucket, plus the exact count, total and max"""
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket the q-th quantile falls in (the max for the open bucket)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def copy(self):
+        clone = Histogram()
+        clone.buckets = list(self.buckets)
+        clone.count, clone.total_ms, clone.max_ms = self.count, self.total_ms, self.max_ms
+        return clone
+
+
+# (page, phase) -> Histogram, for the whole process
+_histograms = {}
+_lock = threading.Lock()
+
+
+def record(page, phase, ms):
+    with _lock:
+        histogram = _histograms.get((page, phase))
+        if histogram is None:
+            histogram = _histograms[(page, phase)] = Histogram()
+        histogram.add(ms)
+
+
+def snapshot():
+    """A consistent copy of every histogram, {(page, phase): Histogram}"""
+    with _lock:
+        return {key: histogram.copy() for key, histogram in _histograms.items()}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+@contextmanager
+def _timing(page, phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(page, phase, (time.perf_counter() - start) * 1000)
+
+
+class PageTimer:
+    """Times the phases of one page; does nothing at all unless RERUN_TIMINGS is set"""
+
+    def __init__(self, page):
+        self.page = page
+
+    def phase(self, name):
+        """Context manager timing the block it wraps as `name`"""
+        return _timing(self.page, name) if ENABLED else nullcontext()
+
+    def timed(self, name):
+        """Decorator timing every call of the function as `name`"""
+        def decorate(fn):
+            if not ENABLED:
+                return fn
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with _timing(self.page, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+
+# --- flat file ---
+
+COLUMNS = ("page", "phase", "count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+
+
+def to_tsv(histograms=None):
+    """One sorted line per (page, phase), so two dumps diff line by line"""
+    histograms = snapshot() if histograms is None else histograms
+    lines = ["\t".join(COLUMNS)]
+    for (page, phase), h in sorted(histograms.items()):
+        lines.append("\t".join([page, phase, str(h.count)] + [
+            f"{value:.3f}" for value in (h.mean_ms, h.quantile(0.5), h.quantile(0.9), h.quantile(0.99), h.max_ms)]))
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    with open(path, "w") as f:
+        f.write(to_tsv())
+
+
+if ENABLED and DUMP_PATH:
+    atexit.register(dump, DUMP_PATH)
@@ -1,3 +1,5 @@
+import random
+
 
 objects = ["cactus","turtle","bowl of soup","block of ice","barrel of monkeys",
            "statue","boulder","Toyota Camry","washing machine","vacant doghouse","baseball","basketball",
@@ -13,10 +15,8 @@ proj_verbs = ["catapulted","cannon-fired","launched","chucked","thrown","propell
               "heaved","set into motion","put into flight","sent skyward"
               ]
 
-def random_noun():
-    import random
-    return random.choice(objects)
+def random_noun(rng=random):
+    return rng.choice(objects)
 
-def random_proj_verb():
-    import random
-    return random.choice(proj_verbs)
\ No newline at end of file
+def random_proj_verb(rng=random):
+    return rng.choice(proj_verbs)
\ No newline at end of file
@@ -0,0 +1,356 @@
+"""Worksheets: any number of problems from any generator, as CSV, JSONL or a printable PDF.
+
+Every export is two files, the worksheet and its answer key, matched up by problem number:
+
+    python utils/worksheet_export.py energy -n 1000                  # exports/energy.csv, exports/energy_answers.csv
+    python utils/worksheet_export.py projectile -n 100000 --format jsonl --seed 7
+    python utils/worksheet_export.py compounds -n 200 --format pdf --types ionic covalent
+    python utils/worksheet_export.py algebra -n 50 --format pdf --difficulties easy medium
+
+Problems are generated a batch at a time through each generator's generate_batch and
+written one at a time (a PDF one page at a time), so memory stays flat however many are
+asked for, and the same --seed gives the same worksheet.
+The Worksheet Export page does the same from the app.
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import textwrap
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, namedtuple
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import algebra_helpers
+from utils.algebra_backend import sp
+from utils.lazy_imports import lazy_import
+from utils.generators.linear_motion_generator import LinearMotionGenerator
+from utils.generators.projectile_generator import ProjectileGenerator
+from utils.generators.collision_generator import CollisionGenerator
+from utils.generators.energy_generator import EnergyGenerator
+from utils.generators.algebra_generator import AlgebraGenerator, DIFFICULTIES as ALGEBRA_DIFFICULTIES
+from utils.generators.compound_generator import CompoundGenerator, CATEGORIES as COMPOUND_CATEGORIES, formula_text
+
+mpl = lazy_import("matplotlib")
+mpl_figure = lazy_import("matplotlib.figure")
+mpl_pdf = lazy_import("matplotlib.backends.backend_pdf")
+
+EXPORT_DIR = Path(__file__).parent.parent / "exports"
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+BATCH_SIZE = 1000    # problems drawn per round, so memory stays flat
+
+# columns of the worksheet and of its answer key
+WORKSHEET_FIELDS = ('number', 'source', 'problem_type', 'difficulty', 'question', 'unit', 'unit2')
+KEY_FIELDS = ('number', 'answer', 'unit', 'answer2', 'unit2')
+
+
+# --- batches of problems from each generator, as {question, answer, unit, answer2, unit2} ---
+# each source builds a batch(problem_type, difficulty, n) from an rng, which goes through
+# the generator's generate_batch and yields the n problems in order
+
+def _plain(value):
+    # numpy scalars (projectile tables) -> int/float, so every writer can handle them
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _numeric_problems(generator_class):
+    """Problems from one of the physics generators, whose tuples are laid out as question_fields"""
+    def problems(rng):
+        generator = generator_class(rng=rng)
+
+        def batch(problem_type, difficulty, n):
+            columns = generator.generate_batch(problem_type, difficulty, n)
+            for row in zip(*columns.values()):
+                values = dict(zip(columns, row))
+                # the projectile questions are indented triple-quoted strings
+                values['question'] = " ".join(values['question'].split())
+                # the collision questions with one answer fill the second with 0 and no unit
+                if 'unit2' in values and not values['unit2']:
+                    values['answer2'] = values['unit2'] = None
+                yield {field: _plain(value) for field, value in values.items()}
+        return batch
+    return problems
+
+
+def _compound_problems(rng):
+    generator = CompoundGenerator(rng=rng)
+
+    def batch(category, difficulty, n):
+        columns = generator.generate_batch(category, None, n)
+        for formula, name in zip(columns['formula'], columns['name']):
+            yield {'question': f"Name the compound {formula_text(formula)}", 'answer': name}
+    return batch
+
+
+# solution_steps name their operations the way the solution path shows them
+ALGEBRA_OPERATIONS = {
+    "Add": "add", "Subtract": "subtract", "Multiply by": "multiply", "Divide by": "divide",
+    "Square it": "square", "Take the square root": "sqrt",
+}
+
+
+def _principal_roots(expr):
+    # (b**n)**(1/n) -> b, the positive root the solution path means (like sqrt(x**2) -> x on the page)
+    if expr.is_Pow and expr.base.is_Pow and expr.base.exp * expr.exp == 1:
+        return _principal_roots(expr.base.base)
+    if expr.args:
+        return expr.func(*[_principal_roots(arg) for arg in expr.args])
+    return expr
+
+
+def _algebra_answer(equation, target_var, solution_steps):
+    # the answer is where the solution path ends up, same as "Show Solution Path" on the page
+    question = f"Solve for {target_var}: {equation.lhs} = {equation.rhs}"
+    steps = []
+    for step in solution_steps:
+        _, equation = algebra_helpers.apply_and_simplify(equation, ALGEBRA_OPERATIONS[step['operation']],
+                                                         step['value'])
+        steps.append(step['operation'] if step['value'] is None else f"{step['operation']} {step['value']}")
+    lhs, rhs = (_principal_roots(algebra_helpers.simplify_side(_principal_roots(side)))
+                for side in (equation.lhs, equation.rhs))
+    # the target on the left, however the steps left it
+    if sp.symbols(target_var) in rhs.free_symbols:
+        lhs, rhs = rhs, lhs
+    return {
+        'question': question,
+        'answer': f"{lhs} = {rhs}",
+        'answer2': "; ".join(steps),
+        'unit2': "Steps",
+    }
+
+
+def _algebra_problems(rng):
+    generator = AlgebraGenerator(rng=rng)
+
+    def batch(problem_type, difficulty, n):
+        columns = generator.generate_batch(problem_type, difficulty, n)
+        for row in zip(*(columns[field] for field in generator.question_fields)):
+            yield _algebra_answer(*row)
+    return batch
+
+
+# title, problem types and difficulties the app offers, and what builds a batch from an rng
+Source = namedtuple('Source', ['title', 'problem_types', 'difficulties', 'problems'])
+
+SOURCES = {
+    "linear": Source("Linear Motion",
+                     ["Mixed", "No Time", "No Distance", "No Acceleration", "No Final Velocity"], DIFFICULTIES,
+                     _numeric_problems(LinearMotionGenerator)),
+    "projectile": Source("Projectile Motion", ["Type 1", "Type 2", "Type 3"], ["Easy", "Hard"],
+                         _numeric_problems(ProjectileGenerator)),
+    # there's no Hard collision question yet
+    "collisions": Source("Collisions", ["Elastic Collision", "Inelastic Collision"], ["Easy", "Medium"],
+                         _numeric_problems(CollisionGenerator)),
+    "energy": Source("Energy",
+                     ["Elastic Potential Energy", "Kinetic Energy", "Gravitational Potential Energy", "Work",
+                      "Elastic <--> Kinetic", "Gravitational <--> Kinetic", "Gravitational <--> Elastic"],
+                     DIFFICULTIES, _numeric_problems(EnergyGenerator)),
+    # compounds have no difficulty levels
+    "compounds": Source("Naming Compounds", list(COMPOUND_CATEGORIES), ["-"], _compound_problems),
+    "algebra": Source("Algebra", ["Solve for a variable"], list(ALGEBRA_DIFFICULTIES), _algebra_problems),
+}
+
+
+def generate_problems(source, n, problem_types=None, difficulties=None, seed=None):
+    """Yield `n` numbered problem records, each of a random (problem type, difficulty) from the ones given"""
+    spec = SOURCES[source]
+    problem_types = list(problem_types or spec.problem_types)
+    difficulties = list(difficulties or spec.difficulties)
+    for chosen, offered, what in ((problem_types, spec.problem_types, "problem type"),
+                                  (difficulties, spec.difficulties, "difficulty")):
+        unknown = [value for value in chosen if value not in offered]
+        if unknown:
+            raise ValueError(f"unknown {what} for {source}: {', '.join(unknown)}")
+
+    rng = random.Random(seed)
+    batch = spec.problems(rng)
+    combinations = [(problem_type, difficulty) for problem_type in problem_types for difficulty in difficulties]
+    for start in range(0, n, BATCH_SIZE):
+        chosen = [rng.choice(combinations) for _ in range(min(BATCH_SIZE, n - start))]
+        # one generate_batch per (problem type, difficulty) in this round, handed out in the order drawn
+        batches = {combination: batch(*combination, count) for combination, count in Counter(chosen).items()}
+        for number, (problem_type, difficulty) in enumerate(chosen, start=start + 1):
+            fields = next(batches[problem_type, difficulty])
+            yield {
+                'number': number, 'source': source, 'problem_type': problem_type, 'difficulty': difficulty,
+                'question': fields['question'], 'answer': fields['answer'], 'unit': fields.get('unit'),
+                'answer2': fields.get('answer2'), 'unit2': fields.get('unit2'),
+            }
+
+
+# --- writers, one record at a time ---
+
+class RecordWriter(ABC):
+    """Writes records with the given fields to `path`; use as a context manager"""
+
+    def __init__(self, path, fields, title):
+        self.path = Path(path)
+        self.fields = fields
+        self.title = title
+
+    @abstractmethod
+    def write(self, record):
+        """Write one record"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvWriter(RecordWriter):
+    mime = "text/csv"
+
+    def __init__(self, path, fields, title):
+        super().__init__(path, fields, title)
+        self._file = open(self.path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, fields, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, record):
+        self._writer.writerow(record)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlWriter(RecordWriter):
+    mime = "application/jsonl"
+
+    def __init__(self, path, fields, title):
+        super().__init__(path, fields, title)
+        self._file = open(self.path, "w")
+
+    def write(self, record):
+        self._file.write(json.dumps({field: record[field] for field in self.fields}) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+def _format_answer(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+class PdfWriter(RecordWriter):
+    """Letter pages of numbered problems, drawn with matplotlib so there's nothing extra to install.
+
+    Only the page being filled is kept in memory; each full page goes straight to the file."""
+    mime = "application/pdf"
+    PAGE_SIZE = (8.5, 11)    # inches
+    MARGIN = 0.75            # inches
+    LINE_HEIGHT = 0.22       # inches
+    WRAP = 95                # characters per line at FONT_SIZE
+    FONT_SIZE = 10
+
+    def __init__(self, path, fields, title):
+        super().__init__(path, fields, title)
+        self._pdf = mpl_pdf.PdfPages(self.path)
+        self._lines = []
+        self._pages = 0
+        self._lines_per_page = int((self.PAGE_SIZE[1] - 2 * self.MARGIN) / self.LINE_HEIGHT) - 2  # title
+
+    def record_lines(self, record):
+        if 'question' in self.fields:
+            lines = textwrap.wrap(f"{record['number']}. {record['question']}", self.WRAP,
+                                  subsequent_indent="    ")
+            for unit in ('unit', 'unit2'):
+                if record.get(unit):
+                    lines.append(f"    {record[unit]}: ______________")
+        else:
+            answers = [f"{_format_answer(record['answer'])} {record['unit'] or ''}".rstrip()]
+            if record.get('answer2') is not None:
+                answers.append(f"{record['unit2'] or ''}: {_format_answer(record['answer2'])}".lstrip(": "))
+            lines = textwrap.wrap(f"{record['number']}. " + "   |   ".join(answers), self.WRAP,
+                                  subsequent_indent="    ")
+        return lines + [""]
+
+    def write(self, record):
+        lines = self.record_lines(record)
+        if self._lines and len(self._lines) + len(lines) > self._lines_per_page:
+            self._write_page()
+        self._lines.extend(lines)
+
+    def _write_page(self):
+        self._pages += 1
+        width, height = self.PAGE_SIZE
+        top = 1 - self.MARGIN / height
+        # Helvetica is built into every PDF reader, so there are no glyphs to lay out and embed
+        # (several times quicker than the default font)
+        with mpl.rc_context({"pdf.use14corefonts": True, "font.weight": "medium"}):
+            fig = mpl_figure.Figure(figsize=self.PAGE_SIZE)
+            fig.text(self.MARGIN / width, top, f"{self.title} - page {self._pages}",
+                     fontsize=self.FONT_SIZE + 2, fontweight="bold", va="top", parse_math=False)
+            for i, line in enumerate(self._lines, start=2):
+                fig.text(self.MARGIN / width, top - i * self.LINE_HEIGHT / height, line,
+                         fontsize=self.FONT_SIZE, va="top", parse_math=False)
+            self._pdf.savefig(fig)
+        self._lines = []
+
+    def close(self):
+        if self._lines or not self._pages:
+            self._write_page()
+        self._pdf.close()
+
+
+FORMATS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'pdf': PdfWriter}
+
+
+def output_paths(out, fmt):
+    """(worksheet, answer key) paths for `out`, e.g. exports/energy -> energy.csv, energy_answers.csv"""
+    out = Path(out)
+    stem = out.stem if out.suffix.lstrip(".") in FORMATS else out.name
+    return out.with_name(f"{stem}.{fmt}"), out.with_name(f"{stem}_answers.{fmt}")
+
+
+def export(source, n, out, fmt='csv', problem_types=None, difficulties=None, seed=None, progress=None):
+    """Write `n` problems and their answer key; returns (worksheet path, answer key path).
+
+    progress, if given, is called with the number of problems written so far every 1000."""
+    writer = FORMATS[fmt]
+    worksheet_path, key_path = output_paths(out, fmt)
+    worksheet_path.parent.mkdir(parents=True, exist_ok=True)
+    title = f"{SOURCES[source].title} worksheet"
+    problems = generate_problems(source, n, problem_types, difficulties, seed)
+    with writer(worksheet_path, WORKSHEET_FIELDS, title) as worksheet, \
+            writer(key_path, KEY_FIELDS, f"{title} - answer key") as key:
+        for record in problems:
+            worksheet.write(record)
+            key.write(record)
+            if progress and record['number'] % 1000 == 0:
+                progress(record['number'])
+    return worksheet_path, key_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export worksheets with answer keys")
+    parser.add_argument('source', choices=list(SOURCES), help="which generator the problems come from")
+    parser.add_argument('-n', '--count', type=int, default=100, help="number of problems (default: %(default)s)")
+    parser.add_argument('--format', choices=list(FORMATS), default='csv', help="(default: %(default)s)")
+    parser.add_argument('--out', type=Path, help="output path without extension (default: exports/<source>)")
+    parser.add_argument('--types', nargs='+', metavar='TYPE', help="only these problem types (default: all)")
+    parser.add_argument('--difficulties', nargs='+', metavar='DIFFICULTY', help="only these (default: all)")
+    parser.add_argument('--seed', type=int, default=None, help="seed for a reproducible worksheet")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        paths = export(args.source, args.count, args.out or EXPORT_DIR / args.source, args.format,
+                       args.types, args.difficulties, args.seed,
+                       progress=lambda done: print(f"  {done}/{args.count}", end="\r", file=sys.stderr))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.count >= 1000:
+        print(file=sys.stderr)  # end the progress line
+    print(f"{args.count} problems in {time.perf_counter() - start:.1f}s -> {paths[0]}, answers in {paths[1]}")
+
+
+if __name__ == '__main__':
+    main()